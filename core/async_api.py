@@ -0,0 +1,63 @@
+"""
+Helpers for the async-native API views served through `core.asgi`.
+
+DRF views are synchronous, so the async views (`*/api/async_views.py`) are
+plain Django async views. These helpers give them the same authentication,
+error bodies and JSON rendering as the DRF views they mirror.
+"""
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseNotAllowed
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+from users_auth_app.api.authentication import CachedTokenAuthentication
+
+NOT_AUTHENTICATED = "Authentication credentials were not provided."
+PERMISSION_DENIED = "You do not have permission to perform this action."
+NOT_FOUND = "No {model} matches the given query."
+
+
+async def authenticate(request, allow_query_token=False):
+    """
+    Resolve the user of a request from `Authorization: Token <key>`, the
+    `?token=` parameter (if allowed) or the session. Returns None if anonymous
+    or the token is invalid.
+    """
+    header = request.headers.get("Authorization", "")
+    key = header[6:] if header.startswith("Token ") else None
+    if key is None and allow_query_token:
+        key = request.GET.get("token")
+    if key:
+        try:
+            user, _ = await sync_to_async(CachedTokenAuthentication().authenticate_credentials)(key)
+        except AuthenticationFailed:
+            return None
+        return user
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def json_response(data, status=200):
+    """Render data like DRF's JSONRenderer."""
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type="application/json")
+
+
+def error_response(status, detail):
+    return json_response({"detail": detail}, status=status)
+
+
+def async_api_view(view):
+    """
+    Decorator for async read-only API views: GET only, authenticated users only.
+    The user is passed to the view as `request.api_user`.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return HttpResponseNotAllowed(["GET", "HEAD"])
+        user = await authenticate(request)
+        if user is None:
+            return error_response(401, NOT_AUTHENTICATED)
+        request.api_user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,21 @@
+"""
+URL configuration used for GET requests under ASGI.
+
+`core.middleware.AsyncReadRoutingMiddleware` switches unpaginated GET
+requests to this URLconf. The hot read endpoints resolve to their async
+implementations; everything else falls through to `core.urls`.
+"""
+from django.urls import path
+from core.urls import urlpatterns as sync_urlpatterns
+from kanban_app.api import async_views as board_views
+from tasks_app.api import async_views as task_views
+
+
+urlpatterns = [
+    path('api/boards/', board_views.board_list),
+    path('api/boards/<int:pk>/', board_views.board_detail),
+    path('api/tasks/assigned-to-me/', task_views.assigned_tasks),
+    path('api/tasks/reviewing/', task_views.reviewing_tasks),
+    path('api/tasks/<int:pk>/comments/', task_views.comment_list),
+    *sync_urlpatterns,
+]
@@ -0,0 +1,65 @@
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+class ConditionalRetrieveMixin:
+
+    """
+    ETag / Last-Modified support for detail views.
+
+    Views set `validator_fields` (the columns needed for the permission check
+    and the validators) and implement `get_last_modified(obj)` and/or
+    `get_etag(obj)`. The default ETag is derived from the model, primary key
+    and modification time; override it when the payload can change without
+    the modification time (e.g. counters). A view with neither sends no
+    validators.
+
+    - A GET with `If-None-Match` or `If-Modified-Since` first loads only
+      `validator_fields`, checks object permissions and answers 304 when the
+      resource is unchanged, without loading or serializing the full payload.
+    - Every successful GET carries `ETag` and `Last-Modified` headers.
+    """
+    validator_fields = ()
+
+    def get_etag(self, obj):
+        last_modified = self.get_last_modified(obj)
+        if last_modified is None:
+            return None
+        return f"{obj._meta.label_lower}-{obj.pk}-{last_modified.timestamp()}"
+
+    def get_last_modified(self, obj):
+        return None
+
+    def get_validator_object(self):
+        model = self.get_queryset().model
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = get_object_or_404(
+            model.objects.only(*self.validator_fields),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def _validators(self, obj):
+        etag = self.get_etag(obj)
+        etag = quote_etag(etag) if etag is not None else None
+        last_modified = self.get_last_modified(obj)
+        return etag, int(last_modified.timestamp()) if last_modified else None
+
+    def retrieve(self, request, *args, **kwargs):
+        if "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META:
+            etag, last_modified = self._validators(self.get_validator_object())
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return not_modified
+
+        instance = self.get_object()
+        etag, last_modified = self._validators(instance)
+        response = Response(self.get_serializer(instance).data)
+        if etag:
+            response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
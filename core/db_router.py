@@ -0,0 +1,113 @@
+"""
+Read-replica routing (`DB_REPLICAS`, see the settings).
+
+Reads of the API apps' models go to a random replica while replica reads are
+switched on for the current context with `replica_reads()`; writes, reads of
+other apps (tokens, sessions), management commands and background threads
+use the primary. `ReplicaRoutingMiddleware` switches replica reads on for
+GET/HEAD/OPTIONS requests, unless the client has written recently:
+
+- a successful write sets a flag in the cache for `REPLICA_STICKY_SECONDS`,
+  keyed by the client's credential (Authorization header or session
+  cookie), and the client's requests read from the primary while it is set,
+  so it sees its own changes despite the replication lag. Use the shared
+  cache (`REDIS_URL`) with several workers, otherwise only the worker that
+  took the write knows about it.
+- clients can also send `X-Read-Primary: 1` to read from the primary.
+
+Write requests read from the primary throughout, so validation and the
+signal handlers never see stale rows. Data written to the cross-request
+caches (membership sets, board list payloads) is loaded from the primary
+too, since it is stored under versions bumped by writes.
+"""
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_APPS = {"kanban_app", "tasks_app", "users_auth_app"}
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_HEADER = "HTTP_X_READ_PRIMARY"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Route reads in this context (thread or task) to the replicas."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def primary_reads():
+    """Read from the primary in this context, e.g. to fill a cache."""
+    return replica_reads(False)
+
+
+def pin_key(request):
+    """Cache key of the client's read-your-writes flag, None for anonymous clients."""
+    credential = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return "db:read-primary:" + hashlib.sha256(credential.encode()).hexdigest()
+
+
+def is_read(request):
+    return request.method in READ_METHODS and not request.META.get(STICKY_HEADER)
+
+
+def is_successful_write(request, response):
+    return request.method not in READ_METHODS and response.status_code < 400
+
+
+def reads_from_replicas(request, key):
+    return is_read(request) and not (key and cache.get(key))
+
+
+async def areads_from_replicas(request, key):
+    return is_read(request) and not (key and await cache.aget(key))
+
+
+def pin_to_primary(request, response, key):
+    """After a successful write, keep the client's reads on the primary for a while."""
+    if key and is_successful_write(request, response):
+        cache.set(key, True, settings.REPLICA_STICKY_SECONDS)
+    return response
+
+
+async def apin_to_primary(request, response, key):
+    if key and is_successful_write(request, response):
+        await cache.aset(key, True, settings.REPLICA_STICKY_SECONDS)
+    return response
+
+
+class ReplicaRouter:
+
+    """
+    Send reads of `REPLICA_APPS` models to a replica when replica reads are on,
+    and all their writes to the primary (also for rows read from a replica).
+    Returns None otherwise, leaving the choice to Django's defaults.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.REPLICA_DATABASES
+        if replicas and _replica_reads.get() and model._meta.app_label in REPLICA_APPS:
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        if settings.REPLICA_DATABASES and model._meta.app_label in REPLICA_APPS:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,107 @@
+import time
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.decorators import sync_and_async_middleware
+from core import db_router, profiling
+
+
+def _use_async_views(request):
+    return (
+        getattr(settings, "ASYNC_READ_VIEWS", True)
+        and isinstance(request, ASGIRequest)
+        and request.method in ("GET", "HEAD")
+        and "cursor" not in request.GET
+        and "page_size" not in request.GET
+    )
+
+
+@sync_and_async_middleware
+def AsyncReadRoutingMiddleware(get_response):
+    """
+    Serve unpaginated GETs of the hot read endpoints with the async views in
+    `core.async_urls` when running under ASGI.
+
+    WSGI requests, writes and paginated lists keep using the DRF views.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if _use_async_views(request):
+                request.urlconf = "core.async_urls"
+            return await get_response(request)
+    else:
+        def middleware(request):
+            if _use_async_views(request):
+                request.urlconf = "core.async_urls"
+            return get_response(request)
+    return middleware
+
+
+@sync_and_async_middleware
+def ReplicaRoutingMiddleware(get_response):
+    """
+    Let read requests read from the replicas and pin a client's reads to the
+    primary after it writes (see `core.db_router`). Removed at startup unless
+    `DB_REPLICAS` are configured.
+    """
+    if not settings.REPLICA_DATABASES:
+        raise MiddlewareNotUsed
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            key = db_router.pin_key(request)
+            with db_router.replica_reads(await db_router.areads_from_replicas(request, key)):
+                response = await get_response(request)
+            return await db_router.apin_to_primary(request, response, key)
+    else:
+        def middleware(request):
+            key = db_router.pin_key(request)
+            with db_router.replica_reads(db_router.reads_from_replicas(request, key)):
+                response = get_response(request)
+            return db_router.pin_to_primary(request, response, key)
+    return middleware
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    name = (match.view_name or match._func_path) if match else "unresolved"
+    return f"{request.method} {name}"
+
+
+def _record(request, response, record, start):
+    size = 0 if response.streaming else len(response.content)
+    profiling.registry.add(_view_name(request), record, time.perf_counter() - start, size)
+
+
+@sync_and_async_middleware
+def ProfilingMiddleware(get_response):
+    """
+    Record query count, SQL time, serializer time and response size per view
+    (see `core.profiling`). Removed at startup unless `PROFILING_ENABLED`.
+    """
+    if not profiling.profiling_enabled():
+        raise MiddlewareNotUsed
+    profiling.install_hooks()
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            start = time.perf_counter()
+            record, token = profiling.start_request()
+            try:
+                response = await get_response(request)
+            finally:
+                profiling.finish_request(token)
+            _record(request, response, record, start)
+            return response
+    else:
+        def middleware(request):
+            start = time.perf_counter()
+            record, token = profiling.start_request()
+            try:
+                response = get_response(request)
+            finally:
+                profiling.finish_request(token)
+            _record(request, response, record, start)
+            return response
+    return middleware
@@ -0,0 +1,28 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+
+    """
+    Keyset (cursor) pagination that clients opt into.
+
+    Requests without `cursor` or `page_size` get the plain, unpaginated list
+    so existing clients keep working. Paginated requests are answered with
+    `{"next", "previous", "results"}` and every page costs O(page_size),
+    independent of how deep the client has scrolled.
+
+    Subclasses set `ordering` to a stable, unique key such as ("created_at", "id").
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def is_requested(self, request):
+        """Return whether the client asked for a paginated response."""
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,265 @@
+"""
+Opt-in per-endpoint profiling (see `core.middleware.ProfilingMiddleware`).
+
+Enabled with `PROFILING_ENABLED`. For every request the middleware records,
+per view:
+
+- wall time, number of SQL queries and total SQL time;
+- serializer time (time spent building `serializer.data`, including the
+  queries it triggers);
+- response size;
+- the slowest queries, with their SQL captured for a sampled share of
+  requests (`PROFILING_SAMPLE_RATE`).
+
+Each process aggregates in memory and periodically (`PROFILING_FLUSH_INTERVAL`
+seconds) writes its snapshot to the Django cache, under a worker slot it
+claims once with an atomic `cache.incr` of `WORKERS_KEY`. `get_report()`
+merges the snapshots of all slots, so with a shared cache backend
+(`REDIS_URL`) the staff endpoint and `manage.py perf_report` see every worker.
+
+When profiling is disabled the middleware removes itself at startup and no
+hooks are installed.
+"""
+import random
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.serializers import BaseSerializer
+
+SLOW_QUERY_LIMIT = 5
+WORKERS_KEY = "perf:worker-slots"
+
+_current = ContextVar("perf_current_record", default=None)
+
+
+def profiling_enabled():
+    return getattr(settings, "PROFILING_ENABLED", False)
+
+
+class RequestRecord:
+
+    """
+    Measurements of one request, filled by the query and serializer hooks.
+    """
+
+    def __init__(self, capture_sql):
+        self.capture_sql = capture_sql
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.slow_queries = []
+
+    def add_query(self, sql, duration):
+        self.queries += 1
+        self.sql_time += duration
+        if self.capture_sql:
+            self.slow_queries.append((duration, sql))
+            self.slow_queries.sort(reverse=True)
+            del self.slow_queries[SLOW_QUERY_LIMIT:]
+
+
+def _empty_stats():
+    return {
+        "requests": 0,
+        "total_ms": 0.0,
+        "max_ms": 0.0,
+        "queries": 0,
+        "max_queries": 0,
+        "sql_ms": 0.0,
+        "serializer_ms": 0.0,
+        "response_bytes": 0,
+        "slow_queries": [],
+    }
+
+
+def _merge_slow_queries(*lists):
+    merged = sorted((query for queries in lists for query in queries), key=lambda q: q["ms"], reverse=True)
+    return merged[:SLOW_QUERY_LIMIT]
+
+
+class Registry:
+
+    """
+    Per-process aggregates keyed by view name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+        self._last_flush = time.monotonic()
+        self.worker_id = uuid.uuid4().hex
+        self.slot = None
+
+    def add(self, view, record, elapsed, response_bytes):
+        slow = [{"ms": round(duration * 1000, 3), "sql": sql} for duration, sql in record.slow_queries]
+        with self._lock:
+            stats = self._views.setdefault(view, _empty_stats())
+            stats["requests"] += 1
+            stats["total_ms"] += elapsed * 1000
+            stats["max_ms"] = max(stats["max_ms"], elapsed * 1000)
+            stats["queries"] += record.queries
+            stats["max_queries"] = max(stats["max_queries"], record.queries)
+            stats["sql_ms"] += record.sql_time * 1000
+            stats["serializer_ms"] += record.serializer_time * 1000
+            stats["response_bytes"] += response_bytes
+            if slow:
+                stats["slow_queries"] = _merge_slow_queries(stats["slow_queries"], slow)
+        if time.monotonic() - self._last_flush >= getattr(settings, "PROFILING_FLUSH_INTERVAL", 10):
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {view: {**stats, "slow_queries": list(stats["slow_queries"])}
+                    for view, stats in self._views.items()}
+
+    def register(self):
+        """
+        Claim the next worker slot. `cache.add` and `cache.incr` are atomic,
+        so processes starting at the same time get different slots.
+        """
+        cache.add(WORKERS_KEY, 0, timeout=None)
+        self.slot = cache.incr(WORKERS_KEY)
+
+    def flush(self):
+        """Write this process's aggregates to the cache."""
+        self._last_flush = time.monotonic()
+        if self.slot is None or not self.holds_slot():
+            self.register()
+        cache.set(_stats_key(self.slot), {"worker": self.worker_id, "views": self.snapshot()}, timeout=None)
+
+    def holds_slot(self):
+        """False once the cache was cleared and the slot may have been claimed again."""
+        if _worker_count() < self.slot:
+            return False
+        stored = cache.get(_stats_key(self.slot))
+        return stored is None or stored["worker"] == self.worker_id
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+
+def _stats_key(slot):
+    return f"perf:stats:{slot}"
+
+
+def _worker_count():
+    return cache.get(WORKERS_KEY) or 0
+
+
+def _stats_keys():
+    return [_stats_key(slot) for slot in range(1, _worker_count() + 1)]
+
+
+registry = Registry()
+
+
+def get_report():
+    """
+    Merge the aggregates of all processes into one row per view, most
+    expensive (total time) first.
+    """
+    registry.flush()
+    snapshots = cache.get_many(_stats_keys()).values()
+    merged = {}
+    for snapshot in snapshots:
+        for view, stats in snapshot["views"].items():
+            total = merged.setdefault(view, _empty_stats())
+            for field in ("requests", "total_ms", "queries", "sql_ms", "serializer_ms", "response_bytes"):
+                total[field] += stats[field]
+            total["max_ms"] = max(total["max_ms"], stats["max_ms"])
+            total["max_queries"] = max(total["max_queries"], stats["max_queries"])
+            total["slow_queries"] = _merge_slow_queries(total["slow_queries"], stats["slow_queries"])
+
+    rows = []
+    for view, stats in merged.items():
+        count = stats["requests"]
+        rows.append({
+            "view": view,
+            "requests": count,
+            "total_ms": round(stats["total_ms"], 1),
+            "avg_ms": round(stats["total_ms"] / count, 2),
+            "max_ms": round(stats["max_ms"], 2),
+            "avg_queries": round(stats["queries"] / count, 2),
+            "max_queries": stats["max_queries"],
+            "avg_sql_ms": round(stats["sql_ms"] / count, 2),
+            "avg_serializer_ms": round(stats["serializer_ms"] / count, 2),
+            "avg_response_bytes": round(stats["response_bytes"] / count),
+            "slow_queries": stats["slow_queries"],
+        })
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+
+def reset_report():
+    """
+    Drop the aggregates of all processes. The slots stay claimed by the
+    running workers.
+    """
+    registry.reset()
+    cache.delete_many(_stats_keys())
+
+
+def start_request():
+    """Begin recording the queries and serializer time of the current request."""
+    record = RequestRecord(capture_sql=random.random() < getattr(settings, "PROFILING_SAMPLE_RATE", 0.1))
+    return record, _current.set(record)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def _collect_query(execute, sql, params, many, context):
+    record = _current.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record.add_query(sql, time.perf_counter() - start)
+
+
+def _install_query_hook(connection, **kwargs):
+    if _collect_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_collect_query)
+
+
+def _timed_data(data_property):
+    def data(self):
+        record = _current.get()
+        if record is None:
+            return data_property.fget(self)
+        record.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return data_property.fget(self)
+        finally:
+            record.serializer_depth -= 1
+            if not record.serializer_depth:
+                record.serializer_time += time.perf_counter() - start
+    return property(data)
+
+
+_installed = False
+
+
+def install_hooks():
+    """
+    Hook query execution on every database connection and time
+    `BaseSerializer.data`. Called once by the middleware when enabled.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    connection_created.connect(_install_query_hook, weak=False)
+    for connection in connections.all(initialized_only=True):
+        _install_query_hook(connection)
+    BaseSerializer.data = _timed_data(BaseSerializer.data)
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 import dotenv
+from corsheaders.defaults import default_headers
+from django.core.exceptions import ImproperlyConfigured
 
 dotenv.load_dotenv()
 
@@ -57,6 +59,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -66,6 +69,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'core.middleware.AsyncReadRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -90,13 +95,109 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# SQLite by default. Set DB_ENGINE=postgresql (with DB_NAME, DB_USER,
+# DB_PASSWORD, DB_HOST, DB_PORT) for production, where concurrent workers
+# would otherwise serialize all writes on the SQLite file lock.
+# PostgreSQL connections are either kept open between requests for
+# DB_CONN_MAX_AGE seconds (checked before reuse), or, with DB_POOL=True, taken
+# from psycopg's connection pool (DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE
+# connections per worker process; persistent connections are then disabled,
+# as Django requires).
+
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite3")
+
+# Opt-in SQLite profile for small deployments with concurrent writers:
+# write-ahead log, relaxed fsync, memory-mapped reads and a bigger page cache
+# (applied to every connection by core.sqlite), and BEGIN IMMEDIATE for
+# transactions so writers queue on the busy timeout instead of failing with
+# "database is locked" when a read lock cannot be upgraded.
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "False") == "True"
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "20"))
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": SQLITE_BUSY_TIMEOUT * 1000,
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),
+    "temp_store": "MEMORY",
+} if SQLITE_TUNED else {}
+
+if DB_ENGINE == "postgresql":
+    DB_POOL = os.getenv("DB_POOL", "False") == "True"
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv("DB_NAME", "kanmind"),
+            'USER': os.getenv("DB_USER", "kanmind"),
+            'PASSWORD': os.getenv("DB_PASSWORD", ""),
+            'HOST': os.getenv("DB_HOST", "localhost"),
+            'PORT': os.getenv("DB_PORT", "5432"),
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            'CONN_HEALTH_CHECKS': not DB_POOL,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                    'max_size': int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                    'timeout': int(os.getenv("DB_POOL_TIMEOUT", "10")),
+                },
+            } if DB_POOL else {},
+        }
+    }
+elif DB_ENGINE == "sqlite3":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv("DB_NAME", BASE_DIR / 'db.sqlite3'),
+        }
+    }
+    if SQLITE_TUNED:
+        DATABASES['default']['OPTIONS'] = {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': SQLITE_BUSY_TIMEOUT,
+        }
+else:
+    raise ImproperlyConfigured(f"Unsupported DB_ENGINE '{DB_ENGINE}', use 'sqlite3' or 'postgresql'.")
+
+# Read replicas (see core.db_router). DB_REPLICAS lists the replica hosts
+# (host or host:port, same credentials as the primary) for PostgreSQL, or
+# database files for SQLite; they become the aliases replica_1, replica_2, ...
+# GET requests of the API read from a random replica, writes and everything
+# outside requests use the primary. After a write the client's reads stay on
+# the primary for DB_REPLICA_STICKY_SECONDS, so it sees its own changes
+# despite the replication lag.
+DB_REPLICAS = [value.strip() for value in os.getenv("DB_REPLICAS", "").split(",") if value.strip()]
+for number, replica in enumerate(DB_REPLICAS, start=1):
+    if DB_ENGINE == "postgresql":
+        host, _, port = replica.partition(":")
+        location = {'HOST': host, 'PORT': port or DATABASES['default']['PORT']}
+    else:
+        location = {'NAME': replica}
+    # the test database stands in for the replicas; run the test suite without
+    # DB_REPLICAS (kanban_app.tests.ReplicaRoutingTests sets up its own replica)
+    DATABASES[f"replica_{number}"] = {**DATABASES['default'], **location, 'TEST': {'MIRROR': 'default'}}
+REPLICA_DATABASES = [f"replica_{number}" for number in range(1, len(DB_REPLICAS) + 1)]
+REPLICA_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", "10"))
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Per-process memory by default; set REDIS_URL to share the cache between
+# workers (needed for the cross-request caches to see each other's invalidations).
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
     }
-}
 
 
 # Password validation
@@ -143,6 +244,7 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, "x-read-primary")
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5500",
     "http://127.0.0.1:5500",
@@ -155,7 +257,7 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'users_auth_app.api.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
 
@@ -163,3 +265,49 @@ REST_FRAMEWORK = {
 }
 
 AUTH_USER_MODEL = "users_auth_app.User"
+
+# Seconds to cache each user's accessible board IDs across requests
+# (see kanban_app.membership). 0 caches them for the current request only.
+BOARD_ACCESS_CACHE_TIMEOUT = int(os.getenv("BOARD_ACCESS_CACHE_TIMEOUT", "0"))
+
+# Seconds to cache token -> user lookups in CachedTokenAuthentication.
+# 0 disables the cache and authenticates every request against the database.
+# Deleting a token or deactivating a user evicts the entry only in the cache
+# the write went to: with the per-process cache other workers keep accepting
+# the token for up to this many seconds. Hence the cache is only on by
+# default with the shared Redis cache.
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv("AUTH_TOKEN_CACHE_TIMEOUT", "300" if os.getenv("REDIS_URL") else "0"))
+
+# Broker used to push board changes to Server-Sent Events subscribers
+# (see kanban_app.realtime). The in-memory broker only reaches subscribers
+# in the same process.
+REALTIME_BROKER = os.getenv("REALTIME_BROKER", "kanban_app.realtime.InMemoryBroker")
+
+# Serve the hot read endpoints with the async views in core.async_urls when
+# running under ASGI (see core.middleware.AsyncReadRoutingMiddleware).
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "True") == "True"
+
+# Seconds to cache the board list payload per user and board versions
+# (see kanban_app.summary_cache), in the cache alias BOARD_SUMMARY_CACHE.
+# 0 disables the cache.
+BOARD_SUMMARY_CACHE = os.getenv("BOARD_SUMMARY_CACHE", "default")
+BOARD_SUMMARY_CACHE_TIMEOUT = int(os.getenv("BOARD_SUMMARY_CACHE_TIMEOUT", "0"))
+
+# Per-endpoint profiling (see core.profiling). Off by default; when off the
+# middleware is removed at startup. PROFILING_SAMPLE_RATE is the share of
+# requests whose slowest queries are captured with their SQL.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "False") == "True"
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0.1"))
+PROFILING_FLUSH_INTERVAL = int(os.getenv("PROFILING_FLUSH_INTERVAL", "10"))
+
+# The board change feed holds back changes younger than this many seconds,
+# so a cursor never moves past a change a slower transaction commits later
+# with a lower ID (PostgreSQL; SQLite commits writers one at a time).
+BOARD_CHANGES_SETTLE_SECONDS = int(os.getenv("BOARD_CHANGES_SETTLE_SECONDS",
+                                             "2" if DB_ENGINE == "postgresql" else "0"))
+# Days the board change log is kept by `manage.py prune_board_changes`.
+BOARD_CHANGES_MAX_AGE_DAYS = int(os.getenv("BOARD_CHANGES_MAX_AGE_DAYS", "30"))
+
+# Task position keys longer than this trigger a background rebalance of the
+# column (see tasks_app.positions and `manage.py rebalance_positions`).
+TASK_POSITION_MAX_LENGTH = int(os.getenv("TASK_POSITION_MAX_LENGTH", "32"))
@@ -0,0 +1,33 @@
+"""
+SQLite performance profile (`SQLITE_TUNED=True`, see the settings).
+
+`configure_connection` runs on `connection_created` and applies
+`SQLITE_PRAGMAS` to every new SQLite connection:
+
+- journal_mode=WAL: readers no longer block the writer and vice versa
+  (persistent, stored in the database file)
+- synchronous=NORMAL: fsync at checkpoints instead of every commit; safe
+  with WAL, a power loss can only drop the last transactions
+- busy_timeout: wait for the write lock instead of failing immediately
+- mmap_size / cache_size / temp_store: serve reads from memory
+
+The other half of the profile is `transaction_mode = IMMEDIATE` in the
+database OPTIONS: `atomic()` blocks take the write lock up front, so two
+transactions never deadlock upgrading their read locks, which SQLite
+reports as "database is locked" without waiting.
+"""
+from django.conf import settings
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != "sqlite" or not settings.SQLITE_PRAGMAS:
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def pragma(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
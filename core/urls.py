@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from core.views import PerfReportView
 
 
 urlpatterns = [
@@ -24,6 +25,7 @@ urlpatterns = [
     path('api/', include('kanban_app.api.urls')),
     path('api/', include('tasks_app.api.urls')),
     path('api/', include('users_auth_app.api.urls')),
+    path('api/perf/', PerfReportView.as_view(), name='perf-report'),
     path('api-auth/', include('rest_framework.urls')),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui')
@@ -0,0 +1,28 @@
+from rest_framework import generics, status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from core import profiling
+from kanban_app import summary_cache
+
+
+class PerfReportView(generics.GenericAPIView):
+
+    """
+    GET: Per-endpoint profiling aggregates of all workers (see `core.profiling`),
+         most expensive first, plus the board summary cache counters of this worker.
+    DELETE: Reset the aggregates.
+
+    Permissions: staff only.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response({
+            "enabled": profiling.profiling_enabled(),
+            "views": profiling.get_report(),
+            "board_summary_cache": summary_cache.stats.as_dict(),
+        })
+
+    def delete(self, request, *args, **kwargs):
+        profiling.reset_report()
+        return Response(status=status.HTTP_204_NO_CONTENT)
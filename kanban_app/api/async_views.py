@@ -0,0 +1,69 @@
+"""
+Async-native read views for the hottest board endpoints.
+
+They mirror `BoardListView` (GET) and `BoardDetailView` (GET) with Django's
+async ORM and are routed in by `core.middleware.AsyncReadRoutingMiddleware`
+when the project runs under ASGI (`core.asgi`).
+"""
+from asgiref.sync import sync_to_async
+from django.db.models import Prefetch
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from core.async_api import NOT_FOUND, PERMISSION_DENIED, async_api_view, error_response, json_response
+from kanban_app.api.serializers import BoardSerializer, BoardDetailSerializer
+from kanban_app.membership import ahas_board_access
+from kanban_app.models import Board
+from kanban_app.summary_cache import cache_enabled, get_board_list
+from tasks_app.models import Task
+
+
+def _validators(board):
+    return quote_etag(board.get_etag()), int(board.updated_at.timestamp())
+
+
+@async_api_view
+async def board_list(request):
+    """GET /api/boards/ — boards the user owns or is a member of."""
+    boards = Board.objects.accessible_to(request.api_user).with_counts().order_by("id")
+    if cache_enabled():
+        data = await sync_to_async(get_board_list)(
+            request.api_user.id, lambda: BoardSerializer(boards, many=True).data
+        )
+        return json_response(data)
+    data = BoardSerializer([board async for board in boards], many=True).data
+    return json_response(data)
+
+
+@async_api_view
+async def board_detail(request, pk):
+    """GET /api/boards/<pk>/ — board with members and tasks, with conditional GET support."""
+    user = request.api_user
+    if "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META:
+        stamp = await Board.objects.only("id", "owner", "version", "updated_at").filter(pk=pk).afirst()
+        if stamp is None:
+            return error_response(404, NOT_FOUND.format(model="Board"))
+        if stamp.owner_id != user.id and not await ahas_board_access(user, stamp.pk):
+            return error_response(403, PERMISSION_DENIED)
+        etag, last_modified = _validators(stamp)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+    tasks = Task.objects.select_related("assignee", "reviewer").order_by("position", "id")
+    board = await (
+        Board.objects.select_related("owner")
+        .prefetch_related("members", Prefetch("tasks", queryset=tasks))
+        .filter(pk=pk)
+        .afirst()
+    )
+    if board is None:
+        return error_response(404, NOT_FOUND.format(model="Board"))
+    is_member = any(member.id == user.id for member in board.members.all())
+    if not (user.is_superuser or board.owner_id == user.id or is_member):
+        return error_response(403, PERMISSION_DENIED)
+
+    response = json_response(BoardDetailSerializer(board).data)
+    etag, last_modified = _validators(board)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
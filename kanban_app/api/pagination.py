@@ -0,0 +1,9 @@
+from core.pagination import OptionalCursorPagination
+
+
+class BoardCursorPagination(OptionalCursorPagination):
+
+    """
+    Cursor pagination for board lists, ordered by ID.
+    """
+    ordering = ("id",)
@@ -1,6 +1,7 @@
 from rest_framework import permissions
 from rest_framework.permissions import BasePermission
 from rest_framework.exceptions import NotAuthenticated
+from kanban_app.membership import has_board_access
 
      
 class IsBoardMemberOrOwner(permissions.BasePermission):
@@ -11,6 +12,9 @@ class IsBoardMemberOrOwner(permissions.BasePermission):
     - Board owner can access all actions.
     - Members of the board can access.
     - Superusers can access any board.
+
+    Membership is resolved through `kanban_app.membership`, so a check is a
+    set lookup instead of loading all members.
     """
 
     def has_permission(self, request, view):
@@ -19,17 +23,7 @@ class IsBoardMemberOrOwner(permissions.BasePermission):
         return True
     
     def has_object_permission(self, request, view, obj):
-      
-        if obj.owner == request.user:
-            return True
-
-        if request.user in obj.members.all():
-            return True
-        
-        if request.user.is_superuser:
-            return True
-
-        return False
+        return has_board_access(request, obj)
     
 
 class IsBoardOwner(BasePermission):
@@ -39,6 +33,6 @@ class IsBoardOwner(BasePermission):
     Useful for actions like DELETE or sensitive updates.
     """
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user
+        return obj.owner_id == request.user.id
     
 
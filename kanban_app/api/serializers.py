@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from kanban_app.models import Board
+from kanban_app.models import Board, BoardChange
 from users_auth_app.models import User
 from tasks_app.models import Task
 
@@ -17,7 +17,14 @@ class BoardSerializer(serializers.ModelSerializer):
     - tasks_to_do_count: Number of tasks with status 'to-do'
     - tasks_high_prio_count: Number of tasks with high priority
     - owner_id: ID of the user who owns the board
+
+    The task counters are stored columns on the board. The member count is
+    read from the `annotated_member_count` value added by
+    `Board.objects.with_counts()` and falls back to the model property
+    when the instance was not loaded through that queryset.
     """
+    member_count = serializers.SerializerMethodField()
+
     class Meta:
         model = Board
         fields = [
@@ -30,6 +37,12 @@ class BoardSerializer(serializers.ModelSerializer):
             "owner_id",
         ]
 
+    def get_member_count(self, obj):
+        annotated = getattr(obj, "annotated_member_count", None)
+        if annotated is not None:
+            return annotated
+        return obj.member_count
+
 class BoardCreateSerializer(serializers.ModelSerializer):
 
     """
@@ -77,18 +90,17 @@ class TaskSerializer(serializers.ModelSerializer):
     - assignee: Nested BoardMemberSerializer
     - reviewer: Nested BoardMemberSerializer
     - comments_count: Number of comments on the task
+    - position: Rank key within the column (see `tasks_app.positions`)
     """
     assignee = BoardMemberSerializer(read_only=True)
     reviewer = BoardMemberSerializer(read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Task
         fields = ["id", "title", "description", "status", "priority",
-                  "assignee", "reviewer", "due_date", "comments_count"]
-        
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+                  "assignee", "reviewer", "due_date", "comments_count", "position"]
+
 
 class BoardDetailSerializer(serializers.ModelSerializer):
 
@@ -108,8 +120,7 @@ class BoardDetailSerializer(serializers.ModelSerializer):
         fields = ["id", "title", "owner_id", "members", "tasks"]
         
     def get_tasks(self, obj):
-        tasks = Task.objects.filter(board=obj)
-        return TaskSerializer(tasks, many=True).data
+        return TaskSerializer(obj.tasks.all(), many=True).data
   
 
 class BoardUpdateSerializer(serializers.ModelSerializer):
@@ -117,7 +128,7 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for updating a Board.
 
-    - members: List of user IDs to set as members
+    - members: List of user IDs to set as members (validated with one query)
     - owner_data: Nested owner info (read-only)
     - members_data: Nested members info (read-only)
     """
@@ -130,10 +141,15 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
         fields = ["id", "title", "members", "owner_data", "members_data"]
 
     def validate_members(self, value):
-        invalid_ids = [uid for uid in value if not User.objects.filter(id=uid).exists()]
+        """
+        Check all IDs with one query and return the users, which `update`
+        then sets without loading them again.
+        """
+        users = User.objects.in_bulk(set(value))
+        invalid_ids = [uid for uid in value if uid not in users]
         if invalid_ids:
             raise serializers.ValidationError(f"Diese User-IDs existieren nicht: {invalid_ids}")
-        return value
+        return list(users.values())
 
     def validate(self, attrs):
         if not attrs:
@@ -141,18 +157,33 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
         return attrs
 
     def update(self, instance, validated_data):
-        members_ids = validated_data.pop("members", None)
+        members = validated_data.pop("members", None)
         
         instance.title = validated_data.get("title", instance.title)
         instance.save()
 
-        if members_ids is not None:
-            instance.members.set(members_ids)
+        if members is not None:
+            instance.members.set(members)
 
         return instance
 
 
 
+class BoardChangeSerializer(serializers.ModelSerializer):
+
+    """
+    Serialize one entry of the board change log.
+
+    - id: Change ID, used as the sync cursor
+    - entity / entity_id: What changed ('task', 'comment' or 'member')
+    - action: 'created', 'updated' or 'deleted' (tombstone)
+    - data: Snapshot of the entity after the change (null for tombstones)
+    """
+    class Meta:
+        model = BoardChange
+        fields = ["id", "entity", "entity_id", "action", "data", "created_at"]
+
+
 class EmailCheckSerializer(serializers.ModelSerializer):
 
     """
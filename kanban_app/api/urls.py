@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import BoardListView, BoardDetailView, EmailCheckView
+from .views import BoardListView, BoardDetailView, BoardChangesView, BoardExportView, BoardImportView, EmailCheckView, board_events
 """
 API endpoints for boards and user email checks.
 
@@ -7,10 +7,18 @@ Endpoints:
 
 1. /boards/           - GET: list boards, POST: create board
 2. /boards/<pk>/      - GET: retrieve board, PUT/PATCH: update, DELETE: delete board
-3. /email-check/      - GET: check if user exists by email
+3. /boards/<pk>/changes/?since=<cursor> - GET: changes of the board since a cursor
+4. /boards/<pk>/events/ - GET: Server-Sent Events stream of board changes (ASGI only)
+5. /boards/<pk>/export/ - GET: stream the whole board as JSON or NDJSON
+6. /boards/<pk>/import/ - POST: bulk import tasks from NDJSON or CSV
+7. /email-check/      - GET: check if user exists by email
 """
 urlpatterns = [
     path('boards/', BoardListView.as_view(), name='board-list'),
     path('boards/<int:pk>/', BoardDetailView.as_view(), name='board-detail'),
+    path('boards/<int:pk>/changes/', BoardChangesView.as_view(), name='board-changes'),
+    path('boards/<int:pk>/events/', board_events, name='board-events'),
+    path('boards/<int:pk>/export/', BoardExportView.as_view(), name='board-export'),
+    path('boards/<int:pk>/import/', BoardImportView.as_view(), name='board-import'),
     path('email-check/', EmailCheckView.as_view(), name='email-check')
 ]
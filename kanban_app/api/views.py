@@ -1,25 +1,52 @@
-
+import asyncio
+import json
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import HttpResponseNotAllowed, StreamingHttpResponse
 from rest_framework import generics, status
-from kanban_app.api.serializers import BoardSerializer, BoardCreateSerializer, BoardDetailSerializer, BoardUpdateSerializer, EmailCheckSerializer
-from kanban_app.models import Board
+from core.async_api import NOT_AUTHENTICATED, NOT_FOUND, PERMISSION_DENIED, authenticate, error_response
+from core.conditional import ConditionalRetrieveMixin
+from kanban_app.api.serializers import BoardSerializer, BoardCreateSerializer, BoardDetailSerializer, BoardUpdateSerializer, BoardChangeSerializer, EmailCheckSerializer
+from kanban_app import export
+from kanban_app.membership import ahas_board_access
+from kanban_app.models import Board, BoardChange
+from kanban_app.realtime import SubscriptionClosed, get_broker
+from kanban_app.summary_cache import get_board_list
+from .pagination import BoardCursorPagination
 from .permissions import IsBoardMemberOrOwner, IsBoardOwner
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from tasks_app import importer
+from tasks_app.models import Task
 from users_auth_app.models import User
 
+EVENT_STREAM_HEARTBEAT = 15
+EVENT_STREAM_NEEDS_ASGI = "The event stream is only available when the server runs the ASGI application."
+
 
 class BoardListView(generics.ListCreateAPIView):
 
     """
     GET: List all boards accessible by the current user.
     POST: Create a new board. The logged-in user becomes the owner.
+
+    Pass `?page_size=` or `?cursor=` to get cursor-paginated results.
+    Unpaginated lists are served from `kanban_app.summary_cache` when enabled.
     """
     permission_classes = [IsAuthenticated, IsBoardMemberOrOwner]
+    pagination_class = BoardCursorPagination
 
     def get_queryset(self):
-        user = self.request.user
-        return (Board.objects.filter(owner=user) | Board.objects.filter(members__id=user.id)).distinct()
+        return Board.objects.accessible_to(self.request.user).with_counts().order_by("id")
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator.is_requested(request):
+            return super().list(request, *args, **kwargs)
+        data = get_board_list(request.user.id, lambda: self.get_serializer(self.get_queryset(), many=True).data)
+        return Response(data)
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -27,15 +54,37 @@ class BoardListView(generics.ListCreateAPIView):
         return BoardSerializer
 
 
-class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BoardDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
 
     """
-    GET: Retrieve board details.
+    GET: Retrieve board details. Supports ETag/Last-Modified conditional
+         requests based on the board version stamp.
     PUT/PATCH: Update board information.
     DELETE: Delete the board (owner only).
     """
     queryset = Board.objects.all()
     permission_classes = [IsAuthenticated, IsBoardMemberOrOwner | IsBoardOwner]
+    validator_fields = ("id", "owner", "version", "updated_at")
+
+    def get_etag(self, obj):
+        return obj.get_etag()
+
+    def get_last_modified(self, obj):
+        return obj.updated_at
+
+    def get_queryset(self):
+        """
+        For GET, load owner, members and tasks (with assignee and reviewer)
+        up front so the detail payload costs a fixed number of queries
+        regardless of the board size.
+        """
+        if self.request.method != "GET":
+            return super().get_queryset()
+        tasks = Task.objects.select_related("assignee", "reviewer").order_by("position", "id")
+        return Board.objects.select_related("owner").prefetch_related(
+            "members",
+            Prefetch("tasks", queryset=tasks),
+        )
 
     def get_serializer_class(self):
         if self.request.method in ["PUT", "PATCH"]:
@@ -48,6 +97,130 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
         instance.delete()
 
 
+class BoardChangesView(generics.GenericAPIView):
+
+    """
+    GET: Return the changes of a board since a cursor, for delta sync.
+
+    Query parameters:
+    - since: Cursor returned by the previous call. Without it, no changes are
+      returned, only the current cursor (to start syncing after a full load).
+    - limit: Maximum number of changes (default 500, max 1000)
+
+    Changes younger than `BOARD_CHANGES_SETTLE_SECONDS` are held back (see
+    `BoardChangeQuerySet.settled`). A cursor older than the pruned part of
+    the log (see `prune_board_changes`) gets 410 Gone: reload the board and
+    start again without `since`.
+
+    Response:
+    - cursor: Pass as `since` on the next call
+    - has_more: True if more changes are waiting after `cursor`
+    - changes: Tasks, comments and members created/updated/deleted, oldest first
+    """
+    queryset = Board.objects.only("id", "owner", "changes_pruned_to")
+    serializer_class = BoardChangeSerializer
+    permission_classes = [IsAuthenticated, IsBoardMemberOrOwner]
+    default_limit = 500
+    max_limit = 1000
+
+    def get(self, request, *args, **kwargs):
+        board = self.get_object()
+        try:
+            since = request.query_params.get("since")
+            limit = int(request.query_params.get("limit", self.default_limit))
+            limit = max(1, min(limit, self.max_limit))
+            since = int(since) if since is not None else None
+        except ValueError:
+            raise ValidationError("since and limit must be integers.")
+
+        if since is None:
+            return Response({"cursor": BoardChange.objects.latest_cursor(), "has_more": False, "changes": []})
+        if since < board.changes_pruned_to:
+            return Response({"detail": "The cursor has expired, reload the board."}, status=status.HTTP_410_GONE)
+
+        changes = list(board.changes.settled().since(since)[:limit + 1])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        # without changes of this board the cursor moves to the end of the
+        # whole log, so idle clients do not fall behind the pruning horizon
+        cursor = changes[-1].id if changes else max(since, BoardChange.objects.latest_cursor())
+        return Response({
+            "cursor": cursor,
+            "has_more": has_more,
+            "changes": self.get_serializer(changes, many=True).data,
+        })
+
+
+class BoardExportView(generics.GenericAPIView):
+
+    """
+    GET: Stream the whole board (members, tasks and their comments) as a
+         download, see `kanban_app.export`.
+
+    Query parameters:
+    - export_format: 'json' (default) or 'ndjson' (one record per line)
+    """
+    queryset = Board.objects.select_related("owner")
+    permission_classes = [IsAuthenticated, IsBoardMemberOrOwner]
+
+    def get(self, request, *args, **kwargs):
+        board = self.get_object()
+        export_format = request.query_params.get("export_format", "json")
+        if export_format not in export.FORMATS:
+            raise ValidationError(f"export_format must be one of {', '.join(export.FORMATS)}.")
+        # under ASGI a sync iterator would be read into memory as a whole
+        stream = export.astream_board if isinstance(request._request, ASGIRequest) else export.stream_board
+        response = StreamingHttpResponse(
+            stream(board, export_format), content_type=export.CONTENT_TYPES[export_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="board-{board.id}.{export_format}"'
+        return response
+
+
+class BoardImportView(generics.GenericAPIView):
+
+    """
+    POST: Import tasks (and their comments and members) into the board, see
+          `tasks_app.importer`.
+
+    The data is sent either as multipart upload (`file` field) or as the raw
+    request body with `Content-Type: application/x-ndjson` or `text/csv`, and
+    is parsed while it is read. Invalid rows are skipped and reported.
+
+    Query parameters:
+    - import_format: 'ndjson' or 'csv' (default: from the content type or
+      file name, else ndjson)
+
+    Response: created counts, per-row errors and throughput.
+    """
+    queryset = Board.objects.all()
+    permission_classes = [IsAuthenticated, IsBoardMemberOrOwner]
+    parser_classes = [MultiPartParser]
+
+    def get_import_format(self, content_type, filename=""):
+        import_format = self.request.query_params.get("import_format")
+        if import_format is None:
+            csv_upload = "csv" in content_type or filename.lower().endswith(".csv")
+            import_format = "csv" if csv_upload else "ndjson"
+        if import_format not in importer.FORMATS:
+            raise ValidationError(f"import_format must be one of {', '.join(importer.FORMATS)}.")
+        return import_format
+
+    def post(self, request, *args, **kwargs):
+        board = self.get_object()
+        if request.content_type.startswith("multipart/"):
+            upload = request.FILES.get("file")
+            if upload is None:
+                raise ValidationError({"file": "This field is required."})
+            lines = upload
+            import_format = self.get_import_format(upload.content_type or "", upload.name)
+        else:
+            lines = request.stream or []
+            import_format = self.get_import_format(request.content_type)
+        report = importer.BoardImporter(board, request.user).run(importer.read_records(lines, import_format))
+        return Response(report, status=status.HTTP_200_OK)
+
+
 class EmailCheckView(generics.GenericAPIView):
 
     """
@@ -69,3 +242,70 @@ class EmailCheckView(generics.GenericAPIView):
             return Response({"detail": "Email not found"}, status=status.HTTP_404_NOT_FOUND)
         except Exception:
             return Response({"detail": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _format_event(event):
+    """Render one change as a Server-Sent Event."""
+    entity, action = event["entity"], event["action"]
+    data = json.dumps(event, cls=DjangoJSONEncoder)
+    return f"id: {event['id']}\nevent: {entity}.{action}\ndata: {data}\n\n"
+
+
+async def board_events(request, pk):
+    """
+    GET: Server-Sent Events stream of a board's changes.
+
+    Emits one event per BoardChange (`event: task.created`, `comment.deleted`,
+    `member.created`, ...) with the change as JSON data and its ID as event ID.
+    A reconnecting client sends `Last-Event-ID` (or `?since=<cursor>`) and first
+    receives the changes it missed from the change log. A comment line is sent
+    every EVENT_STREAM_HEARTBEAT seconds to keep proxies from closing the
+    connection.
+
+    Must be served by the ASGI application (`core.asgi`): under WSGI the
+    endless stream would be collected into memory and block the worker, so
+    the view answers 501 there.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    if not isinstance(request, ASGIRequest):
+        return error_response(501, EVENT_STREAM_NEEDS_ASGI)
+    user = await authenticate(request, allow_query_token=True)
+    if user is None:
+        return error_response(401, NOT_AUTHENTICATED)
+    if not await Board.objects.filter(pk=pk).aexists():
+        return error_response(404, NOT_FOUND.format(model="Board"))
+    if not await ahas_board_access(user, pk):
+        return error_response(403, PERMISSION_DENIED)
+
+    since = request.headers.get("Last-Event-ID") or request.GET.get("since")
+    since = int(since) if since and since.isdigit() else None
+    subscription = get_broker().subscribe(pk)
+
+    async def stream():
+        try:
+            yield ": connected\n\n"
+            last_id = since or 0
+            if since is not None:
+                async for change in BoardChange.objects.filter(board_id=pk).since(since):
+                    yield _format_event(change.as_event())
+                    last_id = change.id
+            while True:
+                try:
+                    event = await subscription.get(timeout=EVENT_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                except SubscriptionClosed:
+                    return
+                if event["id"] is not None and event["id"] <= last_id:
+                    continue
+                yield _format_event(event)
+                last_id = event["id"] or last_id
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,154 @@
+"""
+Streaming export of a whole board with its members, tasks and comments.
+
+The export is produced by generators, so it can be passed straight to a
+`StreamingHttpResponse` or written to a file piece by piece. Tasks and
+comments are read with `iterator(chunk_size=...)` (server-side cursors on
+PostgreSQL) as plain value rows, both ordered by task ID, and merged while
+streaming. Memory use is bounded by the chunk size, not the board size.
+
+Users are exported by email so an export can be imported into another
+instance (see `tasks_app.importer`).
+
+Formats:
+- json: one document
+  `{"board": {...}, "members": [...], "tasks": [{..., "comments": [...]}]}`
+- ndjson: one record per line, `{"type": "board" | "member" | "task" | "comment", ...}`,
+  comments following their task
+
+Under ASGI, Django consumes a sync iterator with `sync_to_async(list)`, i.e.
+buffers the whole response; `astream_board` is the async iterator to stream
+there instead.
+"""
+import json
+from itertools import groupby
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from tasks_app.models import Comment, Task
+
+FORMATS = ("json", "ndjson")
+CONTENT_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+TASK_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "status": "status",
+    "priority": "priority",
+    "assignee": "assignee__email",
+    "reviewer": "reviewer__email",
+    "due_date": "due_date",
+    "updated_at": "updated_at",
+    "position": "position",
+}
+COMMENT_FIELDS = {
+    "id": "id",
+    "author": "author__email",
+    "content": "content",
+    "created_at": "created_at",
+}
+
+
+def _dumps(data):
+    return json.dumps(data, cls=DjangoJSONEncoder)
+
+
+def _rows(queryset, fields, chunk_size):
+    for row in queryset.values_list(*fields.values()).iterator(chunk_size=chunk_size):
+        yield dict(zip(fields, row))
+
+
+def board_header(board):
+    """Board metadata (members, tasks and comments are streamed separately)."""
+    return {
+        "id": board.id,
+        "title": board.title,
+        "owner": board.owner.email,
+        "exported_at": timezone.now(),
+    }
+
+
+def iter_members(board):
+    return board.members.order_by("id").values_list("email", flat=True).iterator(chunk_size=CHUNK_SIZE)
+
+
+def iter_tasks(board, chunk_size=CHUNK_SIZE):
+    """
+    Yield (task, comments) pairs, tasks by ID, comments oldest first.
+
+    Tasks and comments come from two cursors ordered by task ID, so each task
+    is matched with its comments without one query per task.
+    """
+    tasks = _rows(Task.objects.filter(board=board).order_by("id"), TASK_FIELDS, chunk_size)
+    comments = (
+        Comment.objects.filter(task__board=board).order_by("task_id", "created_at", "id")
+        .values_list("task_id", *COMMENT_FIELDS.values())
+        .iterator(chunk_size=chunk_size)
+    )
+    grouped = groupby(comments, key=lambda row: row[0])
+    pending = next(grouped, None)
+    for task in tasks:
+        task_comments = []
+        # skip comments of tasks that are not in the task cursor (created meanwhile)
+        while pending is not None and pending[0] < task["id"]:
+            pending = next(grouped, None)
+        if pending is not None and pending[0] == task["id"]:
+            task_comments = [dict(zip(COMMENT_FIELDS, row[1:])) for row in pending[1]]
+            pending = next(grouped, None)
+        yield task, task_comments
+
+
+def stream_json(board, chunk_size=CHUNK_SIZE):
+    yield f'{{"board": {_dumps(board_header(board))}, "members": {_dumps(list(iter_members(board)))}, "tasks": ['
+    for index, (task, comments) in enumerate(iter_tasks(board, chunk_size)):
+        task["comments"] = comments
+        yield ("," if index else "") + _dumps(task)
+    yield "]}\n"
+
+
+def stream_ndjson(board, chunk_size=CHUNK_SIZE):
+    yield _dumps({"type": "board", **board_header(board)}) + "\n"
+    for email in iter_members(board):
+        yield _dumps({"type": "member", "email": email}) + "\n"
+    for task, comments in iter_tasks(board, chunk_size):
+        yield _dumps({"type": "task", **task}) + "\n"
+        for comment in comments:
+            yield _dumps({"type": "comment", "task": task["id"], **comment}) + "\n"
+
+
+def _buffered(pieces, size=BUFFER_SIZE):
+    """Join small pieces into chunks of about `size` characters."""
+    buffer, length = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_board(board, export_format="json", chunk_size=CHUNK_SIZE):
+    """Return a generator of text chunks exporting the board in the given format."""
+    stream = stream_ndjson if export_format == "ndjson" else stream_json
+    return _buffered(stream(board, chunk_size))
+
+
+async def _async_chunks(chunks):
+    """Pull the chunks of a sync generator from async code, one thread hop each."""
+    done = object()
+    try:
+        while (chunk := await sync_to_async(next)(chunks, done)) is not done:
+            yield chunk
+    finally:
+        # close the cursors in the thread that opened them
+        await sync_to_async(chunks.close)()
+
+
+def astream_board(board, export_format="json", chunk_size=CHUNK_SIZE):
+    """Async iterator version of `stream_board` for responses under ASGI."""
+    return _async_chunks(stream_board(board, export_format, chunk_size))
@@ -0,0 +1,143 @@
+import json
+import multiprocessing
+import random
+import statistics
+import time
+from collections import Counter
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from core.sqlite import pragma
+
+STATUSES = ("to-do", "in-progress", "review", "done")
+PRIORITIES = ("low", "medium", "high")
+
+
+def _worker(job):
+    """
+    PATCH random tasks through the full request cycle; runs in its own
+    process (or inline for a single worker).
+    """
+    import django
+    django.setup()
+    from django.db import DatabaseError
+    from django.test import Client, override_settings
+
+    index, token, task_ids, requests, start_at = job
+    rng = random.Random(index)
+    client = Client(HTTP_AUTHORIZATION=f"Token {token}")
+    latencies, errors = [], Counter()
+    # start all workers together; the test client always sends Host: testserver
+    time.sleep(max(0, start_at - time.time()))
+    began = time.time()
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        for i in range(requests):
+            body = json.dumps({"status": rng.choice(STATUSES), "priority": rng.choice(PRIORITIES),
+                               "title": f"Bench write {index}-{i}"})
+            started = time.perf_counter()
+            try:
+                response = client.patch(f"/api/tasks/{rng.choice(task_ids)}/", body, content_type="application/json")
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors[f"HTTP {response.status_code}"] += 1
+            except DatabaseError as exc:
+                errors[str(exc)] += 1
+    return latencies, errors, began, time.time()
+
+
+class Command(BaseCommand):
+
+    """
+    Measure concurrent write throughput of the configured database.
+
+    Starts `--workers` processes that each send `--requests` task PATCHes
+    (status, priority, title) through the full Django stack with the test
+    client, like concurrent gunicorn workers would. Every PATCH updates the
+    task, the board counters and version and appends to the change log.
+    Each worker writes its own tasks (on a shared board), so the numbers
+    measure lock contention rather than conflicting updates of one row.
+
+    A throwaway user, board and tasks are created for the run and deleted
+    afterwards. Run it once per backend (e.g. with `DB_ENGINE=postgresql`) or
+    SQLite profile (`SQLITE_TUNED=True`) to compare.
+
+    Usage:
+        python manage.py bench_db_writes
+        python manage.py bench_db_writes --workers 8 --requests 200 --json sqlite.json
+    """
+    help = "Benchmark concurrent task writes (throughput, latency, lock errors) on the configured database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Writer processes.")
+        parser.add_argument("--requests", type=int, default=200, help="PATCH requests per worker.")
+        parser.add_argument("--tasks", type=int, default=10, help="Tasks per worker.")
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        from rest_framework.authtoken.models import Token
+        from kanban_app.models import Board
+        from tasks_app.models import Task
+        from users_auth_app.models import User
+
+        user = User.objects.create_user(email=f"bench-writes-{time.time_ns()}@bench.local",
+                                        fullname="Write benchmark", password=None)
+        token = Token.objects.create(user=user)
+        board = Board.objects.create(title="Write benchmark", owner=user)
+        board.members.add(user)
+        task_ids = [
+            [Task.objects.create(board=board, title=f"Task {worker}-{i}", owner=user).id for i in range(options["tasks"])]
+            for worker in range(options["workers"])
+        ]
+        try:
+            result = self.run(token.key, task_ids, options["workers"], options["requests"])
+        finally:
+            board.delete()
+            user.delete()
+
+        self.stdout.write(
+            f"{result['vendor']} {result['settings']}\n"
+            f"{result['workers']} workers, {result['ok']} writes in {result['seconds']} s = "
+            f"{result['writes_per_second']} writes/s, p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+            f"{result['error_count']} errors"
+        )
+        for message, count in result["errors"].items():
+            self.stdout.write(self.style.WARNING(f"  {count} x {message}"))
+        if options["json_path"]:
+            with open(options["json_path"], "w") as file:
+                json.dump(result, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['json_path']}."))
+
+    def run(self, token, task_ids, workers, requests):
+        start_at = time.time() + (2 if workers > 1 else 0)
+        jobs = [(index, token, task_ids[index], requests, start_at) for index in range(workers)]
+        if workers > 1:
+            # child processes must not share the parent's connections
+            connections.close_all()
+            with multiprocessing.get_context("spawn").Pool(workers) as pool:
+                results = pool.map(_worker, jobs)
+        else:
+            results = [_worker(job) for job in jobs]
+
+        latencies = sorted(latency for result in results for latency in result[0])
+        errors = sum((result[1] for result in results), Counter())
+        seconds = max(result[3] for result in results) - min(result[2] for result in results)
+        return {
+            "vendor": connection.vendor,
+            "settings": self.describe_connection(),
+            "workers": workers,
+            "requests": workers * requests,
+            "ok": len(latencies),
+            "seconds": round(seconds, 2),
+            "writes_per_second": round(len(latencies) / seconds, 1) if seconds > 0 else None,
+            "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+            "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else None,
+            "error_count": sum(errors.values()),
+            "errors": dict(errors.most_common()),
+        }
+
+    def describe_connection(self):
+        description = {key: connection.settings_dict.get(key) for key in ("CONN_MAX_AGE", "CONN_HEALTH_CHECKS")}
+        if connection.vendor == "sqlite":
+            description["transaction_mode"] = connection.settings_dict["OPTIONS"].get("transaction_mode", "DEFERRED")
+            description.update((name, pragma(connection, name)) for name in ("journal_mode", "synchronous"))
+        return description
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from kanban_app.models import Board
+from users_auth_app.models import User
+
+
+def _summary(latencies, elapsed):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(p99 * 1000, 2),
+    }
+
+
+class Command(BaseCommand):
+
+    """
+    Compare the sync DRF read views (WSGI handler) with their async versions
+    (ASGI handler) at the same concurrency.
+
+    Requests are issued in-process with Django's test clients against the
+    configured database, so the numbers include the full request/response
+    cycle but no network or server overhead.
+
+    Usage:
+        python manage.py bench_read_views --email owner@mail.de
+        python manage.py bench_read_views --email owner@mail.de --workers 16 --requests 500 --json out.json
+    """
+    help = "Benchmark throughput and p99 latency of the sync vs. async read endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", required=True, help="User to authenticate as.")
+        parser.add_argument("--workers", type=int, default=8,
+                            help="Sync worker threads / concurrent async requests.")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and mode.")
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(email=options["email"]).first()
+        if user is None:
+            raise CommandError(f"No user with email {options['email']}.")
+        token, _ = Token.objects.get_or_create(user=user)
+        headers = {"Authorization": f"Token {token.key}"}
+        urls = self.get_urls(user)
+
+        results = []
+        for name, url in urls:
+            # The test clients always send Host: testserver.
+            with override_settings(ALLOWED_HOSTS=["testserver"]):
+                sync = self.run_sync(url, headers, options["workers"], options["requests"])
+                async_ = asyncio.run(self.run_async(url, headers, options["workers"], options["requests"]))
+            results.append({"endpoint": name, "url": url, "sync": sync, "async": async_})
+            self.stdout.write(
+                f"{name:<16} sync {sync['throughput_rps']:>8} req/s p99 {sync['p99_ms']:>8} ms | "
+                f"async {async_['throughput_rps']:>8} req/s p99 {async_['p99_ms']:>8} ms"
+            )
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as file:
+                json.dump({"workers": options["workers"], "results": results}, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['json_path']}."))
+
+    def get_urls(self, user):
+        urls = [
+            ("board-list", reverse("board-list")),
+            ("assigned-tasks", reverse("assigned-tasks")),
+            ("task-review", reverse("task-review")),
+        ]
+        board = Board.objects.accessible_to(user).order_by("-ticket_count").first()
+        if board is not None:
+            urls.append(("board-detail", reverse("board-detail", args=[board.id])))
+            task = board.tasks.order_by("-comments_count").first()
+            if task is not None:
+                urls.append(("task-comments", reverse("task-comments", args=[task.id])))
+        return urls
+
+    def run_sync(self, url, headers, workers, count):
+        client = Client()
+
+        def request(_):
+            start = time.perf_counter()
+            response = client.get(url, headers=headers)
+            if response.status_code != 200:
+                raise CommandError(f"GET {url} returned {response.status_code}.")
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            latencies = list(pool.map(request, range(count)))
+        return _summary(latencies, time.perf_counter() - start)
+
+    async def run_async(self, url, headers, workers, count):
+        client = AsyncClient()
+        limit = asyncio.Semaphore(workers)
+
+        async def request():
+            async with limit:
+                start = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                if response.status_code != 200:
+                    raise CommandError(f"GET {url} returned {response.status_code}.")
+                return time.perf_counter() - start
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(request() for _ in range(count)))
+        return _summary(latencies, time.perf_counter() - start)
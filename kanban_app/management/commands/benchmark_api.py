@@ -0,0 +1,180 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from kanban_app.models import Board
+from tasks_app.models import Comment, Task
+from users_auth_app.models import User
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+
+    """
+    Drive the real URL routes (`core.urls`) through the test client and report
+    per endpoint: query count, wall time (median/p95/max over --repeat runs)
+    and peak Python memory (one extra run under tracemalloc).
+
+    Run against a database seeded with `seed_benchmark`. Results can be saved
+    as JSON and compared with an earlier run to spot regressions.
+
+    Usage:
+        python manage.py benchmark_api
+        python manage.py benchmark_api --repeat 20 --json results.json
+        python manage.py benchmark_api --compare baseline.json
+    """
+    help = "Benchmark the API endpoints: queries, wall time and memory per endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", default="bench-0@bench.local", help="User to authenticate as.")
+        parser.add_argument("--repeat", type=int, default=10, help="Timed runs per endpoint.")
+        parser.add_argument("--json", dest="json_path", help="Write the results to this file.")
+        parser.add_argument("--compare", help="Earlier results file to compare against.")
+        parser.add_argument("--tolerance", type=float, default=0.2,
+                            help="Relative slowdown of the median time reported as regression (default 0.2).")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(email=options["email"]).first()
+        if user is None:
+            raise CommandError(f"No user with email {options['email']}, run seed_benchmark first.")
+        token, _ = Token.objects.get_or_create(user=user)
+        self.client = Client(headers={"Authorization": f"Token {token.key}"})
+
+        results = []
+        # The test client always sends Host: testserver.
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            for name, url in self.get_endpoints(user):
+                results.append(self.run_endpoint(name, url, options["repeat"]))
+                self.print_result(results[-1])
+
+        report = {
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "repeat": options["repeat"],
+            "dataset": {
+                "users": User.objects.count(),
+                "boards": Board.objects.count(),
+                "tasks": Task.objects.count(),
+                "comments": Comment.objects.count(),
+            },
+            "results": results,
+        }
+        if options["json_path"]:
+            with open(options["json_path"], "w") as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['json_path']}."))
+        if options["compare"]:
+            self.compare(report, options["compare"], options["tolerance"])
+
+    def get_endpoints(self, user):
+        """Return (name, url) pairs, using the user's largest board and busiest task."""
+        board = (
+            Board.objects.accessible_to(user).order_by("-ticket_count", "id").first()
+        )
+        if board is None:
+            raise CommandError("The user has no boards, run seed_benchmark first.")
+        task = (
+            Task.objects.filter(board=board).annotate(n=Count("comments")).order_by("-n", "id").first()
+        )
+        endpoints = [
+            ("board-list", reverse("board-list")),
+            ("board-list-page", reverse("board-list") + "?page_size=50"),
+            ("board-detail", reverse("board-detail", args=[board.id])),
+            ("board-changes", reverse("board-changes", args=[board.id]) + "?since=0"),
+            ("assigned-tasks", reverse("assigned-tasks")),
+            ("assigned-tasks-page", reverse("assigned-tasks") + "?page_size=50"),
+            ("task-review", reverse("task-review")),
+            ("email-check", reverse("email-check") + f"?email={user.email}"),
+        ]
+        if task is not None:
+            endpoints += [
+                ("task-detail", reverse("task-detail", args=[task.id])),
+                ("task-comments", reverse("task-comments", args=[task.id])),
+            ]
+        return endpoints
+
+    def request(self, url):
+        response = self.client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"GET {url} returned {response.status_code}.")
+        return response
+
+    def run_endpoint(self, name, url, repeat):
+        self.request(url)  # warm-up (auth and other caches)
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            response = self.request(url)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            self.request(url)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        tracemalloc.start()
+        try:
+            self.request(url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings.sort()
+        return {
+            "endpoint": name,
+            "url": url,
+            "queries": len(queries),
+            "median_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+            "max_ms": round(timings[-1], 2),
+            "peak_memory_kb": round(peak / 1024, 1),
+            "response_bytes": len(response.content),
+        }
+
+    def print_result(self, result):
+        self.stdout.write(
+            f"{result['endpoint']:<22} {result['queries']:>4} queries  {result['median_ms']:>9} ms median  "
+            f"{result['p95_ms']:>9} ms p95  {result['peak_memory_kb']:>9} KiB peak  "
+            f"{result['response_bytes']:>9} bytes"
+        )
+
+    def compare(self, report, path, tolerance):
+        with open(path) as file:
+            baseline = {result["endpoint"]: result for result in json.load(file)["results"]}
+        self.stdout.write(f"\nCompared with {path}:")
+        regressions = 0
+        for result in report["results"]:
+            old = baseline.get(result["endpoint"])
+            if old is None:
+                continue
+            change = (result["median_ms"] - old["median_ms"]) / old["median_ms"] if old["median_ms"] else 0
+            regressed = change > tolerance or result["queries"] > old["queries"]
+            regressions += regressed
+            line = (
+                f"{result['endpoint']:<22} queries {old['queries']:>4} -> {result['queries']:<4} "
+                f"median {old['median_ms']:>9} -> {result['median_ms']:<9} ms ({change:+.0%})"
+            )
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
+        if regressions:
+            self.stdout.write(self.style.ERROR(f"{regressions} endpoint(s) regressed."))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app import export
+from kanban_app.models import Board
+
+
+class Command(BaseCommand):
+
+    """
+    Dump a whole board (members, tasks, comments) to a file or stdout, in the
+    same format as `/api/boards/<pk>/export/`.
+
+    Usage:
+        python manage.py export_board 1 > board-1.json
+        python manage.py export_board 1 --format ndjson --output board-1.ndjson
+    """
+    help = "Export a board with its tasks and comments as JSON or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("board_id", type=int)
+        parser.add_argument("--format", choices=export.FORMATS, default="json", dest="export_format")
+        parser.add_argument("--output", help="File to write (default: stdout).")
+        parser.add_argument("--chunk-size", type=int, default=export.CHUNK_SIZE,
+                            help="Rows fetched per database round trip.")
+
+    def handle(self, *args, **options):
+        board = Board.objects.select_related("owner").filter(pk=options["board_id"]).first()
+        if board is None:
+            raise CommandError(f"Board {options['board_id']} does not exist.")
+        chunks = export.stream_board(board, options["export_format"], options["chunk_size"])
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", encoding="utf-8") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Exported board {board.id} to {options['output']}."))
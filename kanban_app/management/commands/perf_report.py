@@ -0,0 +1,56 @@
+import json
+from django.core.management.base import BaseCommand
+from core import profiling
+
+
+class Command(BaseCommand):
+
+    """
+    Print the per-endpoint profiling aggregates collected by
+    `core.middleware.ProfilingMiddleware` (PROFILING_ENABLED=True).
+
+    Reads the snapshots the workers flush to the cache, so the workers and
+    this command must share a cache backend (REDIS_URL).
+
+    Usage:
+        python manage.py perf_report
+        python manage.py perf_report --top 10 --slow-queries
+        python manage.py perf_report --json report.json
+        python manage.py perf_report --reset
+    """
+    help = "Show query count, SQL/serializer time and response size per endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20, help="Number of endpoints to show.")
+        parser.add_argument("--slow-queries", action="store_true", help="Also print the slowest captured queries.")
+        parser.add_argument("--json", dest="json_path", help="Write the full report to this file.")
+        parser.add_argument("--reset", action="store_true", help="Drop the collected aggregates.")
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            profiling.reset_report()
+            self.stdout.write(self.style.SUCCESS("Profiling data reset."))
+            return
+
+        rows = profiling.get_report()
+        if options["json_path"]:
+            with open(options["json_path"], "w") as file:
+                json.dump(rows, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['json_path']}."))
+        if not rows:
+            self.stdout.write("No profiling data (is PROFILING_ENABLED set and the cache shared?).")
+            return
+
+        self.stdout.write(
+            f"{'endpoint':<40} {'reqs':>6} {'avg ms':>8} {'max ms':>8} {'queries':>8} "
+            f"{'sql ms':>8} {'ser ms':>8} {'bytes':>8}"
+        )
+        for row in rows[:options["top"]]:
+            self.stdout.write(
+                f"{row['view'][:40]:<40} {row['requests']:>6} {row['avg_ms']:>8} {row['max_ms']:>8} "
+                f"{row['avg_queries']:>8} {row['avg_sql_ms']:>8} {row['avg_serializer_ms']:>8} "
+                f"{row['avg_response_bytes']:>8}"
+            )
+            if options["slow_queries"]:
+                for query in row["slow_queries"]:
+                    self.stdout.write(f"    {query['ms']:>8} ms  {query['sql'][:200]}")
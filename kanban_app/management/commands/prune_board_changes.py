@@ -0,0 +1,28 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from kanban_app.models import BoardChange
+
+
+class Command(BaseCommand):
+
+    """
+    Delete old entries of the board change log, e.g. daily from cron.
+
+    Clients whose sync cursor points into the deleted part get 410 Gone from
+    the change feed and reload the board.
+
+    Usage:
+        python manage.py prune_board_changes
+        python manage.py prune_board_changes --days 7
+    """
+    help = "Delete board change log entries older than BOARD_CHANGES_MAX_AGE_DAYS (or --days)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.BOARD_CHANGES_MAX_AGE_DAYS,
+                            help="Keep the changes of this many days.")
+        parser.add_argument("--batch-size", type=int, default=10000, help="Changes deleted per query.")
+
+    def handle(self, *args, **options):
+        deleted = BoardChange.objects.prune(timedelta(days=options["days"]), options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} change(s)."))
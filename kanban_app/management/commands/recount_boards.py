@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from kanban_app.models import Board
+
+
+class Command(BaseCommand):
+
+    """
+    Rebuild the denormalized task counters of all boards.
+
+    Usage:
+        python manage.py recount_boards
+        python manage.py recount_boards --board 1 --board 2
+    """
+    help = "Rebuild the stored task counters of all (or the given) boards."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--board", type=int, action="append", dest="board_ids",
+                            help="Only recount this board ID (can be repeated).")
+
+    def handle(self, *args, **options):
+        boards = Board.objects.all()
+        if options["board_ids"]:
+            boards = boards.filter(id__in=options["board_ids"])
+        updated = boards.recount_tasks()
+        self.stdout.write(self.style.SUCCESS(f"Recounted {updated} board(s)."))
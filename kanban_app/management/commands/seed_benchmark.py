@@ -0,0 +1,143 @@
+import random
+import time
+from datetime import date, timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from kanban_app.models import Board
+from tasks_app.models import Comment, Task
+from tasks_app.positions import append_positions
+from users_auth_app.models import User
+
+EMAIL_DOMAIN = "bench.local"
+PASSWORD = "benchmark"
+# fixed, so the same seed gives the same data on any day
+BASE_DATE = date(2026, 1, 1)
+
+SIZES = {
+    "small": {"users": 200, "boards": 50, "tasks": 5_000, "comments": 20_000},
+    "medium": {"users": 2_000, "boards": 400, "tasks": 100_000, "comments": 400_000},
+    "large": {"users": 10_000, "boards": 2_000, "tasks": 500_000, "comments": 2_000_000},
+}
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Command(BaseCommand):
+
+    """
+    Generate a reproducible synthetic data set for benchmarks with bulk_create.
+
+    Users are `bench-<n>@bench.local` with the password `benchmark`.
+    `bench-0@bench.local` is the "heavy" user: owner of the first board and a
+    member of about one in ten boards, so the benchmarks see large lists.
+
+    Signals are bypassed (bulk_create), so the stored task and comment counters
+    are set directly and no change log entries are written.
+
+    Usage:
+        python manage.py seed_benchmark --size small
+        python manage.py seed_benchmark --size large --seed 7
+        python manage.py seed_benchmark --users 500 --boards 100 --tasks 20000 --comments 50000
+    """
+    help = "Seed users, boards, tasks and comments for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", choices=SIZES, default="small", help="Preset data size.")
+        for name in ("users", "boards", "tasks", "comments"):
+            parser.add_argument(f"--{name}", type=int, help=f"Number of {name} (overrides --size).")
+        parser.add_argument("--members-per-board", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed, same data).")
+        parser.add_argument("--batch-size", type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] if options[name] is not None else value
+                 for name, value in SIZES[options["size"]].items()}
+        if sizes["users"] < 1 or (sizes["tasks"] and sizes["boards"] < 1):
+            raise CommandError("At least one user and, with tasks, one board are needed.")
+        if User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").exists():
+            raise CommandError("Benchmark data already exists, seed into a fresh database.")
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        start = time.perf_counter()
+        with transaction.atomic():
+            user_ids = self.create_users(sizes["users"])
+            members = self.create_boards(sizes["boards"], user_ids, options["members_per_board"])
+            self.create_tasks(sizes["tasks"], sizes["comments"], members)
+            Board.objects.filter(id__in=members).recount_tasks()
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {sizes['users']} users, {sizes['boards']} boards, {sizes['tasks']} tasks and "
+            f"{sizes['comments']} comments in {time.perf_counter() - start:.1f}s. "
+            f"Log in as bench-0@{EMAIL_DOMAIN} / {PASSWORD}."
+        ))
+
+    def create_users(self, count):
+        password = make_password(PASSWORD)
+        users = [
+            User(email=f"bench-{i}@{EMAIL_DOMAIN}", fullname=f"Bench User {i}", password=password)
+            for i in range(count)
+        ]
+        return [user.id for user in User.objects.bulk_create(users, batch_size=self.batch_size)]
+
+    def create_boards(self, count, user_ids, members_per_board):
+        """Create the boards and their memberships. Returns {board_id: [member IDs]}."""
+        owners = [user_ids[0]] + [self.rng.choice(user_ids) for _ in range(count - 1)]
+        boards = Board.objects.bulk_create(
+            [Board(title=f"Board {i}", owner_id=owner_id) for i, owner_id in enumerate(owners)],
+            batch_size=self.batch_size,
+        )
+        members = {}
+        for board in boards:
+            sample = self.rng.sample(user_ids, min(members_per_board, len(user_ids)))
+            if self.rng.random() < 0.1:
+                sample.append(user_ids[0])
+            members[board.id] = sorted({board.owner_id, *sample})
+
+        through = Board.members.through
+        rows = [through(board_id=board_id, user_id=user_id)
+                for board_id, board_members in members.items() for user_id in board_members]
+        through.objects.bulk_create(rows, batch_size=self.batch_size)
+        return members
+
+    def create_tasks(self, count, comment_count, members):
+        board_ids = list(members)
+        statuses = [value for value, _ in Task.STATUS_CHOICES]
+        priorities = [value for value, _ in Task.PRIORITY_CHOICES]
+        # comments are spread over the tasks; comments_count is set up front
+        comments_per_task = [0] * count
+        for _ in range(comment_count if count else 0):
+            comments_per_task[self.rng.randrange(count)] += 1
+
+        last_positions = {}
+        for offset in range(0, count, self.batch_size):
+            tasks = []
+            for i in range(offset, min(offset + self.batch_size, count)):
+                board_id = self.rng.choice(board_ids)
+                board_members = members[board_id]
+                tasks.append(Task(
+                    board_id=board_id,
+                    title=f"Task {i}",
+                    description="Synthetic benchmark task. " * self.rng.randint(0, 8),
+                    owner_id=board_members[0],
+                    status=self.rng.choice(statuses),
+                    priority=self.rng.choice(priorities),
+                    assignee_id=self.rng.choice(board_members) if self.rng.random() < 0.8 else None,
+                    reviewer_id=self.rng.choice(board_members) if self.rng.random() < 0.5 else None,
+                    due_date=BASE_DATE + timedelta(days=self.rng.randint(-30, 90)),
+                    comments_count=comments_per_task[i],
+                ))
+            tasks = Task.objects.bulk_create(append_positions(tasks, last_positions))
+
+            comments = [
+                Comment(task_id=task.id, author_id=self.rng.choice(members[task.board_id]),
+                        content=f"Comment {n} on {task.title}")
+                for task in tasks for n in range(task.comments_count)
+            ]
+            for chunk in _chunks(comments, self.batch_size):
+                Comment.objects.bulk_create(chunk)
+            self.stdout.write(f"  {offset + len(tasks)}/{count} tasks", ending="\r")
+        self.stdout.write("")
@@ -0,0 +1,124 @@
+"""
+Board membership resolver used by the permission classes.
+
+`accessible_board_ids(request)` returns the IDs of all boards the current
+user owns or is a member of. The set is loaded with one query and cached:
+
+- on the request, so repeated permission checks within one request are a
+  set lookup;
+- optionally across requests in the Django cache, when
+  `BOARD_ACCESS_CACHE_TIMEOUT` is set to a positive number of seconds. Cache
+  keys carry a per-user version that `kanban_app.signals` bumps whenever the
+  user's boards or memberships change. Use a shared cache backend (e.g. Redis)
+  when running several workers, otherwise other workers keep stale entries
+  until the timeout expires.
+"""
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from core.db_router import primary_reads
+from kanban_app.models import Board
+
+REQUEST_ATTR = "_accessible_board_ids"
+
+
+def _version_key(user_id):
+    return f"kanban:board-access-version:{user_id}"
+
+
+def _new_version():
+    # Time based, so an evicted version key never resurrects an old entry.
+    return time.time_ns()
+
+
+def _cache_timeout():
+    return getattr(settings, "BOARD_ACCESS_CACHE_TIMEOUT", 0)
+
+
+def cache_enabled():
+    """Return whether membership sets are cached across requests."""
+    return bool(_cache_timeout())
+
+
+def load_accessible_board_ids(user_id):
+    """
+    Return the IDs of all boards the user owns or is a member of (one query).
+    """
+    return frozenset(
+        Board.objects.accessible_to_id(user_id).values_list("id", flat=True)
+    )
+
+
+def get_accessible_board_ids(user_id):
+    """
+    Return the user's board IDs, using the cross-request cache when enabled.
+    """
+    if not cache_enabled():
+        return load_accessible_board_ids(user_id)
+    timeout = _cache_timeout()
+    version = cache.get_or_set(_version_key(user_id), _new_version, timeout=None)
+    key = f"kanban:board-access:{user_id}:{version}"
+    board_ids = cache.get(key)
+    if board_ids is None:
+        # from the primary: a replica may not have the change that bumped the version yet
+        with primary_reads():
+            board_ids = load_accessible_board_ids(user_id)
+        cache.set(key, board_ids, timeout)
+    return board_ids
+
+
+def accessible_board_ids(request):
+    """
+    Return the current user's board IDs, cached on the request.
+    """
+    board_ids = getattr(request, REQUEST_ATTR, None)
+    if board_ids is None:
+        board_ids = get_accessible_board_ids(request.user.id)
+        setattr(request, REQUEST_ATTR, board_ids)
+    return board_ids
+
+
+def has_board_access(request, board):
+    """
+    Check whether the current user may access the board (instance or ID).
+
+    Owners and superusers are recognised without touching the database.
+    """
+    user = request.user
+    if user.is_superuser:
+        return True
+    if isinstance(board, Board):
+        if board.owner_id == user.id:
+            return True
+        board = board.pk
+    return int(board) in accessible_board_ids(request)
+
+
+async def ahas_board_access(user, board_id):
+    """
+    Async variant of `has_board_access` for the async views (no request cache).
+    """
+    if user.is_superuser:
+        return True
+    return board_id in await sync_to_async(get_accessible_board_ids)(user.id)
+
+
+def invalidate_user(*user_ids):
+    """
+    Bump the cache version of the given users so their cached sets are
+    ignored, once the current transaction commits, so no reader can cache the
+    pre-commit set under the new version.
+    """
+    if not cache_enabled() or not user_ids:
+        return
+
+    def bump():
+        for user_id in user_ids:
+            try:
+                cache.incr(_version_key(user_id))
+            except ValueError:
+                cache.set(_version_key(user_id), _new_version(), timeout=None)
+
+    transaction.on_commit(bump)
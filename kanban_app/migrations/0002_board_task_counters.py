@@ -0,0 +1,85 @@
+# Generated by Django 5.1.6 on 2026-10-18 16:43
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+COUNTER_FILTERS = {
+    'ticket_count': {},
+    'tasks_to_do_count': {'status': 'to-do'},
+    'tasks_in_progress_count': {'status': 'in-progress'},
+    'tasks_review_count': {'status': 'review'},
+    'tasks_done_count': {'status': 'done'},
+    'tasks_low_prio_count': {'priority': 'low'},
+    'tasks_medium_prio_count': {'priority': 'medium'},
+    'tasks_high_prio_count': {'priority': 'high'},
+}
+
+
+def recount_tasks(apps, schema_editor):
+    Board = apps.get_model('kanban_app', 'Board')
+    Task = apps.get_model('tasks_app', 'Task')
+    counters = {}
+    for field, filters in COUNTER_FILTERS.items():
+        counts = (
+            Task.objects.filter(board_id=OuterRef('pk'), **filters)
+            .order_by()
+            .values('board_id')
+            .annotate(count=Count('*'))
+            .values('count')
+        )
+        counters[field] = Coalesce(Subquery(counts), 0)
+    Board.objects.update(**counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0001_initial'),
+        ('tasks_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='tasks_done_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_high_prio_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_in_progress_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_low_prio_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_medium_prio_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_to_do_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='ticket_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(recount_tasks, migrations.RunPython.noop),
+    ]
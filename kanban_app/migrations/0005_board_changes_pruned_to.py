@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0004_board_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='changes_pruned_to',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,5 +1,90 @@
-from django.db import models
+from datetime import timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from functools import partial
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Now
 from django.conf import settings 
+from django.utils import timezone
+from kanban_app.realtime import publish_changes
+
+
+class BoardQuerySet(models.QuerySet):
+
+    """
+    QuerySet for boards with helpers for list endpoints.
+    """
+
+    def accessible_to(self, user):
+        """
+        Return the boards the user owns or is a member of.
+
+        Membership is checked with a subquery instead of a join so that
+        later annotations are not skewed by the members join.
+        """
+        return self.accessible_to_id(user.id)
+
+    def accessible_to_id(self, user_id):
+        """Same as `accessible_to`, for a user ID."""
+        member_board_ids = Board.members.through.objects.filter(user_id=user_id).values("board_id")
+        return self.filter(Q(owner_id=user_id) | Q(id__in=member_board_ids))
+
+    def with_counts(self):
+        """
+        Annotate the member count so a whole list is loaded in one query.
+
+        Task counters are stored columns on the board, only the member count
+        has to be computed. The annotation is named `annotated_member_count`
+        because `member_count` is taken by the fallback property.
+        """
+        member_count = (
+            Board.members.through.objects.filter(board_id=OuterRef("pk"))
+            .order_by()
+            .values("board_id")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        return self.annotate(annotated_member_count=Coalesce(Subquery(member_count), 0))
+
+    def touch(self):
+        """
+        Bump the version stamp and modification time used for conditional GETs.
+        """
+        return self.update(version=F("version") + 1, updated_at=Now())
+
+    def adjust_task_counters(self, board_id, deltas):
+        """
+        Atomically apply counter deltas ({field: +n/-n}) to one board with F() expressions.
+
+        The board is touched in the same UPDATE, since its tasks changed.
+        """
+        changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        self.filter(pk=board_id).update(version=F("version") + 1, updated_at=Now(), **changes)
+
+    def recount_tasks(self):
+        """
+        Rebuild all stored task counters from the tasks table in one UPDATE.
+        The boards are touched as well.
+        """
+        tasks = self.model._meta.get_field("tasks").related_model
+
+        def task_count(**filters):
+            counts = (
+                tasks.objects.filter(board_id=OuterRef("pk"), **filters)
+                .order_by()
+                .values("board_id")
+                .annotate(count=Count("*"))
+                .values("count")
+            )
+            return Coalesce(Subquery(counts), 0)
+
+        counters = {"ticket_count": task_count()}
+        for status, field in Board.STATUS_COUNTER_FIELDS.items():
+            counters[field] = task_count(status=status)
+        for priority, field in Board.PRIORITY_COUNTER_FIELDS.items():
+            counters[field] = task_count(priority=priority)
+        return self.update(version=F("version") + 1, updated_at=Now(), **counters)
+
 
 class Board(models.Model):
 
@@ -10,35 +95,215 @@ class Board(models.Model):
     - title: Title of the board
     - owner: User who created/owns the board
     - members: Users who are members of the board
+    - ticket_count: Total number of tasks in the board
+    - tasks_<status>_count: Number of tasks per status
+    - tasks_<priority>_prio_count: Number of tasks per priority
+
+    - version: Stamp bumped on every change of the board, its tasks, their
+      comments or its members (used as ETag)
+    - updated_at: Time of the last such change (used as Last-Modified)
+    - changes_pruned_to: Change IDs up to this one may have been pruned from
+      the change log; older sync cursors are expired
+
+    The task counters are denormalized and kept up to date by the signal
+    handlers in `tasks_app.signals`. `manage.py recount_boards` rebuilds them.
 
     Properties:
     - member_count: Number of members in the board
-    - ticket_count: Total number of tasks in the board
-    - tasks_to_do_count: Number of tasks with status 'to-do'
-    - tasks_high_prio_count: Number of tasks with priority 'high'
     """
+    STATUS_COUNTER_FIELDS = {
+        "to-do": "tasks_to_do_count",
+        "in-progress": "tasks_in_progress_count",
+        "review": "tasks_review_count",
+        "done": "tasks_done_count",
+    }
+    PRIORITY_COUNTER_FIELDS = {
+        "low": "tasks_low_prio_count",
+        "medium": "tasks_medium_prio_count",
+        "high": "tasks_high_prio_count",
+    }
+
     title = models.CharField(max_length=255)
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='owned_boards', on_delete=models.CASCADE)
     members = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='boards', blank=True)
+    ticket_count = models.PositiveIntegerField(default=0, editable=False)
+    tasks_to_do_count = models.PositiveIntegerField(default=0, editable=False)
+    tasks_in_progress_count = models.PositiveIntegerField(default=0, editable=False)
+    tasks_review_count = models.PositiveIntegerField(default=0, editable=False)
+    tasks_done_count = models.PositiveIntegerField(default=0, editable=False)
+    tasks_low_prio_count = models.PositiveIntegerField(default=0, editable=False)
+    tasks_medium_prio_count = models.PositiveIntegerField(default=0, editable=False)
+    tasks_high_prio_count = models.PositiveIntegerField(default=0, editable=False)
+    version = models.PositiveBigIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    changes_pruned_to = models.PositiveBigIntegerField(default=0, editable=False)
+
+    objects = BoardQuerySet.as_manager()
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        """
+        Never write the task counters or the version from a possibly stale
+        instance. They are only changed through `adjust_task_counters`,
+        `recount_tasks` and `touch`.
+        """
+        adding = self._state.adding
+        if not adding and kwargs.get("update_fields") is None:
+            skipped = {"version", *self.counter_field_names()}
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in skipped
+            ]
+        super().save(*args, **kwargs)
+        if not adding:
+            Board.objects.filter(pk=self.pk).touch()
+
+    def get_etag(self):
+        """ETag of the board detail payload, derived from the version stamp."""
+        return f"board-{self.pk}-{self.version}"
+
+    @classmethod
+    def counter_field_names(cls):
+        """Return the names of all stored task counter fields."""
+        return ["ticket_count", *cls.STATUS_COUNTER_FIELDS.values(), *cls.PRIORITY_COUNTER_FIELDS.values()]
     
     @property
     def member_count(self):
         """Return the number of members in this board."""
         return self.members.count()
 
-    @property
-    def ticket_count(self):
-        """Return the total number of tasks in this board."""
-        return self.tasks.count()
-    @property
-    def tasks_to_do_count(self):
-        """Return the number of tasks with status 'to-do'."""
-        return self.tasks.filter(status="to-do").count()
+    @classmethod
+    def task_counter_fields(cls, status, priority):
+        """Return the counter fields a task with this status and priority contributes to."""
+        fields = ["ticket_count"]
+        if status in cls.STATUS_COUNTER_FIELDS:
+            fields.append(cls.STATUS_COUNTER_FIELDS[status])
+        if priority in cls.PRIORITY_COUNTER_FIELDS:
+            fields.append(cls.PRIORITY_COUNTER_FIELDS[priority])
+        return fields
 
-    @property
-    def tasks_high_prio_count(self):
-        """Return the number of tasks with priority 'high'."""
-        return self.tasks.filter(priority="high").count()
+
+class BoardChangeQuerySet(models.QuerySet):
+
+    """
+    QuerySet for the board change log.
+    """
+
+    def record(self, board_id, entity, entity_id, action, data=None):
+        """Append one change to the log of a board."""
+        return self.record_many([
+            BoardChange(board_id=board_id, entity=entity, entity_id=entity_id, action=action, data=data)
+        ])[0]
+
+    def record_many(self, changes):
+        """
+        Append unsaved BoardChange instances in one INSERT and publish them to
+        real-time subscribers once the transaction commits.
+        """
+        changes = self.bulk_create(changes)
+        if changes:
+            transaction.on_commit(partial(publish_changes, changes))
+        return changes
+
+    def since(self, cursor):
+        """Return the changes after the given cursor, oldest first."""
+        return self.filter(id__gt=cursor).order_by("id")
+
+    def settled(self):
+        """
+        Return the changes older than `BOARD_CHANGES_SETTLE_SECONDS`.
+
+        IDs are assigned on insert, not on commit, so on PostgreSQL a slower
+        transaction can still commit a change with a lower ID than one that
+        is already visible. A cursor that only moves over settled changes
+        does not skip it (as long as transactions are shorter than the window).
+        """
+        window = settings.BOARD_CHANGES_SETTLE_SECONDS
+        if not window:
+            return self
+        return self.filter(created_at__lte=timezone.now() - timedelta(seconds=window))
+
+    def latest_cursor(self):
+        """ID of the newest settled change of the whole log, 0 if there is none."""
+        return self.settled().order_by("-id").values_list("id", flat=True).first() or 0
+
+    def prune(self, max_age, batch_size=10000):
+        """
+        Delete the changes older than `max_age` (a timedelta) in batches of
+        IDs, oldest first, and move `Board.changes_pruned_to` of the affected
+        boards past them. Returns the number of deleted changes.
+        """
+        first_kept = (
+            self.filter(created_at__gte=timezone.now() - max_age)
+            .order_by("id").values_list("id", flat=True).first()
+        )
+        if first_kept is None:
+            # everything is old; stop at the current end so new changes are kept
+            newest = self.order_by("-id").values_list("id", flat=True).first()
+            first_kept = newest + 1 if newest is not None else 0
+        old = self.filter(id__lt=first_kept)
+        deleted = 0
+        while ids := list(old.order_by("id").values_list("id", flat=True)[:batch_size]):
+            batch = self.filter(id__lte=ids[-1])
+            with transaction.atomic():
+                Board.objects.filter(id__in=batch.values("board_id")).update(changes_pruned_to=ids[-1])
+                deleted += batch.delete()[0]
+        return deleted
+
+
+class BoardChange(models.Model):
+
+    """
+    Append-only log of changes to a board, used for delta sync.
+
+    Fields:
+    - board: The board that changed
+    - entity: What changed ('task', 'comment' or 'member')
+    - entity_id: ID of the task, comment or user
+    - action: 'created', 'updated' or 'deleted' ('deleted' entries are tombstones)
+    - data: Snapshot of the entity after the change (None for tombstones)
+    - created_at: When the change happened
+
+    The change ID doubles as the sync cursor.
+    """
+    ENTITY_CHOICES = [
+        ("task", "Task"),
+        ("comment", "Comment"),
+        ("member", "Member"),
+    ]
+
+    ACTION_CHOICES = [
+        ("created", "Created"),
+        ("updated", "Updated"),
+        ("deleted", "Deleted"),
+    ]
+
+    board = models.ForeignKey(Board, related_name="changes", on_delete=models.CASCADE)
+    entity = models.CharField(max_length=10, choices=ENTITY_CHOICES)
+    entity_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    data = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = BoardChangeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["board", "id"], name="boardchange_board_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} {self.entity_id} {self.action} (Board: {self.board_id})"
+
+    def as_event(self):
+        """Payload pushed to real-time subscribers (same shape as the change feed)."""
+        return {
+            "id": self.id,
+            "entity": self.entity,
+            "entity_id": self.entity_id,
+            "action": self.action,
+            "data": self.data,
+            "created_at": self.created_at,
+        }
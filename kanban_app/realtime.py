@@ -0,0 +1,134 @@
+"""
+In-process publish/subscribe for real-time board events.
+
+Board changes (see `kanban_app.models.BoardChange`) are published after the
+surrounding transaction commits and fanned out to every subscriber of the
+board. Subscribers are async consumers (the SSE endpoint in
+`kanban_app.api.views`) and may live on any event loop; publishing is
+thread-safe, so sync views running in worker threads can publish directly.
+
+The broker is pluggable through the `REALTIME_BROKER` setting (dotted path to a
+class with `publish(board_id, event)` and `subscribe(board_id)`). The default
+`InMemoryBroker` only reaches subscribers in the same process; run a single
+ASGI process or plug in a broker backed by an external pub/sub (e.g. Redis)
+when running several.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class SubscriptionClosed(Exception):
+    """Raised by `Subscription.get` once the subscription can no longer deliver events."""
+
+
+class Subscription:
+
+    """
+    Queue of events for one subscriber of one board.
+
+    Created by `InMemoryBroker.subscribe` on the subscriber's event loop. If
+    the consumer falls more than `max_pending` events behind, the subscription
+    is closed and the client is expected to reconnect and replay from the
+    change log.
+    """
+
+    def __init__(self, broker, board_id, max_pending):
+        self.broker = broker
+        self.board_id = board_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.closed = False
+
+    def _deliver(self, event):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close()
+
+    def push(self, event):
+        """Hand an event to the subscriber's loop (thread-safe)."""
+        self.loop.call_soon_threadsafe(self._deliver, event)
+
+    async def get(self, timeout=None):
+        """
+        Wait for the next event. Raises `asyncio.TimeoutError` after `timeout` seconds
+        and `SubscriptionClosed` once the subscription is closed.
+        """
+        if self.closed and self.queue.empty():
+            raise SubscriptionClosed()
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+
+    """
+    Process-local broker: board ID -> set of subscriptions.
+    """
+    max_pending = 1000
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, board_id):
+        """Register a subscription for the board. Must be called from a running event loop."""
+        subscription = Subscription(self, board_id, self.max_pending)
+        with self._lock:
+            self._subscriptions[board_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.board_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.board_id]
+
+    def subscriber_count(self, board_id):
+        with self._lock:
+            return len(self._subscriptions.get(board_id, ()))
+
+    def publish(self, board_id, event):
+        """Fan an event out to all subscribers of the board (thread-safe)."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(board_id, ()))
+        for subscription in subscriptions:
+            subscription.push(event)
+
+
+_broker = None
+_broker_path = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Return the process-wide broker configured by `REALTIME_BROKER`.
+    """
+    global _broker, _broker_path
+    path = getattr(settings, "REALTIME_BROKER", "kanban_app.realtime.InMemoryBroker")
+    with _broker_lock:
+        if _broker is None or _broker_path != path:
+            _broker = import_string(path)()
+            _broker_path = path
+        return _broker
+
+
+def publish_changes(changes):
+    """
+    Publish saved BoardChange rows to the subscribers of their boards.
+    """
+    broker = get_broker()
+    for change in changes:
+        broker.publish(change.board_id, change.as_event())
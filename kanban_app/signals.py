@@ -0,0 +1,63 @@
+"""
+Signal handlers for board and membership changes:
+
+- invalidate the cached board membership sets (see `kanban_app.membership`);
+- touch the board version stamp when its members change;
+- append member changes to the board change log;
+- invalidate the cached board list payloads (see `kanban_app.summary_cache`).
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+from kanban_app.membership import invalidate_user
+from kanban_app.models import Board, BoardChange
+from kanban_app.summary_cache import invalidate_boards
+
+
+@receiver(post_init, sender=Board)
+def remember_owner(sender, instance, **kwargs):
+    instance._loaded_owner_id = instance.__dict__.get("owner_id")
+
+
+@receiver(post_save, sender=Board)
+def invalidate_owner(sender, instance, created, **kwargs):
+    user_ids = {instance.owner_id, instance._loaded_owner_id} - {None}
+    invalidate_user(*user_ids)
+    instance._loaded_owner_id = instance.owner_id
+    if not created:
+        invalidate_boards(instance.pk)
+
+
+@receiver(post_delete, sender=Board)
+def invalidate_deleted_board(sender, instance, **kwargs):
+    # Members keep a stale ID of a board that no longer exists, which is harmless.
+    invalidate_user(instance.owner_id)
+    invalidate_boards(instance.pk)
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        if reverse:
+            instance._cleared_board_ids = list(instance.boards.values_list("id", flat=True))
+        else:
+            instance._cleared_member_ids = list(instance.members.values_list("id", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if action == "post_clear":
+        pk_set = getattr(instance, "_cleared_board_ids" if reverse else "_cleared_member_ids", [])
+    # (board_id, user_id) pairs that changed
+    pairs = [(pk, instance.pk) for pk in pk_set] if reverse else [(instance.pk, pk) for pk in pk_set]
+    if not pairs:
+        return
+
+    Board.objects.filter(pk__in={board_id for board_id, _ in pairs}).touch()
+    invalidate_user(*{user_id for _, user_id in pairs})
+    invalidate_boards(*{board_id for board_id, _ in pairs})
+    change = "created" if action == "post_add" else "deleted"
+    BoardChange.objects.record_many([
+        BoardChange(board_id=board_id, entity="member", entity_id=user_id, action=change,
+                    data={"id": user_id} if change == "created" else None)
+        for board_id, user_id in pairs
+    ])
@@ -0,0 +1,125 @@
+"""
+Server-side cache of the board list payload (`BoardSerializer` output).
+
+Enabled when `BOARD_SUMMARY_CACHE_TIMEOUT` is a positive number of seconds.
+Entries live in the cache named by `BOARD_SUMMARY_CACHE` (locmem by default,
+Redis when `REDIS_URL` is set, see `CACHES` in the settings).
+
+An entry is keyed by the user and the version of every board in their list.
+The board IDs come from `kanban_app.membership`, the versions are cache keys
+bumped by `invalidate_boards()`, which the signal handlers call whenever the
+counters, title, owner or members of a board change. A bumped version makes
+every list containing that board miss; old entries simply expire.
+
+With `BOARD_ACCESS_CACHE_TIMEOUT` enabled as well, a cached list is served
+without any database query.
+"""
+import hashlib
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from core.db_router import primary_reads
+from kanban_app.membership import get_accessible_board_ids
+
+
+class CacheStats:
+
+    """
+    Per-process hit/miss/eviction counters of the summary cache.
+
+    - hits: lists served from the cache
+    - misses: lists built from the database
+    - evictions: board versions bumped, each invalidating every cached list
+      that contains the board
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def incr(self, name, count=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def as_dict(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+stats = CacheStats()
+
+
+def _cache():
+    return caches[getattr(settings, "BOARD_SUMMARY_CACHE", "default")]
+
+
+def _cache_timeout():
+    return getattr(settings, "BOARD_SUMMARY_CACHE_TIMEOUT", 0)
+
+
+def cache_enabled():
+    """Return whether board list payloads are cached."""
+    return bool(_cache_timeout())
+
+
+def _version_key(board_id):
+    return f"kanban:board-summary-version:{board_id}"
+
+
+def _board_versions(board_ids):
+    cache = _cache()
+    keys = {board_id: _version_key(board_id) for board_id in board_ids}
+    found = cache.get_many(keys.values())
+    missing = {key: time.time_ns() for key in keys.values() if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return [(board_id, found[key]) for board_id, key in sorted(keys.items())]
+
+
+def _list_key(user_id, board_ids):
+    versions = ",".join(f"{board_id}:{version}" for board_id, version in _board_versions(board_ids))
+    digest = hashlib.sha1(versions.encode()).hexdigest()
+    return f"kanban:board-summary:{user_id}:{digest}"
+
+
+def get_board_list(user_id, load):
+    """
+    Return the board list payload of a user from the cache, or build it with
+    `load()` and cache it. `load` must return plain serializer data.
+    """
+    if not cache_enabled():
+        return load()
+    key = _list_key(user_id, get_accessible_board_ids(user_id))
+    data = _cache().get(key)
+    if data is not None:
+        stats.incr("hits")
+        return data
+    stats.incr("misses")
+    # from the primary: a replica may not have the change that bumped a version yet
+    with primary_reads():
+        data = load()
+    _cache().set(key, data, _cache_timeout())
+    return data
+
+
+def invalidate_boards(*board_ids):
+    """
+    Bump the versions of the given boards once the current transaction
+    commits, so no reader can cache the pre-commit state under the new version.
+    """
+    if not cache_enabled() or not board_ids:
+        return
+
+    def bump():
+        now = time.time_ns()
+        _cache().set_many({_version_key(board_id): now for board_id in board_ids}, timeout=None)
+        stats.incr("evictions", len(board_ids))
+
+    transaction.on_commit(bump)
@@ -1,3 +1,879 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from core import profiling
+from core.conditional import ConditionalRetrieveMixin
+from core.db_router import replica_reads
+from core.sqlite import pragma
+from kanban_app.membership import has_board_access
+from kanban_app.models import Board, BoardChange
+from kanban_app.realtime import InMemoryBroker, SubscriptionClosed
+from kanban_app.summary_cache import stats as summary_stats
+from tasks_app.models import Task
+from users_auth_app.models import User
 
-# Create your tests here.
+
+class BoardListQueryTests(TestCase):
+
+    """
+    The board list must load all counters in a fixed number of queries.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.other = User.objects.create_user(email="member@mail.de", fullname="Member", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_board(self, title, owner, members=()):
+        board = Board.objects.create(title=title, owner=owner)
+        board.members.set(members)
+        Task.objects.create(board=board, title="a", status="to-do", priority="high")
+        Task.objects.create(board=board, title="b", status="done", priority="low")
+        return board
+
+    def test_counts_match_properties(self):
+        board = self.create_board("Own", self.user, [self.user, self.other])
+        board.refresh_from_db()
+        response = self.client.get(reverse("board-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [{
+            "id": board.id,
+            "title": "Own",
+            "member_count": board.member_count,
+            "ticket_count": board.ticket_count,
+            "tasks_to_do_count": board.tasks_to_do_count,
+            "tasks_high_prio_count": board.tasks_high_prio_count,
+            "owner_id": self.user.id,
+        }])
+        self.assertEqual(response.data[0]["member_count"], 2)
+        self.assertEqual(response.data[0]["ticket_count"], 2)
+
+    def test_lists_owned_and_member_boards_once(self):
+        self.create_board("Own", self.user, [self.user])
+        self.create_board("Shared", self.other, [self.user, self.other])
+        self.create_board("Foreign", self.other, [self.other])
+        response = self.client.get(reverse("board-list"))
+        self.assertEqual([b["title"] for b in response.data], ["Own", "Shared"])
+
+    def test_query_count_independent_of_board_count(self):
+        for i in range(10):
+            self.create_board(f"Board {i}", self.other, [self.user, self.other])
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("board-list"))
+        self.assertEqual(len(response.data), 10)
+
+
+@override_settings(BOARD_SUMMARY_CACHE_TIMEOUT=60, BOARD_ACCESS_CACHE_TIMEOUT=60)
+class BoardSummaryCacheTests(TestCase):
+
+    """
+    The board list is cached per user and board versions and refreshed when
+    tasks, members or the board change.
+    """
+
+    def setUp(self):
+        cache.clear()
+        summary_stats.reset()
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.other = User.objects.create_user(email="member@mail.de", fullname="Member", password="pw")
+        self.board = Board.objects.create(title="Board", owner=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("board-list")
+
+    def write(self, func, *args, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return func(*args, **kwargs)
+
+    def test_repeat_read_runs_no_queries(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data[0]["title"], "Board")
+        self.assertEqual(summary_stats.as_dict(), {"hits": 1, "misses": 1, "evictions": 0})
+
+    def test_task_write_invalidates(self):
+        self.client.get(self.url)
+        task = self.write(Task.objects.create, board=self.board, title="a", priority="high")
+        self.assertEqual(self.client.get(self.url).data[0]["tasks_high_prio_count"], 1)
+        self.write(task.delete)
+        self.assertEqual(self.client.get(self.url).data[0]["ticket_count"], 0)
+        self.assertEqual(summary_stats.evictions, 2)
+
+    def test_member_change_invalidates_both_users(self):
+        other_client = APIClient()
+        other_client.force_authenticate(self.other)
+        self.assertEqual(other_client.get(self.url).data, [])
+        self.client.get(self.url)
+        self.write(self.board.members.add, self.other)
+        self.assertEqual(self.client.get(self.url).data[0]["member_count"], 1)
+        self.assertEqual(other_client.get(self.url).data[0]["title"], "Board")
+
+    def test_board_rename_invalidates(self):
+        self.client.get(self.url)
+        self.board.title = "Renamed"
+        self.write(self.board.save)
+        self.assertEqual(self.client.get(self.url).data[0]["title"], "Renamed")
+
+    def test_paginated_requests_bypass_cache(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url + "?page_size=1")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(summary_stats.hits, 0)
+
+
+class BoardDetailQueryTests(TestCase):
+
+    """
+    The board detail must not issue per-task queries.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.other = User.objects.create_user(email="member@mail.de", fullname="Member", password="pw")
+        self.board = Board.objects.create(title="Board", owner=self.user)
+        self.board.members.set([self.user, self.other])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(
+                board=self.board, title=f"Task {i}", assignee=self.user, reviewer=self.other
+            )
+            task.comments.create(author=self.user, content="first")
+            task.comments.create(author=self.other, content="second")
+
+    def test_detail_payload(self):
+        self.add_tasks(1)
+        response = self.client.get(reverse("board-detail", args=[self.board.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["owner_id"], self.user.id)
+        self.assertEqual(len(response.data["members"]), 2)
+        task = response.data["tasks"][0]
+        self.assertEqual(task["assignee"]["email"], "owner@mail.de")
+        self.assertEqual(task["reviewer"]["email"], "member@mail.de")
+        self.assertEqual(task["comments_count"], 2)
+
+    def test_query_count_is_fixed(self):
+        self.add_tasks(20)
+        # board + owner, members, tasks with assignee/reviewer/comment counts
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("board-detail", args=[self.board.id]))
+        self.assertEqual(len(response.data["tasks"]), 20)
+
+    def set_members(self, user_ids):
+        board = Board.objects.create(title="Members", owner=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(reverse("board-detail", args=[board.id]), {"members": user_ids}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["members_data"]), len(user_ids))
+        # the change log INSERT is split into batches by SQLite's parameter limit
+        return len([query for query in queries if not query["sql"].startswith('INSERT INTO "kanban_app_boardchange"')])
+
+    def test_member_update_query_count_is_fixed(self):
+        users = User.objects.bulk_create(
+            User(email=f"user{i}@mail.de", fullname=f"User {i}") for i in range(200)
+        )
+        user_ids = [user.id for user in users]
+        self.assertEqual(self.set_members(user_ids[:10]), self.set_members(user_ids))
+
+    def test_member_update_rejects_unknown_ids(self):
+        response = self.client.patch(reverse("board-detail", args=[self.board.id]),
+                                     {"members": [self.other.id, 9999, 9998]}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("[9999, 9998]", str(response.data["members"]))
+        self.assertEqual(self.board.members.count(), 2)
+
+
+class BoardCounterTests(TestCase):
+
+    """
+    Stored task counters follow task writes and can be rebuilt.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.board = Board.objects.create(title="Board", owner=self.user)
+
+    def counters(self):
+        self.board.refresh_from_db()
+        return {name: getattr(self.board, name) for name in Board.counter_field_names()}
+
+    def test_counters_follow_task_writes(self):
+        task = Task.objects.create(board=self.board, title="a", status="to-do", priority="high")
+        Task.objects.create(board=self.board, title="b", status="done", priority="low")
+        counters = self.counters()
+        self.assertEqual(counters["ticket_count"], 2)
+        self.assertEqual(counters["tasks_to_do_count"], 1)
+        self.assertEqual(counters["tasks_high_prio_count"], 1)
+
+        task.status = "review"
+        task.priority = "medium"
+        task.save()
+        counters = self.counters()
+        self.assertEqual(counters["tasks_to_do_count"], 0)
+        self.assertEqual(counters["tasks_review_count"], 1)
+        self.assertEqual(counters["tasks_high_prio_count"], 0)
+        self.assertEqual(counters["tasks_medium_prio_count"], 1)
+
+        task.delete()
+        counters = self.counters()
+        self.assertEqual(counters["ticket_count"], 1)
+        self.assertEqual(counters["tasks_review_count"], 0)
+
+    def test_unchanged_save_only_bumps_version(self):
+        task = Task.objects.create(board=self.board, title="a")
+        before = self.counters()
+        version = self.board.version
+        task.title = "renamed"
+        # the task row, the board version stamp and the change log entry
+        with self.assertNumQueries(3):
+            task.save()
+        self.assertEqual(self.counters(), before)
+        self.assertEqual(self.board.version, version + 1)
+
+    def test_board_save_keeps_counters(self):
+        stale = Board.objects.get(pk=self.board.pk)
+        Task.objects.create(board=self.board, title="a")
+        stale.title = "Renamed"
+        stale.save()
+        self.assertEqual(self.counters()["ticket_count"], 1)
+
+    def test_recount_boards_command(self):
+        Task.objects.create(board=self.board, title="a", status="in-progress", priority="low")
+        Task.objects.create(board=self.board, title="b", status="in-progress", priority="low")
+        Board.objects.update(ticket_count=0, tasks_in_progress_count=7)
+        call_command("recount_boards", stdout=StringIO())
+        counters = self.counters()
+        self.assertEqual(counters["ticket_count"], 2)
+        self.assertEqual(counters["tasks_in_progress_count"], 2)
+        self.assertEqual(counters["tasks_low_prio_count"], 2)
+
+
+class MembershipResolverTests(TestCase):
+
+    """
+    Board access checks are set lookups, cached per request and optionally across requests.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.user = User.objects.create_user(email="member@mail.de", fullname="Member", password="pw")
+        self.boards = [Board.objects.create(title=f"Board {i}", owner=self.owner) for i in range(3)]
+        self.boards[0].members.add(self.user)
+
+    def make_request(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return request
+
+    def test_one_query_per_request(self):
+        request = self.make_request()
+        with self.assertNumQueries(1):
+            results = [has_board_access(request, board) for board in self.boards * 3]
+        self.assertEqual(results, [True, False, False] * 3)
+
+    def test_without_cross_request_cache_each_request_reloads(self):
+        has_board_access(self.make_request(), self.boards[0])
+        with self.assertNumQueries(1):
+            has_board_access(self.make_request(), self.boards[0])
+
+    @override_settings(BOARD_ACCESS_CACHE_TIMEOUT=60)
+    def test_cross_request_cache_is_invalidated_on_membership_change(self):
+        self.assertFalse(has_board_access(self.make_request(), self.boards[1]))
+        with self.assertNumQueries(0):
+            self.assertFalse(has_board_access(self.make_request(), self.boards[1]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.boards[1].members.add(self.user)
+            # bumped on commit, so nothing can cache the uncommitted set under the new version
+            self.assertFalse(has_board_access(self.make_request(), self.boards[1]))
+        self.assertTrue(has_board_access(self.make_request(), self.boards[1]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.boards.remove(self.boards[1])
+        self.assertFalse(has_board_access(self.make_request(), self.boards[1]))
+
+    def test_task_permission_uses_membership(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(reverse("tasks"), {"board": self.boards[1].id, "title": "t"}, format="json")
+        self.assertEqual(response.status_code, 403)
+        response = client.post(reverse("tasks"), {"board": 9999, "title": "t"}, format="json")
+        self.assertEqual(response.status_code, 404)
+        response = client.post(reverse("tasks"), {"board": self.boards[0].id, "title": "t", "due_date": "2026-01-01"}, format="json")
+        self.assertEqual(response.status_code, 201)
+
+
+class BoardConditionalGetTests(TestCase):
+
+    """
+    The board detail answers matching conditional GETs with 304.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.other = User.objects.create_user(email="other@mail.de", fullname="Other", password="pw")
+        self.board = Board.objects.create(title="Board", owner=self.user)
+        self.task = Task.objects.create(board=self.board, title="a")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("board-detail", args=[self.board.id])
+
+    def get_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_not_modified_without_loading_payload(self):
+        etag = self.get_etag()
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_invalidate_etag(self):
+        etag = self.get_etag()
+        self.task.title = "renamed"
+        self.task.save()
+        self.assertNotEqual(self.get_etag(), etag)
+
+        etag = self.get_etag()
+        self.task.comments.create(author=self.user, content="hello")
+        self.assertNotEqual(self.get_etag(), etag)
+
+        etag = self.get_etag()
+        self.board.members.add(self.other)
+        self.assertNotEqual(self.get_etag(), etag)
+
+    def test_conditional_get_checks_permissions(self):
+        etag = self.get_etag()
+        self.client.force_authenticate(self.other)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+
+    def test_default_etag_follows_last_modified(self):
+        class View(ConditionalRetrieveMixin):
+            def get_last_modified(self, obj):
+                return obj.updated_at
+
+        etag = View().get_etag(self.board)
+        self.assertTrue(etag.startswith(f"kanban_app.board-{self.board.id}-"))
+        Board.objects.filter(pk=self.board.pk).touch()
+        self.board.refresh_from_db()
+        self.assertNotEqual(View().get_etag(self.board), etag)
+        self.assertIsNone(ConditionalRetrieveMixin().get_etag(self.board))
+
+
+@override_settings(BOARD_CHANGES_SETTLE_SECONDS=0)
+class BoardChangesTests(TestCase):
+
+    """
+    The change feed returns only what changed since the cursor, including tombstones.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.other = User.objects.create_user(email="other@mail.de", fullname="Other", password="pw")
+        self.board = Board.objects.create(title="Board", owner=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("board-changes", args=[self.board.id])
+
+    def sync(self, cursor, **params):
+        response = self.client.get(self.url, {"since": cursor, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_delta_sync(self):
+        Task.objects.create(board=self.board, title="before")
+        cursor = self.client.get(self.url).data["cursor"]
+
+        task = Task.objects.create(board=self.board, title="new")
+        comment = task.comments.create(author=self.user, content="hello")
+        task.status = "done"
+        task.save()
+        self.board.members.add(self.other)
+        comment.delete()
+        task.delete()
+
+        data = self.sync(cursor)
+        self.assertFalse(data["has_more"])
+        self.assertEqual(
+            [(c["entity"], c["action"]) for c in data["changes"]],
+            [("task", "created"), ("comment", "created"), ("task", "updated"),
+             ("member", "created"), ("comment", "deleted"), ("task", "deleted")],
+        )
+        self.assertEqual(data["changes"][2]["data"]["status"], "done")
+        self.assertIsNone(data["changes"][-1]["data"])
+        self.assertEqual(self.sync(data["cursor"])["changes"], [])
+
+    def test_limit_and_has_more(self):
+        cursor = self.client.get(self.url).data["cursor"]
+        for i in range(3):
+            Task.objects.create(board=self.board, title=f"Task {i}")
+        data = self.sync(cursor, limit=2)
+        self.assertTrue(data["has_more"])
+        self.assertEqual(len(data["changes"]), 2)
+        data = self.sync(data["cursor"], limit=2)
+        self.assertFalse(data["has_more"])
+        self.assertEqual(len(data["changes"]), 1)
+
+    def test_recent_changes_are_held_back(self):
+        cursor = self.client.get(self.url).data["cursor"]
+        Task.objects.create(board=self.board, title="new")
+        with override_settings(BOARD_CHANGES_SETTLE_SECONDS=60):
+            data = self.sync(cursor)
+            self.assertEqual((data["changes"], data["cursor"]), ([], cursor))
+        self.assertEqual(len(self.sync(cursor)["changes"]), 1)
+
+    def test_idle_cursor_follows_the_log(self):
+        cursor = self.client.get(self.url).data["cursor"]
+        elsewhere = Board.objects.create(title="Elsewhere", owner=self.other)
+        task = Task.objects.create(board=elsewhere, title="other board")
+        self.assertEqual(self.sync(cursor)["cursor"], BoardChange.objects.filter(entity_id=task.id).get().id)
+
+    def test_pruned_cursor_is_gone(self):
+        cursor = self.client.get(self.url).data["cursor"]
+        Task.objects.create(board=self.board, title="old")
+        Task.objects.create(board=self.board, title="old too")
+        BoardChange.objects.update(created_at=timezone.now() - timedelta(days=40))
+        Task.objects.create(board=self.board, title="recent")
+
+        out = StringIO()
+        call_command("prune_board_changes", days=30, batch_size=1, stdout=out)
+        self.assertIn("Deleted 2 change(s).", out.getvalue())
+        self.assertEqual(BoardChange.objects.count(), 1)
+        self.assertEqual(self.client.get(self.url, {"since": cursor}).status_code, 410)
+
+        cursor = self.client.get(self.url).data["cursor"]
+        self.assertEqual(self.sync(cursor)["changes"], [])
+
+    def test_requires_board_access(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class RealtimeBrokerTests(TestCase):
+
+    """
+    The in-memory broker fans out published board changes to subscribers.
+    """
+
+    async def test_fan_out_per_board(self):
+        broker = InMemoryBroker()
+        first, second, other = broker.subscribe(1), broker.subscribe(1), broker.subscribe(2)
+        await sync_to_async(broker.publish)(1, {"id": 1})
+        self.assertEqual(await first.get(timeout=1), {"id": 1})
+        self.assertEqual(await second.get(timeout=1), {"id": 1})
+        with self.assertRaises(asyncio.TimeoutError):
+            await other.get(timeout=0.05)
+        first.close()
+        self.assertEqual(broker.subscriber_count(1), 1)
+
+    async def test_slow_subscriber_is_closed(self):
+        broker = InMemoryBroker()
+        broker.max_pending = 1
+        subscription = broker.subscribe(1)
+        broker.publish(1, {"id": 1})
+        broker.publish(1, {"id": 2})
+        await asyncio.sleep(0)
+        self.assertEqual(await subscription.get(timeout=1), {"id": 1})
+        with self.assertRaises(SubscriptionClosed):
+            await subscription.get(timeout=1)
+
+
+class BoardEventStreamTests(TestCase):
+
+    """
+    The SSE endpoint checks membership and streams committed board changes.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.other = User.objects.create_user(email="other@mail.de", fullname="Other", password="pw")
+        self.token = Token.objects.create(user=self.user)
+        self.board = Board.objects.create(title="Board", owner=self.user)
+        self.url = reverse("board-events", args=[self.board.id])
+
+    def create_task(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Task.objects.create(board=self.board, title=title)
+
+    async def test_streams_task_events(self):
+        response = await self.async_client.get(self.url, headers={"Authorization": f"Token {self.token.key}"})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b": connected\n\n")
+
+        task = await sync_to_async(self.create_task)("live")
+        event = (await asyncio.wait_for(anext(stream), 2)).decode()
+        self.assertIn("event: task.created", event)
+        self.assertIn(f'"entity_id": {task.id}', event)
+        await stream.aclose()
+
+    async def test_replays_missed_changes(self):
+        await sync_to_async(self.create_task)("missed")
+        response = await self.async_client.get(self.url, {"token": self.token.key, "since": 0})
+        stream = aiter(response.streaming_content)
+        await anext(stream)
+        event = (await asyncio.wait_for(anext(stream), 2)).decode()
+        self.assertIn('"title": "missed"', event)
+        await stream.aclose()
+
+    async def test_requires_membership(self):
+        token = await Token.objects.acreate(user=self.other)
+        response = await self.async_client.get(self.url, {"token": token.key})
+        self.assertEqual(response.status_code, 403)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_refused_under_wsgi(self):
+        response = self.client.get(self.url, headers={"Authorization": f"Token {self.token.key}"})
+        self.assertEqual(response.status_code, 501)
+        self.assertFalse(response.streaming)
+
+
+class AsyncBoardViewTests(TestCase):
+
+    """
+    Under ASGI the board list/detail are served by the async views, with the
+    same payloads and status codes as the DRF views.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.other = User.objects.create_user(email="other@mail.de", fullname="Other", password="pw")
+        self.token = Token.objects.create(user=self.user)
+        self.board = Board.objects.create(title="Board", owner=self.user)
+        self.board.members.set([self.user, self.other])
+        Task.objects.create(board=self.board, title="a", assignee=self.other, priority="high")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.headers = {"Authorization": f"Token {self.token.key}"}
+
+    async def test_payloads_match_sync_views(self):
+        for url in (reverse("board-list"), reverse("board-detail", args=[self.board.id])):
+            expected = await sync_to_async(self.client.get)(url)
+            response = await self.async_client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), json.loads(expected.content))
+
+    async def test_detail_conditional_get(self):
+        url = reverse("board-detail", args=[self.board.id])
+        response = await self.async_client.get(url, headers=self.headers)
+        etag = response["ETag"]
+        response = await self.async_client.get(url, headers={**self.headers, "If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_permissions(self):
+        url = reverse("board-detail", args=[self.board.id])
+        self.assertEqual((await self.async_client.get(url)).status_code, 401)
+        stranger = await sync_to_async(User.objects.create_user)(
+            email="stranger@mail.de", fullname="Stranger", password="pw")
+        token = await Token.objects.acreate(user=stranger)
+        response = await self.async_client.get(url, headers={"Authorization": f"Token {token.key}"})
+        self.assertEqual(response.status_code, 403)
+        missing = reverse("board-detail", args=[self.board.id + 100])
+        self.assertEqual((await self.async_client.get(missing, headers=self.headers)).status_code, 404)
+
+    async def test_writes_use_drf_views(self):
+        url = reverse("board-detail", args=[self.board.id])
+        response = await self.async_client.patch(url, {"title": "Renamed"}, content_type="application/json",
+                                                 headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "Renamed")
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1.0)
+class ProfilingTests(TestCase):
+
+    """
+    The profiling middleware aggregates per-view measurements that the staff
+    endpoint and `perf_report` expose.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        Board.objects.create(title="Board", owner=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_records_queries_and_sizes(self):
+        for _ in range(3):
+            response = self.client.get(reverse("board-list"))
+        rows = {row["view"]: row for row in profiling.get_report()}
+        row = rows["GET board-list"]
+        self.assertEqual(row["requests"], 3)
+        self.assertEqual(row["avg_queries"], 1)
+        self.assertEqual(row["avg_response_bytes"], len(response.content))
+        self.assertIn("kanban_app_board", row["slow_queries"][0]["sql"])
+
+    def test_staff_endpoint_and_command(self):
+        self.client.get(reverse("board-list"))
+        self.assertEqual(self.client.get(reverse("perf-report")).status_code, 403)
+        staff = User.objects.create_user(email="staff@mail.de", fullname="Staff", password="pw", is_staff=True)
+        self.client.force_authenticate(staff)
+        response = self.client.get(reverse("perf-report"))
+        self.assertIn("GET board-list", [row["view"] for row in response.data["views"]])
+
+        out = StringIO()
+        call_command("perf_report", stdout=out)
+        self.assertIn("GET board-list", out.getvalue())
+        self.assertEqual(self.client.delete(reverse("perf-report")).status_code, 204)
+        # only the DELETE itself is recorded after the reset
+        self.assertEqual([row["view"] for row in profiling.get_report()], ["DELETE perf-report"])
+
+
+    def test_workers_get_their_own_slots(self):
+        workers = [profiling.Registry() for _ in range(3)]
+        for worker in workers:
+            worker._views = {"GET board-list": {**profiling._empty_stats(), "requests": 1}}
+        for worker in workers:
+            worker.flush()
+        self.assertEqual(len({worker.slot for worker in workers}), 3)
+        rows = {row["view"]: row for row in profiling.get_report()}
+        self.assertEqual(rows["GET board-list"]["requests"], 3)
+
+
+class BenchmarkCommandTests(TestCase):
+
+    """
+    `seed_benchmark` generates consistent data that `benchmark_api` can run on.
+    """
+
+    def test_seed_and_benchmark(self):
+        call_command("seed_benchmark", users=20, boards=4, tasks=60, comments=120, batch_size=25, stdout=StringIO())
+        self.assertEqual(Task.objects.count(), 60)
+        board = Board.objects.order_by("-ticket_count").first()
+        self.assertEqual(board.ticket_count, board.tasks.count())
+        task = Task.objects.order_by("-comments_count").first()
+        self.assertEqual(task.comments_count, task.comments.count())
+
+        with tempfile.NamedTemporaryFile(suffix=".json") as file:
+            call_command("benchmark_api", repeat=2, json_path=file.name, stdout=StringIO())
+            report = json.load(file)
+        self.assertEqual(report["dataset"]["comments"], 120)
+        results = {result["endpoint"]: result for result in report["results"]}
+        # token lookup (not cached without a shared cache) and the list
+        self.assertEqual(results["assigned-tasks"]["queries"], 2)
+
+    def test_write_benchmark_cleans_up(self):
+        with tempfile.NamedTemporaryFile(suffix=".json") as file:
+            call_command("bench_db_writes", workers=1, requests=5, tasks=2, json_path=file.name, stdout=StringIO())
+            report = json.load(file)
+        self.assertEqual((report["ok"], report["error_count"]), (5, 0))
+        self.assertFalse(Board.objects.filter(title="Write benchmark").exists())
+
+
+class BoardExportTests(TestCase):
+
+    """
+    The export streams the whole board with a fixed number of queries.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.other = User.objects.create_user(email="member@mail.de", fullname="Member", password="pw")
+        self.board = Board.objects.create(title="Board", owner=self.user)
+        self.board.members.set([self.user, self.other])
+        for i in range(5):
+            task = Task.objects.create(board=self.board, title=f"Task {i}", assignee=self.other)
+            for n in range(i):
+                task.comments.create(author=self.user, content=f"Comment {n}")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("board-export", args=[self.board.id])
+
+    def test_json_export(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        # members, tasks and comments, independent of the board size
+        with self.assertNumQueries(3):
+            data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["board"]["owner"], "owner@mail.de")
+        self.assertEqual(data["members"], ["owner@mail.de", "member@mail.de"])
+        self.assertEqual([len(task["comments"]) for task in data["tasks"]], [0, 1, 2, 3, 4])
+        self.assertEqual(data["tasks"][0]["assignee"], "member@mail.de")
+
+    def test_ndjson_export(self):
+        response = self.client.get(self.url, {"export_format": "ndjson"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        types = [record["type"] for record in records]
+        self.assertEqual(types.count("task"), 5)
+        self.assertEqual(types.count("comment"), 10)
+        last_task = next(r for r in reversed(records) if r["type"] == "task")
+        self.assertTrue(all(r["task"] == last_task["id"] for r in records[-4:]))
+
+    async def test_asgi_export_streams(self):
+        token = await Token.objects.acreate(user=self.user)
+        response = await self.async_client.get(
+            self.url, {"export_format": "ndjson"}, headers={"Authorization": f"Token {token.key}"})
+        # an async iterator, which Django streams instead of buffering it under ASGI
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        types = [json.loads(line)["type"] for line in body.splitlines()]
+        self.assertEqual((types.count("task"), types.count("comment")), (5, 10))
+
+    def test_requires_membership(self):
+        stranger = User.objects.create_user(email="stranger@mail.de", fullname="Stranger", password="pw")
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(self.url, {"export_format": "xml"}).status_code, 400)
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command("export_board", self.board.id, export_format="ndjson", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 1 + 2 + 5 + 10)
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite profile")
+class SQLiteProfileTests(TestCase):
+
+    """
+    The opt-in SQLite profile tunes new connections and takes the write lock
+    when a transaction starts.
+    """
+
+    def test_tuned_connection(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tuned.sqlite3")
+            tuned = DatabaseWrapper(
+                {**connection.settings_dict, "NAME": path, "OPTIONS": {"transaction_mode": "IMMEDIATE"}},
+                alias="tuned",
+            )
+            connections["tuned"] = tuned
+            pragmas = {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -4096}
+            try:
+                with override_settings(SQLITE_PRAGMAS=pragmas):
+                    tuned.ensure_connection()
+                self.assertEqual(pragma(tuned, "journal_mode"), "wal")
+                self.assertEqual(pragma(tuned, "synchronous"), 1)
+                self.assertEqual(pragma(tuned, "cache_size"), -4096)
+
+                # a transaction holds the write lock from its start
+                with transaction.atomic(using="tuned"):
+                    other = sqlite3.connect(path, timeout=0)
+                    with self.assertRaisesMessage(sqlite3.OperationalError, "database is locked"):
+                        other.execute("BEGIN IMMEDIATE")
+                    other.close()
+            finally:
+                tuned.close()
+                del connections["tuned"]
+
+
+@override_settings(REPLICA_DATABASES=["replica"], REPLICA_STICKY_SECONDS=10)
+class ReplicaRoutingTests(TestCase):
+
+    """
+    Reads of API requests go to the replica (a second SQLite file here, which
+    does not replicate, so the two databases can be told apart), writes and
+    reads after a write go to the primary.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.replica = DatabaseWrapper(
+            {**connection.settings_dict, "NAME": os.path.join(cls.directory.name, "replica.sqlite3")},
+            alias="replica",
+        )
+        connections["replica"] = cls.replica
+        call_command("migrate", database="replica", verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.replica.close()
+        del connections["replica"]
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.board = Board.objects.create(title="Primary", owner=self.user)
+        self.board.members.add(self.user)
+        # a replica lagging behind: same user and board, older title
+        User.objects.using("replica").bulk_create([User(id=self.user.id, email=self.user.email, fullname="Owner")])
+        Board.objects.using("replica").bulk_create([Board(id=self.board.id, title="Replica", owner_id=self.user.id)])
+        Board.members.through.objects.using("replica").bulk_create(
+            [Board.members.through(board_id=self.board.id, user_id=self.user.id)])
+        self.addCleanup(self.clear_replica)
+        # token auth like the frontend: no cookies, the pin is kept server-side
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = reverse("board-detail", args=[self.board.id])
+        cache.clear()
+
+    def clear_replica(self):
+        Board.objects.using("replica").all().delete()
+        User.objects.using("replica").all().delete()
+
+    def test_reads_use_the_replica(self):
+        self.assertEqual(self.client.get(self.url).json()["title"], "Replica")
+        self.assertEqual([board["title"] for board in self.client.get(reverse("board-list")).json()], ["Replica"])
+
+    def test_reads_after_a_write_use_the_primary(self):
+        response = self.client.patch(self.url, {"title": "Renamed"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.url).json()["title"], "Renamed")
+        self.assertEqual(Board.objects.using("replica").get().title, "Replica")
+
+        # other clients are not pinned, and the pin expires
+        other = APIClient()
+        other.force_authenticate(self.user)
+        self.assertEqual(other.get(self.url).json()["title"], "Replica")
+        cache.clear()
+        self.assertEqual(self.client.get(self.url).json()["title"], "Replica")
+
+    def test_failed_write_does_not_pin(self):
+        response = self.client.patch(self.url, {"members": [self.user.id + 100]}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(self.url).json()["title"], "Replica")
+
+    def test_header_pins_to_primary(self):
+        response = self.client.get(self.url, headers={"X-Read-Primary": "1"})
+        self.assertEqual(response.json()["title"], "Primary")
+
+    @override_settings(BOARD_ACCESS_CACHE_TIMEOUT=60, BOARD_SUMMARY_CACHE_TIMEOUT=60)
+    def test_caches_are_filled_from_the_primary(self):
+        other = Board.objects.create(title="New", owner=self.user)
+        # the replica has not seen the new board; the cached sets must not miss it
+        self.assertEqual([board["title"] for board in self.client.get(reverse("board-list")).json()],
+                         ["Primary", "New"])
+        # access is granted from the cached set; the board itself is read from the lagging replica
+        self.assertEqual(self.client.get(reverse("board-detail", args=[other.id])).status_code, 404)
+
+    def test_router(self):
+        # outside requests everything uses the primary
+        self.assertEqual(Board.objects.get().title, "Primary")
+        with replica_reads():
+            board = Board.objects.get()
+            self.assertEqual(board.title, "Replica")
+            self.assertEqual(Token.objects.db, "default")
+            board.title = "Saved"
+            board.save(update_fields=["title"])
+        self.assertEqual(Board.objects.get().title, "Saved")
+        self.assertEqual(Board.objects.using("replica").get().title, "Replica")
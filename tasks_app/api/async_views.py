@@ -0,0 +1,46 @@
+"""
+Async-native read views for the hottest task endpoints.
+
+They mirror `AssignedTasksView`, `ReviewingTasksView` and
+`CommentListCreateView` (GET) with Django's async ORM and are routed in by
+`core.middleware.AsyncReadRoutingMiddleware` when the project runs under
+ASGI (`core.asgi`).
+"""
+from rest_framework.exceptions import ValidationError
+from core.async_api import NOT_FOUND, PERMISSION_DENIED, async_api_view, error_response, json_response
+from kanban_app.membership import ahas_board_access
+from tasks_app.api.filters import task_list
+from tasks_app.api.serializers import CommentSerializer, TaskSerializer
+from tasks_app.models import Task
+
+
+async def _task_list(request, **filters):
+    try:
+        tasks, fields = task_list(Task.objects.filter(**filters), request.GET)
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+    return json_response(TaskSerializer([task async for task in tasks], many=True, fields=fields).data)
+
+
+@async_api_view
+async def assigned_tasks(request):
+    """GET /api/tasks/assigned-to-me/"""
+    return await _task_list(request, assignee=request.api_user)
+
+
+@async_api_view
+async def reviewing_tasks(request):
+    """GET /api/tasks/reviewing/"""
+    return await _task_list(request, reviewer=request.api_user)
+
+
+@async_api_view
+async def comment_list(request, pk):
+    """GET /api/tasks/<pk>/comments/ — comments of a task, oldest first."""
+    task = await Task.objects.only("id", "board").filter(pk=pk).afirst()
+    if task is None:
+        return error_response(404, NOT_FOUND.format(model="Task"))
+    if not await ahas_board_access(request.api_user, task.board_id):
+        return error_response(403, PERMISSION_DENIED)
+    comments = task.comments.select_related("author").order_by("created_at", "id")
+    return json_response(CommentSerializer([comment async for comment in comments], many=True).data)
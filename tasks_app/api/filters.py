@@ -0,0 +1,153 @@
+"""
+Query parameters of the task lists (assigned-to-me, reviewing).
+
+Filters (comma-separated values are OR-ed, parameters are AND-ed):
+- status: e.g. `?status=to-do,review`
+- priority: e.g. `?priority=high`
+- board: board IDs, e.g. `?board=3,7`
+- due_after / due_before: inclusive due-date range (YYYY-MM-DD)
+
+Ordering:
+- ordering: comma-separated fields, `-` for descending, e.g.
+  `?ordering=-priority,due_date`. Priority sorts by rank (low < medium <
+  high). The task ID is appended as the last key so the order is stable.
+
+Sparse fieldsets:
+- fields: the serializer fields to return, e.g. `?fields=id,title,status`.
+  Only the columns behind these fields are selected, and the assignee and
+  reviewer are only joined when they are requested.
+
+Invalid values raise a `ValidationError` (400) instead of being ignored.
+"""
+from django.db.models import Case, IntegerField, Value, When
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from tasks_app.models import Task
+
+STATUSES = [value for value, _ in Task.STATUS_CHOICES]
+PRIORITIES = [value for value, _ in Task.PRIORITY_CHOICES]
+
+ORDERING_FIELDS = {
+    "due_date": "due_date",
+    "priority": "priority_rank",
+    "status": "status",
+    "title": "title",
+    "updated_at": "updated_at",
+    "position": "position",
+    "id": "id",
+}
+
+# serializer field -> model columns it reads
+USER_COLUMNS = ("id", "email", "fullname")
+FIELD_COLUMNS = {
+    "id": ["id"],
+    "board": ["board"],
+    "title": ["title"],
+    "description": ["description"],
+    "status": ["status"],
+    "priority": ["priority"],
+    "assignee": ["assignee", *(f"assignee__{column}" for column in USER_COLUMNS)],
+    "reviewer": ["reviewer", *(f"reviewer__{column}" for column in USER_COLUMNS)],
+    "due_date": ["due_date"],
+    "comments_count": ["comments_count"],
+    "position": ["position"],
+}
+
+
+def _values(params, name, allowed=None):
+    values = [value.strip() for value in params.get(name, "").split(",") if value.strip()]
+    if allowed is not None:
+        invalid = [value for value in values if value not in allowed]
+        if invalid:
+            raise ValidationError({name: f"Invalid value(s) {', '.join(invalid)}. Choose from {', '.join(allowed)}."})
+    return values
+
+
+def _date(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValidationError({name: "Enter a date as YYYY-MM-DD."})
+    return parsed
+
+
+def filter_tasks(queryset, params):
+    """Apply the status, priority, board and due-date filters."""
+    if statuses := _values(params, "status", STATUSES):
+        queryset = queryset.filter(status__in=statuses)
+    if priorities := _values(params, "priority", PRIORITIES):
+        queryset = queryset.filter(priority__in=priorities)
+    if boards := _values(params, "board"):
+        if not all(board.isdigit() for board in boards):
+            raise ValidationError({"board": "Board IDs must be integers."})
+        queryset = queryset.filter(board_id__in=[int(board) for board in boards])
+    if due_after := _date(params, "due_after"):
+        queryset = queryset.filter(due_date__gte=due_after)
+    if due_before := _date(params, "due_before"):
+        queryset = queryset.filter(due_date__lte=due_before)
+    return queryset
+
+
+def ordering_keys(params):
+    """
+    Return the `order_by()` keys for `?ordering=`, or None if not given.
+    """
+    keys = []
+    for value in _values(params, "ordering"):
+        name = value.lstrip("-")
+        if name not in ORDERING_FIELDS:
+            raise ValidationError({"ordering": f"Cannot order by '{name}'. Choose from {', '.join(ORDERING_FIELDS)}."})
+        keys.append(("-" if value.startswith("-") else "") + ORDERING_FIELDS[name])
+    if not keys:
+        return None
+    if not any(key.lstrip("-") == "id" for key in keys):
+        keys.append("id")
+    return tuple(keys)
+
+
+def order_tasks(queryset, params):
+    """Apply `?ordering=`; without it the queryset is returned unchanged."""
+    keys = ordering_keys(params)
+    if keys is None:
+        return queryset
+    if any(key.lstrip("-") == "priority_rank" for key in keys):
+        queryset = queryset.annotate(priority_rank=Case(
+            *(When(priority=priority, then=Value(rank)) for rank, priority in enumerate(PRIORITIES)),
+            output_field=IntegerField(),
+        ))
+    return queryset.order_by(*keys)
+
+
+def selected_fields(params):
+    """Return the fields requested with `?fields=`, or None for all of them."""
+    fields = _values(params, "fields", list(FIELD_COLUMNS))
+    return fields or None
+
+
+def load_columns(queryset, fields=None, extra=()):
+    """
+    Select only the columns the serialized fields need (plus `extra`, e.g.
+    the pagination keys) and join the assignee/reviewer only if requested.
+    """
+    fields = fields or list(FIELD_COLUMNS)
+    related = [name for name in ("assignee", "reviewer") if name in fields]
+    columns = {"id", *extra}
+    for field in fields:
+        columns.update(FIELD_COLUMNS[field])
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
+
+
+def task_list(queryset, params, paginated_ordering=None):
+    """
+    Filter, order and narrow a task list for the query parameters.
+    Returns the queryset and the fields to serialize (None for all).
+    """
+    fields = selected_fields(params)
+    queryset = order_tasks(filter_tasks(queryset, params), params)
+    keys = ordering_keys(params) or paginated_ordering or ()
+    extra = [key.lstrip("-") for key in keys if key.lstrip("-") != "priority_rank"]
+    return load_columns(queryset, fields, extra), fields
@@ -0,0 +1,22 @@
+from core.pagination import OptionalCursorPagination
+from .filters import ordering_keys
+
+
+class TaskCursorPagination(OptionalCursorPagination):
+
+    """
+    Cursor pagination for task lists, ordered by (updated_at, id) unless the
+    client asks for another `?ordering=` (see `tasks_app.api.filters`).
+    """
+    ordering = ("updated_at", "id")
+
+    def get_ordering(self, request, queryset, view):
+        return ordering_keys(request.query_params) or self.ordering
+
+
+class CommentCursorPagination(OptionalCursorPagination):
+
+    """
+    Cursor pagination for comment lists, ordered by (created_at, id).
+    """
+    ordering = ("created_at", "id")
@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission
 from kanban_app.models import Board
 from rest_framework.exceptions import NotFound
+from kanban_app.membership import has_board_access
 
 class IsBoardMemberOrOwner(BasePermission):
     """
@@ -9,6 +10,8 @@ class IsBoardMemberOrOwner(BasePermission):
     Applies to tasks:
     - The user must be the owner of the board the task belongs to, or a member.
     - Superusers always have access.
+
+    Membership is resolved through `kanban_app.membership` (a set lookup).
     """
     def has_permission(self, request, view):
          if request.method == "POST":
@@ -16,26 +19,21 @@ class IsBoardMemberOrOwner(BasePermission):
             if not board_id:
                 raise NotFound("Board-ID is required.")
             try:
-                board = Board.objects.get(id=board_id)
-            except Board.DoesNotExist:
+                board_id = int(board_id)
+            except (TypeError, ValueError):
                 raise NotFound("Board does not exist.")
-
-            user = request.user
-            return (
-                board.owner == user
-                or board.members.filter(id=user.id).exists()
-                or user.is_superuser
-            )
+            if has_board_access(request, board_id):
+                return True
+            if not Board.objects.filter(id=board_id).exists():
+                raise NotFound("Board does not exist.")
+            return False
          return True
 
     def has_object_permission(self, request, view, obj):
 
         if hasattr(obj, "task"):
             obj = obj.task
-        user = request.user
-        return (obj.board.owner == user or
-                obj.board.members.filter(id=user.id).exists() or
-                user.is_superuser)
+        return has_board_access(request, obj.board_id)
 
 
 class IsTaskOwnerOrBoardMember(BasePermission):
@@ -52,15 +50,11 @@ class IsTaskOwnerOrBoardMember(BasePermission):
         if hasattr(obj, "task"):
             obj = obj.task
 
-        board = getattr(obj, "board", None)
-        if not board:
+        board_id = getattr(obj, "board_id", None)
+        if not board_id:
             return False
 
-        is_owner = board.owner == request.user
-        is_member = board.members.filter(id=request.user.id).exists()
-        is_superuser = request.user.is_superuser
-
-        return is_owner or is_member or is_superuser
+        return has_board_access(request, board_id)
 
 class IsCommentAuthor(BasePermission):
     """
@@ -1,7 +1,15 @@
 from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from kanban_app.models import Board, BoardChange
+from kanban_app.membership import has_board_access
+from kanban_app.summary_cache import invalidate_boards
 from tasks_app.models import Task, Comment
+from tasks_app import positions
+from tasks_app.signals import counter_deltas, suspend_counter_updates
 from users_auth_app.models import User
-from django.core.exceptions import ObjectDoesNotExist
 
 
 class TaskUserSerializer(serializers.ModelSerializer):
@@ -37,10 +45,13 @@ class TaskSerializer(serializers.ModelSerializer):
     - reviewer_id: ID of the reviewer (write-only)
     - due_date: Task due date
     - comments_count: Number of comments on this task
+    - position: Rank key within the column, tasks sort by (position, id) (read-only)
+
+    Pass `fields=[...]` to serialize only these fields (sparse fieldsets).
     """
     assignee = TaskUserSerializer(read_only=True)
     reviewer = TaskUserSerializer(read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(read_only=True)
 
     assignee_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
@@ -60,15 +71,15 @@ class TaskSerializer(serializers.ModelSerializer):
         fields = [
             "id", "board", "title", "description", "status", "priority",
             "assignee", "reviewer", "assignee_id", "reviewer_id",
-            "due_date", "comments_count"
+            "due_date", "comments_count", "position"
         ]
+        read_only_fields = ["position"]
 
-
-    def get_comments_count(self, obj):
-        """
-        Returns the number of comments related to this task.
-        """
-        return obj.comments.count()
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
 
 class TaskUpdateSerializer(serializers.ModelSerializer):
@@ -109,23 +120,29 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """
-        Validate that assignee and reviewer are members of the board.
+        Validate that assignee and reviewer are members of the board, with
+        one query for both. The users are kept for `update`.
         """
         board = self.instance.board if self.instance else data.get("board")
-        assignee_id = data.get("assignee_id")
-        reviewer_id = data.get("reviewer_id")
-
-        if assignee_id and not (board.owner.id == assignee_id or board.members.filter(id=assignee_id).exists()):
-         raise serializers.ValidationError("Assignee is not a member of the board.")
-        if reviewer_id and not (board.owner.id == reviewer_id or board.members.filter(id=reviewer_id).exists()):
-         raise serializers.ValidationError("Reviewer is not a member of the board.")
+        roles = {"Assignee": data.get("assignee_id"), "Reviewer": data.get("reviewer_id")}
+        user_ids = {user_id for user_id in roles.values() if user_id}
+        self._users = {}
+        if user_ids:
+            member_ids = Board.members.through.objects.filter(board=board).values("user_id")
+            self._users = User.objects.filter(
+                Q(id=board.owner_id) | Q(id__in=member_ids), id__in=user_ids
+            ).in_bulk()
+        for role, user_id in roles.items():
+            if user_id and user_id not in self._users:
+                raise serializers.ValidationError(f"{role} is not a member of the board.")
 
         return data
 
     def update(self, instance, validated_data):
         """
         Update Task instance with new data.
-        Handles assigning/removing assignee and reviewer.
+        Handles assigning/removing assignee and reviewer (0 removes them),
+        using the users loaded by `validate`.
         """
         assignee_id = validated_data.pop("assignee_id", None)
         reviewer_id = validated_data.pop("reviewer_id", None)
@@ -134,27 +151,76 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
 
         if assignee_id is not None:
-            if assignee_id:
-                try:
-                    instance.assignee = User.objects.get(id=assignee_id)
-                except ObjectDoesNotExist:
-                    raise serializers.ValidationError("Assignee does not exist.")
-            else:
-                instance.assignee = None 
-        
+            instance.assignee = self._users[assignee_id] if assignee_id else None
         if reviewer_id is not None:
-            if reviewer_id:
-                try:
-                    instance.reviewer = User.objects.get(id=reviewer_id)
-                except ObjectDoesNotExist:
-                    raise serializers.ValidationError("Reviewer does not exist.")
-            else:
-                instance.reviewer = None
+            instance.reviewer = self._users[reviewer_id] if reviewer_id else None
 
         instance.save()
         return instance
 
 
+class TaskMoveSerializer(serializers.Serializer):
+
+    """
+    Move a task within its column or to another column of its board.
+
+    Fields:
+    - status: Target column (optional, defaults to the current one)
+    - after: ID of the task that ends up directly above (optional)
+    - before: ID of the task that ends up directly below (optional)
+
+    Without `after` and `before` the task goes to the bottom of the column.
+    Only the moved task gets a new position key (see `tasks_app.positions`);
+    the other tasks of the column are not written.
+    """
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    after = serializers.IntegerField(required=False, allow_null=True)
+    before = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        task = self.instance
+        attrs.setdefault("status", task.status)
+        ids = {attrs.get("after"), attrs.get("before")} - {None}
+        if task.id in ids:
+            raise serializers.ValidationError("A task cannot be moved next to itself.")
+        neighbours = Task.objects.filter(board_id=task.board_id, status=attrs["status"]).only("id", "position").in_bulk(ids)
+        for field in ("after", "before"):
+            if attrs.get(field) is not None and attrs[field] not in neighbours:
+                raise serializers.ValidationError({field: "Task is not in the target column."})
+            attrs[field] = neighbours.get(attrs.get(field))
+        above, below = attrs["after"], attrs["before"]
+        if above and below and (above.position, above.id) >= (below.position, below.id):
+            raise serializers.ValidationError("`after` has to be above `before`.")
+        return attrs
+
+    def neighbour_keys(self, attrs):
+        """Position keys of the new neighbours above and below (None at an end)."""
+        task, status = self.instance, attrs["status"]
+        above, below = attrs["after"], attrs["before"]
+        if above and not below:
+            below = positions.neighbour(above, below=True, exclude=task.id)
+        elif below and not above:
+            above = positions.neighbour(below, below=False, exclude=task.id)
+        elif not above and not below:
+            above = positions.bottom(task.board_id, status, exclude=task.id)
+        return (above.position if above else None), (below.position if below else None)
+
+    def update(self, instance, validated_data):
+        above, below = self.neighbour_keys(validated_data)
+        if below is not None and (above or "") >= below:
+            # equal or empty keys (e.g. from bulk inserts) leave no room in between
+            positions.rebalance(instance.board_id, validated_data["status"])
+            for field in ("after", "before"):
+                if validated_data[field]:
+                    validated_data[field].refresh_from_db(fields=["position"])
+            above, below = self.neighbour_keys(validated_data)
+        instance.place(validated_data["status"], positions.key_between(above, below))
+        instance.save()
+        if positions.needs_rebalance(instance.position):
+            positions.schedule_rebalance(instance.board_id, instance.status)
+        return instance
+
+
 class CommentSerializer(serializers.ModelSerializer):
     """
     Serializer for Comment objects.
@@ -179,3 +245,220 @@ class CommentSerializer(serializers.ModelSerializer):
         return value
 
 
+
+
+class BulkTaskCreateSerializer(serializers.Serializer):
+
+    """
+    One task to create in a bulk request.
+    """
+    board = serializers.IntegerField()
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, default="to-do")
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, default="medium")
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True)
+    due_date = serializers.DateField(required=False)
+
+
+class BulkTaskUpdateSerializer(serializers.Serializer):
+
+    """
+    One task to update in a bulk request. Only the given fields are changed.
+    """
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True)
+
+
+class TaskBulkSerializer(serializers.Serializer):
+
+    """
+    Create, update and delete many tasks in one transaction.
+
+    Fields:
+    - create: List of new tasks (board, title, status, priority, assignee_id, ...)
+    - update: List of changes ({id, status, priority, assignee_id, reviewer_id})
+    - delete: List of task IDs
+
+    Validation is set based: the affected tasks, boards and board memberships
+    are each loaded with one query, and board access is checked once per board.
+    Created tasks, and updated tasks whose status changes, go to the bottom of
+    their columns; other updates keep the position key (use the move endpoint
+    to place tasks).
+    Writes use bulk_create/bulk_update, after which the summed counter deltas
+    are applied with one UPDATE per affected board and the changes are
+    appended to the board change logs in one INSERT.
+    """
+    create = BulkTaskCreateSerializer(many=True, required=False, default=list)
+    update = BulkTaskUpdateSerializer(many=True, required=False, default=list)
+    delete = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    UPDATE_FIELDS = ("status", "priority", "assignee_id", "reviewer_id")
+
+    def validate(self, attrs):
+        if not (attrs["create"] or attrs["update"] or attrs["delete"]):
+            raise serializers.ValidationError("Empty bulk request is not allowed.")
+
+        update_ids = [item["id"] for item in attrs["update"]]
+        duplicates = {
+            section: sorted({task_id for task_id in ids if ids.count(task_id) > 1})
+            for section, ids in (("update", update_ids), ("delete", attrs["delete"]))
+        }
+        errors = {section: f"Duplicate task IDs: {ids}" for section, ids in duplicates.items() if ids}
+        if overlap := sorted(set(update_ids) & set(attrs["delete"])):
+            errors["delete"] = f"These task IDs are also updated: {overlap}"
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        task_ids = {item["id"] for item in attrs["update"]} | set(attrs["delete"])
+        tasks = {task.id: task for task in Task.objects.filter(id__in=task_ids)}
+        missing = sorted(task_ids - tasks.keys())
+        if missing:
+            raise serializers.ValidationError(f"These task IDs do not exist: {missing}")
+
+        board_ids = {item["board"] for item in attrs["create"]} | {task.board_id for task in tasks.values()}
+        owners = dict(Board.objects.filter(id__in=board_ids).values_list("id", "owner_id"))
+        missing = sorted(board_ids - owners.keys())
+        if missing:
+            raise serializers.ValidationError(f"These board IDs do not exist: {missing}")
+
+        request = self.context["request"]
+        for board_id in board_ids:
+            if not has_board_access(request, board_id):
+                raise PermissionDenied(f"No access to board {board_id}.")
+
+        self._check_assignments(attrs, tasks, owners)
+        attrs["tasks"] = tasks
+        attrs["board_ids"] = board_ids
+        return attrs
+
+    def _check_assignments(self, attrs, tasks, owners):
+        """
+        Check that every assignee/reviewer is a member or the owner of the
+        task's board, with one query over all pairs. An ID of 0 unassigns, as
+        in `TaskUpdateSerializer`, and is replaced by None.
+        """
+        pairs = set()
+        for section, items in (("create", attrs["create"]), ("update", attrs["update"])):
+            for index, item in enumerate(items):
+                board_id = item["board"] if section == "create" else tasks[item["id"]].board_id
+                for field in ("assignee_id", "reviewer_id"):
+                    if item.get(field) == 0:
+                        item[field] = None
+                    if item.get(field):
+                        pairs.add((section, index, field, board_id, item[field]))
+        if not pairs:
+            return
+
+        user_ids = {user_id for *_, user_id in pairs}
+        memberships = set(
+            Board.members.through.objects
+            .filter(board_id__in={board_id for *_, board_id, _ in pairs}, user_id__in=user_ids)
+            .values_list("board_id", "user_id")
+        )
+        errors = {}
+        for section, index, field, board_id, user_id in sorted(pairs):
+            if owners[board_id] != user_id and (board_id, user_id) not in memberships:
+                role = "Assignee" if field == "assignee_id" else "Reviewer"
+                errors.setdefault(section, {})[index] = f"{role} is not a member of the board."
+        if errors:
+            raise serializers.ValidationError(errors)
+
+    @staticmethod
+    def _counter_state(task):
+        return task.board_id, task.status, task.priority
+
+    def save(self, **kwargs):
+        data = self.validated_data
+        owner = self.context["request"].user
+        tasks = data["tasks"]
+        now = timezone.now()
+
+        with transaction.atomic(), suspend_counter_updates():
+            new_tasks = [Task(owner=owner, board_id=item.pop("board"), **item) for item in data["create"]]
+
+            removed = [self._counter_state(tasks[task_id]) for task_id in data["delete"]]
+            changed = []
+            moved = []
+            fields = set()
+            for item in data["update"]:
+                task = tasks[item.pop("id")]
+                removed.append(self._counter_state(task))
+                if item.get("status", task.status) != task.status:
+                    task.position = ""
+                    moved.append(task)
+                for field, value in item.items():
+                    setattr(task, field, value)
+                    fields.add(field)
+                task.updated_at = now
+                changed.append(task)
+            if moved:
+                fields.add("position")
+
+            if new_tasks or moved:
+                last = positions.last_positions({task.board_id for task in new_tasks + moved})
+                positions.append_positions(new_tasks + moved, last)
+            created = Task.objects.bulk_create(new_tasks)
+            if changed:
+                Task.objects.bulk_update(changed, [*sorted(fields), "updated_at"])
+
+            if data["delete"]:
+                Task.objects.filter(id__in=data["delete"]).delete()
+
+            deltas = counter_deltas(removed, [self._counter_state(task) for task in created + changed])
+            for board_id in sorted(data["board_ids"]):
+                Board.objects.adjust_task_counters(board_id, deltas[board_id])
+            invalidate_boards(*data["board_ids"])
+            BoardChange.objects.record_many(
+                [BoardChange(board_id=task.board_id, entity="task", entity_id=task.id,
+                             action="created", data=task.as_change_data()) for task in created]
+                + [BoardChange(board_id=task.board_id, entity="task", entity_id=task.id,
+                               action="updated", data=task.as_change_data()) for task in changed]
+                + [BoardChange(board_id=tasks[task_id].board_id, entity="task", entity_id=task_id,
+                               action="deleted") for task_id in data["delete"]]
+            )
+
+        result_ids = [task.id for task in created] + [task.id for task in changed]
+        results = Task.objects.filter(id__in=result_ids).select_related("assignee", "reviewer").in_bulk()
+        self.instance = {
+            "created": [results[task.id] for task in created],
+            "updated": [results[task.id] for task in changed],
+            "deleted": sorted(data["delete"]),
+        }
+        return self.instance
+
+    def to_representation(self, instance):
+        return {
+            "created": TaskSerializer(instance["created"], many=True).data,
+            "updated": TaskSerializer(instance["updated"], many=True).data,
+            "deleted": instance["deleted"],
+        }
+
+
+class SearchHitSerializer(serializers.Serializer):
+
+    """
+    One search result (a task or a comment).
+
+    Fields:
+    - type: 'task' or 'comment'
+    - id: Task or comment ID
+    - task: ID of the task (the task itself for task hits)
+    - board: ID of the board
+    - title: Title of the task
+    - text: Task description or comment content
+    - author: Full name of the comment author (null for tasks)
+    - rank: Relevance, higher is better
+    """
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    task = serializers.IntegerField()
+    board = serializers.IntegerField()
+    title = serializers.CharField()
+    text = serializers.CharField()
+    author = serializers.CharField(allow_null=True)
+    rank = serializers.FloatField()
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import TaskCreateView, TaskDetailView, ReviewingTasksView, AssignedTasksView, CommentListCreateView, CommentDetailView
+from .views import TaskBulkView, TaskCreateView, TaskDetailView, TaskMoveView, ReviewingTasksView, AssignedTasksView, CommentListCreateView, CommentDetailView, SearchView
 
 
 """
@@ -10,15 +10,23 @@ Tasks:
 2. /tasks/reviewing/          - GET: List tasks where the user is the reviewer
 3. /tasks/                    - GET: List all tasks, POST: Create a new task
 4. /tasks/<pk>/               - GET: Retrieve a task, PATCH/PUT: Update, DELETE: Delete task
+5. /tasks/bulk/               - POST: Create, update and delete many tasks in one transaction
+6. /tasks/<pk>/move/          - POST: Move a task within or between the columns of its board
 
 Comments:
-5. /tasks/<pk>/comments/      - GET: List comments for a task, POST: Create comment
-6. /tasks/<task_pk>/comments/<comment_pk>/ - GET: Retrieve comment, DELETE: Delete comment
+7. /tasks/<pk>/comments/      - GET: List comments for a task, POST: Create comment
+8. /tasks/<task_pk>/comments/<comment_pk>/ - GET: Retrieve comment, DELETE: Delete comment
+
+Search:
+9. /search/?q=<words>         - GET: Ranked full-text search over tasks and comments
 """
 urlpatterns = [
     path('tasks/assigned-to-me/', AssignedTasksView.as_view(), name="assigned-tasks"),
     path('tasks/reviewing/', ReviewingTasksView.as_view(), name="task-review"),
     path('tasks/', TaskCreateView.as_view(), name="tasks"),
+    path('tasks/bulk/', TaskBulkView.as_view(), name="tasks-bulk"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
+    path("tasks/<int:pk>/move/", TaskMoveView.as_view(), name="task-move"),
     path('tasks/<int:pk>/comments/', CommentListCreateView.as_view(), name='task-comments'),
-    path('tasks/<int:task_pk>/comments/<int:comment_pk>/', CommentDetailView.as_view(), name='comment-detail')]
+    path('tasks/<int:task_pk>/comments/<int:comment_pk>/', CommentDetailView.as_view(), name='comment-detail'),
+    path('search/', SearchView.as_view(), name='search')]
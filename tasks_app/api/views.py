@@ -1,13 +1,22 @@
 
+from django.db import transaction
 from rest_framework import generics, status, viewsets
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from kanban_app.models import Board
 from tasks_app.models import Task, Comment
-from .serializers import TaskSerializer, TaskUpdateSerializer, CommentSerializer
+from .serializers import (
+    TaskSerializer, TaskUpdateSerializer, TaskMoveSerializer, CommentSerializer, TaskBulkSerializer, SearchHitSerializer
+)
+from .pagination import TaskCursorPagination, CommentCursorPagination
+from .filters import task_list
 from .permissions import IsBoardMemberOrOwner, IsTaskOwnerOrBoardMember, IsCommentAuthor
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
+from core.conditional import ConditionalRetrieveMixin
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from tasks_app import search
 
 
 class TaskCreateView(generics.CreateAPIView):
@@ -41,11 +50,37 @@ class TaskCreateView(generics.CreateAPIView):
             )
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        task = serializer.save(owner=request.user)
+        with transaction.atomic():
+            task = serializer.save(owner=request.user)
         return Response(TaskSerializer(task).data, status=status.HTTP_201_CREATED)
 
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskBulkView(generics.GenericAPIView):
+
+    """
+    Create, update and delete many tasks in one transaction.
+
+    POST /tasks/bulk/
+        {
+            "create": [{"board": 1, "title": "...", "status": "to-do", ...}],
+            "update": [{"id": 5, "status": "done", "assignee_id": 3}],
+            "delete": [7, 8]
+        }
+
+    Access is checked once per affected board (owner, member or superuser).
+    Returns the created and updated tasks and the deleted IDs.
+    """
+    serializer_class = TaskBulkSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class TaskDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a Task by its ID.
 
@@ -54,13 +89,25 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     - Other authenticated users may have read/write access depending on other permissions.
 
     Methods:
-    - GET: Retrieve task details
+    - GET: Retrieve task details (supports ETag/Last-Modified conditional requests)
     - PATCH: Partially update task
     - PUT: Fully update task (handled by DRF)
     - DELETE: Delete task (only owner or board owner)
     """
     queryset = Task.objects.all()
     permission_classes = [IsAuthenticated, IsTaskOwnerOrBoardMember]
+    validator_fields = ("id", "board", "updated_at", "comments_count")
+
+    def get_queryset(self):
+        if self.request.method == "GET":
+            return Task.objects.select_related("assignee", "reviewer")
+        return super().get_queryset()
+
+    def get_etag(self, obj):
+        return f"task-{obj.pk}-{obj.updated_at.timestamp()}-{obj.comments_count}"
+
+    def get_last_modified(self, obj):
+        return obj.updated_at
 
     def get_serializer_class(self):
         """
@@ -79,7 +126,8 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
         task = self.get_object()
         serializer = self.get_serializer(task, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        task = serializer.save()
+        with transaction.atomic():
+            task = serializer.save()
         return Response(TaskUpdateSerializer(task).data, status=status.HTTP_200_OK)
 
     def delete(self, request, *args, **kwargs):
@@ -92,7 +140,55 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class AssignedTasksView(generics.ListAPIView):
+class TaskMoveView(generics.GenericAPIView):
+
+    """
+    Move a task to a new place in its column or to another column.
+
+    POST /tasks/<pk>/move/
+        {"status": "review", "after": 12, "before": 15}
+
+    - after / before: IDs of the new neighbours above / below; give either or
+      both. Without them the task goes to the bottom of the column.
+    - status: Target column, defaults to the current one.
+
+    Only the moved task is written. Returns the task.
+    """
+    queryset = Task.objects.all()
+    serializer_class = TaskMoveSerializer
+    permission_classes = [IsAuthenticated, IsTaskOwnerOrBoardMember]
+
+    def post(self, request, *args, **kwargs):
+        task = self.get_object()
+        serializer = self.get_serializer(task, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            task = serializer.save()
+        return Response(TaskSerializer(task).data, status=status.HTTP_200_OK)
+
+
+class TaskListMixin:
+
+    """
+    Filtering, ordering and sparse fieldsets for task list views.
+
+    Subclasses implement `get_task_queryset()`; the query parameters are
+    described in `tasks_app.api.filters`.
+    """
+    task_fields = None
+
+    def get_queryset(self):
+        paginator = self.paginator
+        paginated_ordering = paginator.ordering if paginator and paginator.is_requested(self.request) else None
+        queryset, self.task_fields = task_list(self.get_task_queryset(), self.request.query_params, paginated_ordering)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.task_fields)
+        return super().get_serializer(*args, **kwargs)
+
+
+class AssignedTasksView(TaskListMixin, generics.ListAPIView):
     """
     List all tasks assigned to the logged-in user.
 
@@ -100,16 +196,19 @@ class AssignedTasksView(generics.ListAPIView):
     - User must be authenticated.
 
     GET /tasks/assigned-to-me/
+    - Pass `?page_size=` or `?cursor=` to get cursor-paginated results.
+    - Filter with `?status=`, `?priority=`, `?board=`, `?due_after=`, `?due_before=`,
+      sort with `?ordering=` and pick fields with `?fields=` (see `tasks_app.api.filters`).
     """
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskCursorPagination
 
-    def get_queryset(self):
-        user = self.request.user
-        return Task.objects.filter(assignee=user)
+    def get_task_queryset(self):
+        return Task.objects.filter(assignee=self.request.user)
 
 
-class ReviewingTasksView(generics.ListAPIView):
+class ReviewingTasksView(TaskListMixin, generics.ListAPIView):
     """
     List all tasks where the logged-in user is the reviewer.
 
@@ -117,13 +216,15 @@ class ReviewingTasksView(generics.ListAPIView):
     - User must be authenticated.
 
     GET /tasks/reviewing/
+    - Pass `?page_size=` or `?cursor=` to get cursor-paginated results.
+    - Supports the same filters, `?ordering=` and `?fields=` as /tasks/assigned-to-me/.
     """
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskCursorPagination
 
-    def get_queryset(self):
-        user = self.request.user
-        return Task.objects.filter(reviewer=user)
+    def get_task_queryset(self):
+        return Task.objects.filter(reviewer=self.request.user)
 
 
 class CommentListCreateView(generics.ListCreateAPIView):
@@ -137,21 +238,24 @@ class CommentListCreateView(generics.ListCreateAPIView):
 
     GET /tasks/<task_id>/comments/
         - List all comments for the task
+        - Pass `?page_size=` or `?cursor=` to get cursor-paginated results
     POST /tasks/<task_id>/comments/
         - Create a new comment for the task (author is automatically set to the logged-in user)
     """
     permission_classes = [IsAuthenticated, IsTaskOwnerOrBoardMember]
     serializer_class = CommentSerializer
+    pagination_class = CommentCursorPagination
 
     def get_queryset(self):
         task = get_object_or_404(Task, pk=self.kwargs['pk'])
         self.check_object_permissions(self.request, task)
-        return task.comments.all().order_by("created_at")
+        return task.comments.select_related("author").order_by("created_at", "id")
 
     def perform_create(self, serializer):
         task = get_object_or_404(Task, pk=self.kwargs['pk'])
         self.check_object_permissions(self.request, task)
-        serializer.save(task=task, author=self.request.user)
+        with transaction.atomic():
+            serializer.save(task=task, author=self.request.user)
 
 
 class CommentDetailView(generics.RetrieveDestroyAPIView):
@@ -188,4 +292,72 @@ class CommentDetailView(generics.RetrieveDestroyAPIView):
         """
         if instance.author != self.request.user:
             raise PermissionDenied("You can only delete your own comments.")
-        instance.delete()
+        with transaction.atomic():
+            instance.delete()
+
+
+class SearchView(generics.GenericAPIView):
+
+    """
+    Full-text search over tasks and comments on the boards of the user.
+
+    GET /search/?q=<words>
+    - Every word has to match (as a prefix) the task title/description or the
+      comment content. Results are ranked by relevance, best first.
+    - Paginated with `?page=` (default 1) and `?page_size=` (default 20, max 100);
+      the response has `next`/`previous` links and `results`.
+
+    See `tasks_app.search` for the index.
+    """
+    serializer_class = SearchHitSerializer
+    permission_classes = [IsAuthenticated]
+    default_page_size = 20
+    max_page_size = 100
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "")
+        try:
+            page = max(1, int(request.query_params.get("page", 1)))
+            page_size = int(request.query_params.get("page_size", self.default_page_size))
+            page_size = max(1, min(page_size, self.max_page_size))
+        except ValueError:
+            raise ValidationError("page and page_size must be integers.")
+        if not search.terms(query):
+            raise ValidationError({"q": "Enter at least one word to search for."})
+
+        hits = search.search(request.user.id, query, limit=page_size + 1, offset=(page - 1) * page_size)
+        has_next = len(hits) > page_size
+        hits = hits[:page_size]
+        url = request.build_absolute_uri()
+        return Response({
+            "next": replace_query_param(url, "page", page + 1) if has_next else None,
+            "previous": None if page == 1 else (
+                replace_query_param(url, "page", page - 1) if page > 2 else remove_query_param(url, "page")
+            ),
+            "results": self.get_serializer(self.load_hits(hits), many=True).data,
+        })
+
+    def load_hits(self, hits):
+        """Load the hit objects with two queries, keeping the ranking order."""
+        comment_ids = [object_id for kind, object_id, _, _ in hits if kind == "comment"]
+        comments = Comment.objects.select_related("author").in_bulk(comment_ids)
+        tasks = Task.objects.only("id", "board", "title", "description").in_bulk(
+            {task_id for _, _, task_id, _ in hits}
+        )
+        results = []
+        for kind, object_id, task_id, rank in hits:
+            task = tasks.get(task_id)
+            comment = comments.get(object_id) if kind == "comment" else None
+            if task is None or (kind == "comment" and comment is None):
+                continue  # deleted since the search
+            results.append({
+                "type": kind,
+                "id": object_id,
+                "task": task.id,
+                "board": task.board_id,
+                "title": task.title,
+                "text": comment.content if comment else task.description,
+                "author": comment.author.fullname if comment and comment.author else None,
+                "rank": rank,
+            })
+        return results
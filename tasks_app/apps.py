@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    """Re-create the search triggers a SQLite table rebuild may have dropped."""
+    from django.db import connections
+    from tasks_app import search
+    connection = connections[using]
+    if connection.vendor == "sqlite" and "tasks_app_task" in connection.introspection.table_names():
+        search.install(connection)
 
 
 class TasksAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks_app'
+
+    def ready(self):
+        from tasks_app import signals  # noqa: F401
+        post_migrate.connect(ensure_search_index, sender=self)
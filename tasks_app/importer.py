@@ -0,0 +1,361 @@
+"""
+Streaming bulk import of tasks (and their comments) into a board.
+
+Input is read record by record, so uploads and files of any size are
+imported with bounded memory:
+
+- ndjson: one JSON object per line. Records may carry a `type`
+  ('board', 'member', 'task' or 'comment', as written by
+  `kanban_app.export`); lines without a type are tasks.
+- csv: one task per row with a header line.
+
+Task fields: title (required), description, status, priority, due_date
+(YYYY-MM-DD), assignee and reviewer (emails of board members) and position
+(a rank key as exported; tasks without one are appended to their column in
+file order). Comments
+reference the `id` of a task record earlier in the same file and carry
+author (email) and content; they are stamped with the import time.
+
+Records are buffered into chunks. Per chunk the referenced users are
+resolved by email in one query and the rows are written with `bulk_create`
+in a savepoint. If the chunk fails, its rows are retried one by one so a bad
+row is reported without losing the others. Invalid rows are reported with
+their line number and skipped; the import itself is never aborted.
+
+The per-row signal handlers are suspended; afterwards the board counters and
+comment counts are recounted once, and the created tasks and comments are
+written to the board change log.
+"""
+import csv
+import json
+import time
+from datetime import date
+from django.db import DatabaseError, transaction
+from django.utils.dateparse import parse_date
+from kanban_app.models import Board, BoardChange
+from kanban_app.membership import invalidate_user
+from kanban_app.summary_cache import invalidate_boards
+from tasks_app import positions
+from tasks_app.models import Comment, Task
+from tasks_app.signals import suspend_counter_updates
+from users_auth_app.models import User
+
+FORMATS = ("ndjson", "csv")
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+STATUSES = {value for value, _ in Task.STATUS_CHOICES}
+PRIORITIES = {value for value, _ in Task.PRIORITY_CHOICES}
+
+# JSON types each field may have; CSV values are always strings
+TEXT_FIELDS = ("type", "title", "description", "status", "priority", "due_date", "position",
+               "assignee", "reviewer", "email", "author", "content")
+REFERENCE_FIELDS = ("id", "task")
+
+
+class ImportReport:
+
+    """
+    Result of an import: created rows, per-row errors and throughput.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = 0
+        self.tasks = 0
+        self.comments = 0
+        self.members = 0
+        self.error_count = 0
+        self.errors = []
+
+    def error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self):
+        seconds = time.perf_counter() - self.started
+        return {
+            "rows": self.rows,
+            "created_tasks": self.tasks,
+            "created_comments": self.comments,
+            "added_members": self.members,
+            "error_count": self.error_count,
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(self.rows / seconds, 1) if seconds else None,
+        }
+
+
+def _text_lines(lines):
+    for number, line in enumerate(lines):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8-sig" if number == 0 else "utf-8", errors="replace")
+        yield line
+
+
+def read_records(lines, import_format):
+    """
+    Yield (line number, record dict) from an iterable of lines (bytes or
+    text, e.g. an open file, an upload or the request body), or
+    (line number, error message) for lines that cannot be parsed.
+    """
+    text = _text_lines(lines)
+    if import_format == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+        return
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield number, "Expected a JSON object."
+            continue
+        yield number, record
+
+
+def record_error(record):
+    """Return an error message if a field has the wrong JSON type, else None."""
+    for field in TEXT_FIELDS:
+        if record.get(field) is not None and not isinstance(record[field], str):
+            return f"Field '{field}' must be a string."
+    for field in REFERENCE_FIELDS:
+        value = record.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, str))):
+            return f"Field '{field}' must be an integer or a string."
+    return None
+
+
+class BoardImporter:
+
+    """
+    Import records into one board on behalf of a user.
+
+    Usage:
+        with open(path, "rb") as file:
+            report = BoardImporter(board, user).run(read_records(file, "ndjson"))
+    """
+
+    def __init__(self, board, user, chunk_size=CHUNK_SIZE):
+        self.board = board
+        self.user = user
+        self.chunk_size = chunk_size
+        self.report = ImportReport()
+        self.users = {}  # email -> user ID (None if unknown)
+        self.member_ids = {board.owner_id, *board.members.values_list("id", flat=True)}
+        self.task_ids = {}  # task ID in the file -> created task ID
+        self.pending = []
+        self.pending_task_ids = set()
+        self.last_positions = positions.last_positions([board.id])
+
+    @classmethod
+    def create_board(cls, title, owner, **kwargs):
+        """Create a new board owned by `owner` and return an importer for it."""
+        board = Board.objects.create(title=title, owner=owner)
+        board.members.add(owner)
+        return cls(board, owner, **kwargs)
+
+    def run(self, records):
+        with suspend_counter_updates():
+            for line, record in records:
+                self.report.rows += 1
+                if isinstance(record, dict) and (error := record_error(record)):
+                    record = error
+                if isinstance(record, str):
+                    self.report.error(line, record)
+                    continue
+                kind = record.get("type", "task")
+                if kind == "board":
+                    continue
+                if kind not in ("member", "task", "comment"):
+                    self.report.error(line, f"Unknown record type '{kind}'.")
+                    continue
+                if kind == "comment" and record.get("task") in self.pending_task_ids:
+                    # its task has to be written first
+                    self.flush()
+                if kind == "task" and record.get("id") is not None:
+                    self.pending_task_ids.add(record["id"])
+                self.pending.append((line, kind, record))
+                if len(self.pending) >= self.chunk_size:
+                    self.flush()
+            self.flush()
+        self.finish()
+        return self.report.as_dict()
+
+    def resolve_users(self, emails):
+        """Look up all not yet known emails in one query (case-insensitive)."""
+        emails = {email for email in emails if email.lower() not in self.users}
+        if emails:
+            lookup = emails | {email.lower() for email in emails}
+            found = User.objects.filter(email__in=lookup).values_list("email", "id")
+            found = {email.lower(): user_id for email, user_id in found}
+            for email in emails:
+                self.users[email.lower()] = found.get(email.lower())
+
+    def user_id(self, email):
+        return self.users.get(str(email).lower()) if email else None
+
+    def flush(self):
+        chunk, self.pending = self.pending, []
+        self.pending_task_ids = set()
+        if not chunk:
+            return
+        self.resolve_users(
+            str(record[field]) for _, _, record in chunk
+            for field in ("email", "assignee", "reviewer", "author") if record.get(field)
+        )
+        members, tasks, comments = [], [], []
+        for line, kind, record in chunk:
+            try:
+                if kind == "member":
+                    member = self.build_member(record)
+                    if member is not None:
+                        members.append(member)
+                elif kind == "task":
+                    tasks.append((line, record.get("id"), self.build_task(record)))
+                else:
+                    comments.append((line, self.build_comment(record)))
+            except ValueError as exc:
+                self.report.error(line, str(exc))
+
+        if members:
+            through = Board.members.through
+            through.objects.bulk_create(
+                [through(board_id=self.board.id, user_id=user_id) for user_id in members], ignore_conflicts=True
+            )
+            invalidate_user(*members)
+            BoardChange.objects.record_many([
+                BoardChange(board_id=self.board.id, entity="member", entity_id=user_id, action="created",
+                            data={"id": user_id})
+                for user_id in members
+            ])
+            self.report.members += len(members)
+        self.write(tasks, self.save_tasks)
+        self.write(comments, self.save_comments)
+
+    def write(self, rows, save):
+        """Save a chunk in a savepoint; on failure retry row by row."""
+        if not rows:
+            return
+        try:
+            with transaction.atomic():
+                save(rows)
+        except DatabaseError:
+            self.forget(rows)
+            for row in rows:
+                try:
+                    with transaction.atomic():
+                        save([row])
+                except DatabaseError as exc:
+                    self.forget([row])
+                    self.report.error(row[0], f"Could not be saved: {exc}")
+
+    def forget(self, rows):
+        """
+        Drop the primary keys (and source ID mappings) a rolled-back save
+        assigned, so a retry inserts the rows afresh.
+        """
+        for row in rows:
+            instance = row[-1]
+            if isinstance(instance, Task) and row[1] is not None and self.task_ids.get(row[1]) == instance.pk:
+                del self.task_ids[row[1]]
+            instance.pk = None
+            instance._state.adding = True
+
+    def save_tasks(self, rows):
+        tasks = positions.append_positions([task for _, _, task in rows], self.last_positions)
+        created = Task.objects.bulk_create(tasks)
+        for (_, source_id, _), task in zip(rows, created):
+            if source_id is not None:
+                self.task_ids[source_id] = task.id
+        BoardChange.objects.record_many([
+            BoardChange(board_id=self.board.id, entity="task", entity_id=task.id, action="created",
+                        data=task.as_change_data())
+            for task in created
+        ])
+        self.report.tasks += len(created)
+
+    def save_comments(self, rows):
+        created = Comment.objects.bulk_create([comment for _, comment in rows])
+        BoardChange.objects.record_many([
+            BoardChange(board_id=self.board.id, entity="comment", entity_id=comment.id, action="created",
+                        data=comment.as_change_data())
+            for comment in created
+        ])
+        self.report.comments += len(created)
+
+    def build_member(self, record):
+        user_id = self.user_id(record.get("email"))
+        if user_id is None:
+            raise ValueError(f"Unknown user '{record.get('email')}'.")
+        if user_id in self.member_ids:
+            return None
+        self.member_ids.add(user_id)
+        return user_id
+
+    def board_user(self, record, field):
+        email = record.get(field)
+        if not email:
+            return None
+        user_id = self.user_id(email)
+        if user_id is None:
+            raise ValueError(f"Unknown {field} '{email}'.")
+        if user_id not in self.member_ids:
+            raise ValueError(f"{field.capitalize()} '{email}' is not a member of the board.")
+        return user_id
+
+    def build_task(self, record):
+        title = str(record.get("title") or "").strip()
+        if not title:
+            raise ValueError("Title is required.")
+        status = record.get("status", "to-do")
+        if status not in STATUSES:
+            raise ValueError(f"Invalid status '{status}'.")
+        priority = record.get("priority", "medium")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Invalid priority '{priority}'.")
+        position = record.get("position") or ""
+        if position and not positions.is_valid(position):
+            raise ValueError(f"Invalid position '{position}'.")
+        due_date = date.today()
+        if record.get("due_date"):
+            due_date = parse_date(str(record["due_date"]))
+            if due_date is None:
+                raise ValueError(f"Invalid due_date '{record['due_date']}'.")
+        return Task(
+            board_id=self.board.id,
+            owner_id=self.user.id,
+            title=title[:255],
+            description=record.get("description") or "",
+            status=status,
+            priority=priority,
+            assignee_id=self.board_user(record, "assignee"),
+            reviewer_id=self.board_user(record, "reviewer"),
+            due_date=due_date,
+            position=position,
+        )
+
+    def build_comment(self, record):
+        task_id = self.task_ids.get(record.get("task"))
+        if task_id is None:
+            raise ValueError(f"Comment refers to unknown task '{record.get('task')}'.")
+        content = record.get("content")
+        if not content:
+            raise ValueError("Content is required.")
+        author_id = self.user_id(record.get("author"))
+        if record.get("author") and author_id is None:
+            raise ValueError(f"Unknown author '{record['author']}'.")
+        return Comment(task_id=task_id, author_id=author_id or self.user.id, content=content)
+
+    def finish(self):
+        """Recount the board and comment counters once for the whole import."""
+        if self.report.comments:
+            Task.objects.filter(board=self.board).recount_comments()
+        Board.objects.filter(pk=self.board.pk).recount_tasks()
+        invalidate_boards(self.board.pk)
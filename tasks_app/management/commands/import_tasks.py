@@ -0,0 +1,62 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.models import Board
+from tasks_app import importer
+from users_auth_app.models import User
+
+
+class Command(BaseCommand):
+
+    """
+    Bulk import tasks (and their comments and members) from an NDJSON or CSV
+    file, see `tasks_app.importer`. Invalid rows are skipped and reported.
+
+    Usage:
+        python manage.py import_tasks tasks.csv --board 1 --user owner@mail.de
+        python manage.py import_tasks board-1.ndjson --new-board "Imported" --user owner@mail.de
+        cat tasks.ndjson | python manage.py import_tasks - --board 1 --user owner@mail.de
+    """
+    help = "Import tasks from NDJSON or CSV into an existing or a new board."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, '-' for stdin.")
+        parser.add_argument("--user", required=True, help="Email of the importing user (owner of the tasks).")
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--board", type=int, help="Import into this board.")
+        target.add_argument("--new-board", help="Create a board with this title, owned by --user.")
+        parser.add_argument("--format", choices=importer.FORMATS, dest="import_format",
+                            help="Input format (default: from the file extension, else ndjson).")
+        parser.add_argument("--chunk-size", type=int, default=importer.CHUNK_SIZE)
+        parser.add_argument("--show-errors", type=int, default=20, help="Number of row errors to print.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(email=options["user"]).first()
+        if user is None:
+            raise CommandError(f"No user with email {options['user']}.")
+        import_format = options["import_format"] or ("csv" if options["path"].lower().endswith(".csv") else "ndjson")
+        if options["board"] is not None:
+            board = Board.objects.filter(pk=options["board"]).first()
+            if board is None:
+                raise CommandError(f"Board {options['board']} does not exist.")
+        try:
+            file = sys.stdin.buffer if options["path"] == "-" else open(options["path"], "rb")
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        with file:
+            if options["new_board"]:
+                board_importer = importer.BoardImporter.create_board(
+                    options["new_board"], user, chunk_size=options["chunk_size"]
+                )
+            else:
+                board_importer = importer.BoardImporter(board, user, chunk_size=options["chunk_size"])
+            report = board_importer.run(importer.read_records(file, import_format))
+
+        for error in report["errors"][:options["show_errors"]]:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created_tasks']} task(s), {report['created_comments']} comment(s) and "
+            f"{report['added_members']} member(s) into board {board_importer.board.id} "
+            f"({report['rows']} rows in {report['seconds']}s, {report['rows_per_second']} rows/s, "
+            f"{report['error_count']} error(s))."
+        ))
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max, Q
+from django.db.models.functions import Length
+from tasks_app import positions
+from tasks_app.models import Task
+
+
+class Command(BaseCommand):
+
+    """
+    Renumber the task positions of columns whose keys got too long, or that
+    contain tasks without a position (e.g. after bulk writes).
+
+    Usage:
+        python manage.py rebalance_positions
+        python manage.py rebalance_positions --board 1 --all
+    """
+    help = "Re-space the position keys of task columns with long or missing keys."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--board", type=int, action="append", dest="board_ids",
+                            help="Only this board ID (can be repeated).")
+        parser.add_argument("--all", action="store_true",
+                            help="Rebalance every column, not only those that need it.")
+
+    def handle(self, *args, **options):
+        tasks = Task.objects.all()
+        if options["board_ids"]:
+            tasks = tasks.filter(board_id__in=options["board_ids"])
+        columns = tasks.order_by().values("board_id", "status").annotate(
+            longest=Max(Length("position")), unplaced=Count("id", filter=Q(position="")),
+        )
+        if not options["all"]:
+            columns = columns.filter(Q(longest__gt=settings.TASK_POSITION_MAX_LENGTH) | Q(unplaced__gt=0))
+        rebalanced = rewritten = 0
+        for column in columns.order_by("board_id", "status"):
+            rewritten += positions.rebalance(column["board_id"], column["status"])
+            rebalanced += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebalanced {rebalanced} column(s), {rewritten} task(s) rewritten."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from tasks_app import search
+
+
+class Command(BaseCommand):
+
+    """
+    Re-create the full-text search index (see `tasks_app.search`) and, on
+    SQLite, re-index all tasks and comments.
+
+    Usage:
+        python manage.py rebuild_search_index
+    """
+    help = "Rebuild the full-text search index of tasks and comments."
+
+    def handle(self, *args, **options):
+        if not search.supported():
+            self.stdout.write(self.style.WARNING(f"Search is not supported on {connection.vendor}."))
+            return
+        search.install(backfill=True)
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
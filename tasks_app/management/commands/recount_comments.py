@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from tasks_app.models import Task
+
+
+class Command(BaseCommand):
+
+    """
+    Backfill or repair the denormalized comments_count of all tasks.
+
+    Usage:
+        python manage.py recount_comments
+        python manage.py recount_comments --board 1
+    """
+    help = "Rebuild the stored comments_count of all (or the given boards') tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--board", type=int, action="append", dest="board_ids",
+                            help="Only recount tasks of this board ID (can be repeated).")
+
+    def handle(self, *args, **options):
+        tasks = Task.objects.all()
+        if options["board_ids"]:
+            tasks = tasks.filter(board_id__in=options["board_ids"])
+        updated = tasks.recount_comments()
+        self.stdout.write(self.style.SUCCESS(f"Recounted {updated} task(s)."))
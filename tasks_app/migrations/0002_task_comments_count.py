@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-18 16:45
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def recount_comments(apps, schema_editor):
+    Task = apps.get_model('tasks_app', 'Task')
+    Comment = apps.get_model('tasks_app', 'Comment')
+    counts = (
+        Comment.objects.filter(task_id=OuterRef('pk'))
+        .order_by()
+        .values('task_id')
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    Task.objects.update(comments_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(recount_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 16:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0003_task_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from tasks_app import search
+    search.install(schema_editor.connection, backfill=True)
+
+
+def uninstall(apps, schema_editor):
+    from tasks_app import search
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0004_task_updated_at_auto_now'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:27
+
+from django.conf import settings
+from itertools import groupby
+from django.db import migrations, models
+
+
+def number_columns(apps, schema_editor):
+    """Give existing tasks positions in ID order within their column."""
+    from tasks_app.positions import spread_keys
+    Task = apps.get_model('tasks_app', 'Task')
+    tasks = Task.objects.order_by('board_id', 'status', 'id').only('id', 'board_id', 'status')
+    for _, column in groupby(tasks.iterator(chunk_size=2000), key=lambda task: (task.board_id, task.status)):
+        column = list(column)
+        for task, key in zip(column, spread_keys(len(column))):
+            task.position = key
+        Task.objects.bulk_update(column, ['position'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0004_board_change_log'),
+        ('tasks_app', '0005_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_board_status_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='position',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(number_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'status', 'position'], name='task_board_status_idx'),
+        ),
+    ]
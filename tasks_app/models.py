@@ -1,8 +1,31 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from kanban_app.models import Board
 from datetime import datetime
 from users_auth_app.models import User
+from tasks_app.positions import key_between, last_position
+
+class TaskQuerySet(models.QuerySet):
+
+    """
+    QuerySet for tasks with maintenance helpers.
+    """
+
+    def recount_comments(self):
+        """
+        Rebuild the stored comments_count of every task in one UPDATE.
+        """
+        counts = (
+            Comment.objects.filter(task_id=OuterRef("pk"))
+            .order_by()
+            .values("task_id")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        return self.update(comments_count=Coalesce(Subquery(counts), 0))
+
 
 class Task(models.Model):
 
@@ -20,6 +43,10 @@ class Task(models.Model):
     - assignee: User assigned to work on the task
     - due_date: Deadline for the task
     - updated_at: Last update timestamp
+    - comments_count: Number of comments, denormalized and kept in sync by
+      the signal handlers in `tasks_app.signals`
+    - position: Rank key of the task within its column (board, status);
+      tasks are ordered by (position, id), see `tasks_app.positions`
     """
 
     STATUS_CHOICES = [
@@ -44,15 +71,92 @@ class Task(models.Model):
     reviewer = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="reviewing_tasks", null=True, blank=True, on_delete=models.SET_NULL)
     assignee = models.ForeignKey(settings.AUTH_USER_MODEL,related_name="assigned_tasks",null=True, blank=True, on_delete=models.SET_NULL)
     due_date = models.DateField(default=datetime.now)
-    updated_at = models.DateTimeField(default=datetime.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    position = models.CharField(max_length=255, blank=True, default="", editable=False)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["assignee", "status"], name="task_assignee_status_idx",
+                         condition=models.Q(assignee__isnull=False)),
+            models.Index(fields=["reviewer", "status"], name="task_reviewer_status_idx",
+                         condition=models.Q(reviewer__isnull=False)),
+            models.Index(fields=["board", "status", "position"], name="task_board_status_idx"),
+            models.Index(fields=["board", "priority"], name="task_board_priority_idx"),
+        ]
 
     def __str__(self):
         board_title = self.board.title if self.board_id else "No Board"
         return f"{self.title} (Board: {board_title})"
 
-    @property
-    def comments_count(self):
-        return self.comments.count()
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_column = instance._column()
+        return instance
+
+    def _column(self):
+        """(board_id, status, position) as far as loaded, None for deferred fields."""
+        values = self.__dict__
+        if not {"board_id", "status", "position"} <= values.keys():
+            return None
+        return values["board_id"], values["status"], values["position"]
+
+    def _left_column_unranked(self):
+        """True if the task was moved to another column without a new position key."""
+        loaded = getattr(self, "_loaded_column", None)
+        current = self._column()
+        return (
+            loaded is not None and current is not None
+            and loaded[:2] != current[:2] and loaded[2] == current[2]
+        )
+
+    def place(self, status, position):
+        """Put the task at `position` in the `status` column, saved by the caller."""
+        self.status = status
+        self.position = position
+        self._loaded_column = None
+
+    def save(self, *args, **kwargs):
+        """
+        Never write comments_count from a possibly stale instance.
+        It is only changed through F() updates and `recount_comments`.
+
+        New tasks without a position, and tasks moved to another column
+        without a new position (e.g. a PATCH of `status`), go to the bottom
+        of their column; the move endpoint places tasks itself.
+        """
+        if self._state.adding and not self.position:
+            self.position = key_between(last_position(self.board_id, self.status), None)
+        elif not self._state.adding and self._left_column_unranked():
+            self.position = key_between(last_position(self.board_id, self.status), None)
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "position"}
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "comments_count"
+                and field.attname in self.__dict__
+            ]
+        super().save(*args, **kwargs)
+        self._loaded_column = self._column()
+
+    def as_change_data(self):
+        """Snapshot of the task for the board change log."""
+        return {
+            "id": self.pk,
+            "title": self.title,
+            "description": self.description,
+            "status": self.status,
+            "priority": self.priority,
+            "assignee_id": self.assignee_id,
+            "reviewer_id": self.reviewer_id,
+            "due_date": self.due_date,
+            "comments_count": self.comments_count,
+            "position": self.position,
+        }
 
 class Comment(models.Model):
 
@@ -76,7 +180,22 @@ class Comment(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE)
     content = models.TextField(null=False, blank=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "created_at", "id"], name="comment_task_created_idx"),
+        ]
+
     def __str__(self):
         author_name = self.author.fullname if self.author else "Unknown"
         task_title = self.task.title if self.task else "No Task"
         return f"Comment by {author_name} on {task_title}"
+
+    def as_change_data(self):
+        """Snapshot of the comment for the board change log."""
+        return {
+            "id": self.pk,
+            "task": self.task_id,
+            "author_id": self.author_id,
+            "content": self.content,
+            "created_at": self.created_at,
+        }
@@ -0,0 +1,217 @@
+"""
+Manual ordering of the tasks within a board column, i.e. a (board, status) pair.
+
+`Task.position` is a rank string: cards are ordered by (position, id), and a
+card is moved by giving it a key between the keys of its new neighbours. A
+move therefore rewrites the moved card only, never the rest of the column.
+
+Keys are fractional base-36 numbers written as their digits after the point
+("i" = 18/36, "i8" = 18/36 + 8/36², ...). Digits and lowercase letters sort the
+same byte-wise and under the usual collations, and a key never ends in "0",
+so there is always room between two different keys.
+
+Keys grow slowly: moves to the top or bottom of a column decrement or
+increment a leading digit, and inserts between two neighbours add about one
+character per five inserts at the same spot. When a key gets longer than
+`TASK_POSITION_MAX_LENGTH`, the column is rebalanced (re-spaced with short
+keys of equal length) after the commit, in a background thread. The
+`rebalance_positions` command does the same for all columns, e.g. from cron.
+"""
+import logging
+import re
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Max, Q
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+KEY = re.compile(r"[0-9a-z]{0,254}[1-9a-z]")
+
+logger = logging.getLogger(__name__)
+
+
+def midpoint(a, b):
+    """
+    Return a key strictly between `a` and `b`. `a` may be "" (start of the
+    column) and `b` None (end of the column); a < b is required.
+    """
+    if b is not None:
+        # keep the common prefix, a is padded with zeros
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n:
+            return b[:n] + midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + midpoint(a[1:], None)
+
+
+def key_after(a):
+    """A short key after `a`, for appending to a column ("" for an empty column)."""
+    for index, char in enumerate(a):
+        if char != DIGITS[-1]:
+            return a[:index] + DIGITS[DIGITS.index(char) + 1]
+    return midpoint(a, None)
+
+
+def key_before(b):
+    """A short key before `b`, for moving to the top of a column."""
+    for index, char in enumerate(b):
+        if char != DIGITS[0]:
+            if DIGITS.index(char) > 1:
+                return b[:index] + DIGITS[DIGITS.index(char) - 1]
+            break
+    return midpoint("", b)
+
+
+def key_between(a, b):
+    """Key between the neighbours `a` (above) and `b` (below), either may be None."""
+    if a is None and b is None:
+        return midpoint("", None)
+    if a is None:
+        return key_before(b)
+    if b is None:
+        return key_after(a)
+    return midpoint(a, b)
+
+
+def keys_between(a, b, count):
+    """`count` ascending keys between `a` and `b` (None for open ends), for batch inserts."""
+    if count <= 0:
+        return []
+    mid = key_between(a, b)
+    half = count // 2
+    return keys_between(a, mid, half) + [mid] + keys_between(mid, b, count - half - 1)
+
+
+def spread_keys(count):
+    """`count` evenly spaced keys of equal length, for (re)numbering a column."""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    step = BASE ** width / (count + 1)
+    keys = []
+    for index in range(1, count + 1):
+        value = round(index * step)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        keys.append("".join(reversed(digits)).rstrip("0"))
+    return keys
+
+
+def is_valid(key):
+    return isinstance(key, str) and KEY.fullmatch(key) is not None
+
+
+def append_positions(tasks, last):
+    """
+    Give the (unsaved) tasks without a position keys at the bottom of their
+    columns, in list order, for bulk_create. `last` maps (board_id, status)
+    to the bottom key of the column (see `last_positions`) and is updated.
+    """
+    columns = defaultdict(list)
+    for task in tasks:
+        column_key = (task.board_id, task.status)
+        if task.position:
+            last[column_key] = max(last.get(column_key) or "", task.position)
+        else:
+            columns[column_key].append(task)
+    for column_key, column_tasks in columns.items():
+        keys = keys_between(last.get(column_key), None, len(column_tasks))
+        for task, key in zip(column_tasks, keys):
+            task.position = key
+        last[column_key] = keys[-1]
+    return tasks
+
+
+def column(board_id, status):
+    from tasks_app.models import Task
+    return Task.objects.filter(board_id=board_id, status=status)
+
+
+def last_position(board_id, status):
+    """Key of the bottom card of a column, None if it is empty."""
+    return column(board_id, status).aggregate(last=Max("position"))["last"]
+
+
+def last_positions(board_ids):
+    """{(board_id, status): key of the bottom card} for all columns of the boards."""
+    from tasks_app.models import Task
+    rows = Task.objects.filter(board_id__in=board_ids).values("board_id", "status").annotate(last=Max("position"))
+    return {(row["board_id"], row["status"]): row["last"] for row in rows.order_by()}
+
+
+def neighbour(task, below=True, exclude=None):
+    """
+    The card directly below (or above) `task` in its column, or None.
+    `exclude` is the ID of a card to skip (the one being moved).
+    """
+    if below:
+        beyond = Q(position__gt=task.position) | Q(position=task.position, id__gt=task.id)
+        ordering = ("position", "id")
+    else:
+        beyond = Q(position__lt=task.position) | Q(position=task.position, id__lt=task.id)
+        ordering = ("-position", "-id")
+    return (
+        column(task.board_id, task.status).filter(beyond).exclude(pk=exclude)
+        .only("id", "position").order_by(*ordering).first()
+    )
+
+
+def bottom(board_id, status, exclude=None):
+    """The bottom card of a column (skipping `exclude`), or None."""
+    return column(board_id, status).exclude(pk=exclude).only("id", "position").order_by("-position", "-id").first()
+
+
+def rebalance(board_id, status):
+    """
+    Renumber a column with evenly spaced short keys, keeping its order.
+    The rewritten tasks are written to the board change log.
+    """
+    from kanban_app.models import Board, BoardChange
+    from tasks_app.models import Task
+    with transaction.atomic():
+        tasks = list(column(board_id, status).select_for_update().order_by("position", "id"))
+        changed = []
+        for task, key in zip(tasks, spread_keys(len(tasks))):
+            if task.position != key:
+                task.position = key
+                changed.append(task)
+        if changed:
+            Task.objects.bulk_update(changed, ["position"], batch_size=1000)
+            Board.objects.filter(pk=board_id).touch()
+            BoardChange.objects.record_many([
+                BoardChange(board_id=board_id, entity="task", entity_id=task.id, action="updated",
+                            data=task.as_change_data())
+                for task in changed
+            ])
+    return len(changed)
+
+
+def needs_rebalance(position):
+    return len(position) > settings.TASK_POSITION_MAX_LENGTH
+
+
+def _rebalance_in_background(board_id, status):
+    def run():
+        try:
+            rebalance(board_id, status)
+        except Exception:
+            logger.exception("Rebalancing column %s/%s failed", board_id, status)
+        finally:
+            connections.close_all()
+    threading.Thread(target=run, name="rebalance-positions", daemon=True).start()
+
+
+def schedule_rebalance(board_id, status):
+    """Rebalance the column in a background thread once the transaction commits."""
+    transaction.on_commit(lambda: _rebalance_in_background(board_id, status))
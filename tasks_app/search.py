@@ -0,0 +1,193 @@
+"""
+Full-text search over task titles/descriptions and comment contents.
+
+The index lives in the database, next to the data:
+
+- SQLite: the FTS5 table `tasks_app_search`, kept in sync by triggers on the
+  task and comment tables (so bulk writes and imports are indexed too).
+  Django rebuilds a SQLite table when some columns are altered, which drops
+  its triggers, so `install()` also runs after every migrate (see
+  `TasksAppConfig.ready`).
+- PostgreSQL: generated `search_vector` tsvector columns with GIN indexes.
+
+`search(user_id, query, limit, offset)` returns ranked hits on the boards
+the user owns or is a member of. Both backends answer from the inverted
+index; the cost depends on the number of matches, not on the table size.
+"""
+import re
+from django.db import connection
+
+WORD = re.compile(r"\w+", re.UNICODE)
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_app_search USING fts5(
+        kind UNINDEXED, task_id UNINDEXED, title, body,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    # rowid is 2 * task ID for tasks and 2 * comment ID + 1 for comments
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_search_insert AFTER INSERT ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_search (rowid, kind, task_id, title, body)
+        VALUES (new.id * 2, 'task', new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_search_update
+    AFTER UPDATE OF title, description ON tasks_app_task BEGIN
+        DELETE FROM tasks_app_search WHERE rowid = old.id * 2;
+        INSERT INTO tasks_app_search (rowid, kind, task_id, title, body)
+        VALUES (new.id * 2, 'task', new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_search_delete AFTER DELETE ON tasks_app_task BEGIN
+        DELETE FROM tasks_app_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_comment_search_insert AFTER INSERT ON tasks_app_comment BEGIN
+        INSERT INTO tasks_app_search (rowid, kind, task_id, title, body)
+        VALUES (new.id * 2 + 1, 'comment', new.task_id, '', new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_comment_search_update
+    AFTER UPDATE OF content, task_id ON tasks_app_comment BEGIN
+        DELETE FROM tasks_app_search WHERE rowid = old.id * 2 + 1;
+        INSERT INTO tasks_app_search (rowid, kind, task_id, title, body)
+        VALUES (new.id * 2 + 1, 'comment', new.task_id, '', new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_comment_search_delete AFTER DELETE ON tasks_app_comment BEGIN
+        DELETE FROM tasks_app_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+SQLITE_BACKFILL = [
+    "DELETE FROM tasks_app_search",
+    """
+    INSERT INTO tasks_app_search (rowid, kind, task_id, title, body)
+    SELECT id * 2, 'task', id, title, description FROM tasks_app_task
+    """,
+    """
+    INSERT INTO tasks_app_search (rowid, kind, task_id, title, body)
+    SELECT id * 2 + 1, 'comment', task_id, '', content FROM tasks_app_comment
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS tasks_app_task_search_insert",
+    "DROP TRIGGER IF EXISTS tasks_app_task_search_update",
+    "DROP TRIGGER IF EXISTS tasks_app_task_search_delete",
+    "DROP TRIGGER IF EXISTS tasks_app_comment_search_insert",
+    "DROP TRIGGER IF EXISTS tasks_app_comment_search_update",
+    "DROP TRIGGER IF EXISTS tasks_app_comment_search_delete",
+    "DROP TABLE IF EXISTS tasks_app_search",
+]
+
+# generated columns are filled for existing rows when they are added
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE tasks_app_task ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS task_search_idx ON tasks_app_task USING GIN (search_vector)",
+    """
+    ALTER TABLE tasks_app_comment ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(content, ''))
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS comment_search_idx ON tasks_app_comment USING GIN (search_vector)",
+]
+
+POSTGRES_UNINSTALL = [
+    "ALTER TABLE tasks_app_task DROP COLUMN IF EXISTS search_vector",
+    "ALTER TABLE tasks_app_comment DROP COLUMN IF EXISTS search_vector",
+]
+
+# boards the user owns or is a member of
+ACCESSIBLE_BOARDS = """
+    SELECT board_id FROM kanban_app_board_members WHERE user_id = %s
+    UNION SELECT id FROM kanban_app_board WHERE owner_id = %s
+"""
+
+SQLITE_SEARCH = f"""
+    SELECT s.kind, s.rowid / 2, s.task_id, -bm25(tasks_app_search, 0, 0, 4.0, 1.0) AS rank
+    FROM tasks_app_search s
+    JOIN tasks_app_task t ON t.id = s.task_id
+    WHERE tasks_app_search MATCH %s AND t.board_id IN ({ACCESSIBLE_BOARDS})
+    ORDER BY rank DESC, s.rowid
+    LIMIT %s OFFSET %s
+"""
+
+POSTGRES_SEARCH = f"""
+    WITH q AS (SELECT to_tsquery('simple', %s) AS query),
+    boards AS ({ACCESSIBLE_BOARDS})
+    SELECT * FROM (
+        SELECT 'task' AS kind, t.id, t.id AS task_id, ts_rank(t.search_vector, q.query) AS rank
+        FROM tasks_app_task t, q
+        WHERE t.search_vector @@ q.query AND t.board_id IN (SELECT board_id FROM boards)
+        UNION ALL
+        SELECT 'comment', c.id, c.task_id, ts_rank(c.search_vector, q.query)
+        FROM tasks_app_comment c JOIN tasks_app_task t ON t.id = c.task_id, q
+        WHERE c.search_vector @@ q.query AND t.board_id IN (SELECT board_id FROM boards)
+    ) hits
+    ORDER BY rank DESC, kind DESC, id
+    LIMIT %s OFFSET %s
+"""
+
+
+def supported(conn=connection):
+    return conn.vendor in ("sqlite", "postgresql")
+
+
+def install(conn=connection, backfill=False):
+    """Create the index (idempotent); `backfill` (re)indexes all existing rows."""
+    if conn.vendor == "sqlite":
+        statements = SQLITE_INSTALL + (SQLITE_BACKFILL if backfill else [])
+    elif conn.vendor == "postgresql":
+        statements = POSTGRES_INSTALL
+    else:
+        return
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def uninstall(conn=connection):
+    statements = {"sqlite": SQLITE_UNINSTALL, "postgresql": POSTGRES_UNINSTALL}.get(conn.vendor, [])
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def terms(query):
+    """Split user input into search terms (no operators or quotes get through)."""
+    return WORD.findall(query.lower())[:20]
+
+
+def match_expression(words, vendor):
+    """Every term must match, as a prefix, so results show up while typing."""
+    if vendor == "postgresql":
+        return " & ".join(f"{word}:*" for word in words)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search(user_id, query, limit=20, offset=0):
+    """
+    Return ranked hits `(kind, id, task_id, rank)` for the query on the
+    user's boards, best first. `kind` is 'task' or 'comment'.
+    """
+    words = terms(query)
+    if not words or not supported():
+        return []
+    sql = POSTGRES_SEARCH if connection.vendor == "postgresql" else SQLITE_SEARCH
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match_expression(words, connection.vendor), user_id, user_id, limit, offset])
+        return [(kind, object_id, task_id, float(rank)) for kind, object_id, task_id, rank in cursor.fetchall()]
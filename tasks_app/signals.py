@@ -0,0 +1,136 @@
+"""
+Signal handlers that keep denormalized counters in sync.
+
+- Board task counters: every Task remembers the (board, status, priority) it
+  was loaded with, so a save only touches the counters when one of them
+  actually changed.
+- Task.comments_count: incremented/decremented when a Comment is created or
+  deleted.
+- Board.version / updated_at: bumped whenever a task or comment of the board
+  changes, so conditional GETs on the board detail see the change.
+- Board summary cache: invalidated whenever the task counters of a board
+  change (comments are not part of the board list payload).
+- BoardChange: every task and comment write is appended to the change log of
+  its board, deletes as tombstones.
+"""
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from kanban_app.models import Board, BoardChange
+from kanban_app.summary_cache import invalidate_boards
+from tasks_app.models import Comment, Task
+
+_suspended = ContextVar("tasks_app_counters_suspended", default=False)
+
+
+@contextmanager
+def suspend_counter_updates():
+    """
+    Skip the per-row handlers inside the block.
+
+    Meant for bulk writes, which must update the affected boards and tasks
+    themselves afterwards (see `counter_deltas`).
+    """
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def _counter_state(task):
+    """
+    Return (board_id, status, priority) without triggering deferred field loads.
+    """
+    values = task.__dict__
+    if "status" not in values or "priority" not in values or "board_id" not in values:
+        return None
+    return values["board_id"], values["status"], values["priority"]
+
+
+def counter_deltas(removed, added):
+    """
+    Sum the counter changes of removed and added (board_id, status, priority)
+    states into {board_id: {field: delta}}, for `adjust_task_counters`.
+    """
+    deltas = defaultdict(Counter)
+    for states, sign in ((removed, -1), (added, 1)):
+        for board_id, status, priority in states:
+            for field in Board.task_counter_fields(status, priority):
+                deltas[board_id][field] += sign
+    return deltas
+
+
+def _apply(removed, added):
+    """
+    Turn an old and a new counter state into one F() update per affected board.
+    Boards are touched even when their counters do not change.
+    """
+    deltas = counter_deltas([removed] if removed else [], [added] if added else [])
+    with transaction.atomic():
+        for board_id, changes in deltas.items():
+            Board.objects.adjust_task_counters(board_id, changes)
+    invalidate_boards(*deltas)
+
+
+@receiver(post_init, sender=Task)
+def remember_counter_state(sender, instance, **kwargs):
+    instance._counter_state = _counter_state(instance)
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or _suspended.get():
+        return
+    old_state = instance._counter_state
+    new_state = _counter_state(instance)
+    if created:
+        _apply(None, new_state)
+    elif new_state is not None and old_state is not None and new_state != old_state:
+        _apply(old_state, new_state)
+    else:
+        Board.objects.filter(pk=instance.board_id).touch()
+    instance._counter_state = new_state
+
+    data = instance.as_change_data()
+    if created:
+        BoardChange.objects.record(instance.board_id, "task", instance.pk, "created", data)
+    elif old_state is not None and old_state[0] != instance.board_id:
+        BoardChange.objects.record(old_state[0], "task", instance.pk, "deleted")
+        BoardChange.objects.record(instance.board_id, "task", instance.pk, "created", data)
+    else:
+        BoardChange.objects.record(instance.board_id, "task", instance.pk, "updated", data)
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    if _suspended.get() or (isinstance(origin, Board) and origin.pk == instance.board_id):
+        return
+    _apply(instance._counter_state, None)
+    BoardChange.objects.record(instance.board_id, "task", instance.pk, "deleted")
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or _suspended.get():
+        return
+    if created:
+        Task.objects.filter(pk=instance.task_id).update(comments_count=F("comments_count") + 1)
+        Board.objects.filter(tasks__id=instance.task_id).touch()
+    action = "created" if created else "updated"
+    BoardChange.objects.record(instance.task.board_id, "comment", instance.pk, action, instance.as_change_data())
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    if _suspended.get() or isinstance(origin, (Board, Task)):
+        return
+    Task.objects.filter(pk=instance.task_id, comments_count__gt=0).update(comments_count=F("comments_count") - 1)
+    Board.objects.filter(tasks__id=instance.task_id).touch()
+    board_id = Task.objects.filter(pk=instance.task_id).values_list("board_id", flat=True).first()
+    if board_id is not None:
+        BoardChange.objects.record(board_id, "comment", instance.pk, "deleted", {"task": instance.task_id})
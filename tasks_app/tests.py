@@ -1,3 +1,627 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, connection
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from kanban_app.models import Board, BoardChange
+from tasks_app import positions
+from tasks_app.api.serializers import TaskUpdateSerializer
+from tasks_app.models import Comment, Task
+from users_auth_app.models import User
 
-# Create your tests here.
+
+class TaskTestCase(TestCase):
+
+    """
+    Common fixture: one board with an owner, a member and an API client.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@mail.de", fullname="Owner", password="pw")
+        self.other = User.objects.create_user(email="member@mail.de", fullname="Member", password="pw")
+        self.board = Board.objects.create(title="Board", owner=self.user)
+        self.board.members.set([self.user, self.other])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_task(self, **kwargs):
+        kwargs.setdefault("title", "Task")
+        return Task.objects.create(board=self.board, **kwargs)
+
+
+class CommentsCountTests(TaskTestCase):
+
+    """
+    Task.comments_count follows comment writes through the API.
+    """
+
+    def test_create_and_delete_comment(self):
+        task = self.create_task()
+        url = reverse("task-comments", args=[task.id])
+        response = self.client.post(url, {"content": "hello"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.client.post(url, {"content": "again"}, format="json")
+        task.refresh_from_db()
+        self.assertEqual(task.comments_count, 2)
+
+        response = self.client.delete(reverse("comment-detail", args=[task.id, response.data["id"]]))
+        self.assertEqual(response.status_code, 204)
+        task.refresh_from_db()
+        self.assertEqual(task.comments_count, 1)
+
+    def test_task_save_keeps_comments_count(self):
+        task = self.create_task()
+        stale = Task.objects.get(pk=task.pk)
+        task.comments.create(author=self.user, content="hello")
+        stale.title = "Renamed"
+        stale.save()
+        task.refresh_from_db()
+        self.assertEqual(task.comments_count, 1)
+
+    def test_assigned_to_me_runs_no_comment_queries(self):
+        for i in range(5):
+            task = self.create_task(title=f"Task {i}", assignee=self.user, reviewer=self.other)
+            task.comments.create(author=self.user, content="hello")
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("assigned-tasks"))
+        self.assertEqual([t["comments_count"] for t in response.data], [1] * 5)
+
+    def test_recount_comments_command(self):
+        task = self.create_task()
+        task.comments.create(author=self.user, content="hello")
+        Task.objects.update(comments_count=9)
+        call_command("recount_comments", stdout=StringIO())
+        task.refresh_from_db()
+        self.assertEqual(task.comments_count, 1)
+
+
+class TaskAssignmentTests(TaskTestCase):
+
+    """
+    Assignee and reviewer are checked against the board with one query and
+    the loaded users are reused when saving.
+    """
+
+    def test_one_query_for_both_users(self):
+        task = Task.objects.get(pk=self.create_task().pk)
+        serializer = TaskUpdateSerializer(
+            task, data={"assignee_id": self.other.id, "reviewer_id": self.user.id}, partial=True)
+        # the task's board, then both users
+        with self.assertNumQueries(2):
+            self.assertTrue(serializer.is_valid())
+        task = serializer.save()
+        with self.assertNumQueries(0):
+            self.assertEqual((task.assignee.email, task.reviewer.email), ("member@mail.de", "owner@mail.de"))
+
+    def test_non_members_are_rejected(self):
+        stranger = User.objects.create_user(email="stranger@mail.de", fullname="Stranger", password="pw")
+        task = self.create_task(assignee=self.other)
+        url = reverse("task-detail", args=[task.id])
+        for field, message in (("assignee_id", "Assignee"), ("reviewer_id", "Reviewer")):
+            for user_id in (stranger.id, 9999):
+                response = self.client.patch(url, {field: user_id}, format="json")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(f"{message} is not a member of the board.", str(response.data))
+
+        response = self.client.patch(url, {"assignee_id": 0}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["assignee"])
+
+
+class TaskPaginationTests(TaskTestCase):
+
+    """
+    Task lists are cursor-paginated on request and unpaginated otherwise.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for i in range(5):
+            self.create_task(title=f"Task {i}", assignee=self.user)
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get(reverse("assigned-tasks"))
+        self.assertEqual(len(response.data), 5)
+
+    def test_walks_all_pages(self):
+        url = reverse("assigned-tasks") + "?page_size=2"
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            titles += [task["title"] for task in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(sorted(titles), [f"Task {i}" for i in range(5)])
+
+
+class TaskListQueryTests(TaskTestCase):
+
+    """
+    Task lists support filters, ordering and sparse fieldsets.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.second = Board.objects.create(title="Second", owner=self.user)
+        self.create_task(title="A", status="to-do", priority="low", due_date="2025-01-10", assignee=self.user)
+        self.create_task(title="B", status="review", priority="high", due_date="2025-02-10", assignee=self.user)
+        self.create_task(title="C", status="done", priority="medium", due_date="2025-03-10", assignee=self.user)
+        Task.objects.create(board=self.second, title="D", status="review", priority="high",
+                            due_date="2025-02-20", assignee=self.user)
+
+    def titles(self, query):
+        response = self.client.get(reverse("assigned-tasks") + query)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [task["title"] for task in response.data]
+
+    def test_filters(self):
+        self.assertEqual(self.titles("?status=review,done&ordering=title"), ["B", "C", "D"])
+        self.assertEqual(self.titles(f"?priority=high&board={self.board.id}"), ["B"])
+        self.assertEqual(self.titles("?due_after=2025-02-01&due_before=2025-02-28&ordering=title"), ["B", "D"])
+
+    def test_ordering(self):
+        self.assertEqual(self.titles("?ordering=-priority,title"), ["B", "D", "C", "A"])
+        self.assertEqual(self.titles("?ordering=-due_date"), ["C", "D", "B", "A"])
+
+    def test_invalid_parameters(self):
+        for query in ["?status=open", "?due_after=tomorrow", "?ordering=owner", "?fields=password", "?board=x"]:
+            response = self.client.get(reverse("assigned-tasks") + query)
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_sparse_fieldsets_narrow_payload_and_columns(self):
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get(reverse("assigned-tasks") + "?fields=id,title,status&ordering=id")
+        self.assertEqual(response.data[0], {"id": response.data[0]["id"], "title": "A", "status": "to-do"})
+        sql = queries.captured_queries[0]["sql"]
+        self.assertNotIn("description", sql)
+        self.assertNotIn("users_auth_app_user", sql)
+
+    def test_paginated_ordering(self):
+        url = reverse("assigned-tasks") + "?ordering=-priority,title&page_size=1"
+        titles = []
+        while url:
+            response = self.client.get(url)
+            titles += [task["title"] for task in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(titles, ["B", "D", "C", "A"])
+
+
+class TaskPositionTests(TaskTestCase):
+
+    """
+    Tasks are ordered by rank keys within their column; moves rewrite one row.
+    """
+
+    def column(self, status="to-do"):
+        return list(Task.objects.filter(board=self.board, status=status).order_by("position", "id")
+                    .values_list("id", flat=True))
+
+    def move(self, task, **data):
+        return self.client.post(reverse("task-move", args=[task.id]), data, format="json")
+
+    def test_new_tasks_go_to_the_bottom(self):
+        tasks = [self.create_task(title=f"Task {i}") for i in range(5)]
+        self.assertEqual(self.column(), [task.id for task in tasks])
+
+    def test_move_to_top_of_large_column_touches_one_row(self):
+        Task.objects.bulk_create(positions.append_positions(
+            [Task(board=self.board, title=f"Task {i}") for i in range(500)], {}))
+        order = self.column()
+        before = dict(Task.objects.values_list("id", "position"))
+        moved = Task.objects.get(pk=order[250])
+
+        response = self.move(moved, before=order[0])
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.column()[0], moved.id)
+        after = dict(Task.objects.values_list("id", "position"))
+        self.assertEqual([task_id for task_id in before if before[task_id] != after[task_id]], [moved.id])
+
+    def test_move_between_and_to_other_column(self):
+        a, b, c = (self.create_task(title=title) for title in "abc")
+        self.assertEqual(self.move(c, after=a.id, before=b.id).status_code, 200)
+        self.assertEqual(self.column(), [a.id, c.id, b.id])
+        self.assertEqual(self.move(a, after=c.id).status_code, 200)
+        self.assertEqual(self.column(), [c.id, a.id, b.id])
+
+        done = self.create_task(title="done", status="done")
+        self.assertEqual(self.move(b, status="done", before=done.id).status_code, 200)
+        self.assertEqual(self.column("done"), [b.id, done.id])
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.tasks_to_do_count, self.board.tasks_done_count), (2, 2))
+
+    def test_status_change_goes_to_the_bottom(self):
+        patched, bulk, kept = (self.create_task(title=title) for title in ("patched", "bulk", "kept"))
+        done = [self.create_task(title=f"done {i}", status="done") for i in range(2)]
+        response = self.client.patch(reverse("task-detail", args=[patched.id]), {"status": "done"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(reverse("tasks-bulk"), {"update": [
+            {"id": bulk.id, "status": "done"}, {"id": kept.id, "status": "to-do", "priority": "high"},
+        ]}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.column("done"), [done[0].id, done[1].id, patched.id, bulk.id])
+        self.assertEqual(self.column(), [kept.id])
+        keys = list(Task.objects.filter(board=self.board, status="done").values_list("position", flat=True))
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_invalid_moves(self):
+        a = self.create_task(title="a")
+        done = self.create_task(title="done", status="done")
+        self.assertEqual(self.move(a, after=done.id).status_code, 400)
+        self.assertEqual(self.move(a, before=a.id).status_code, 400)
+        self.assertEqual(self.move(done, after=a.id, before=a.id, status="to-do").status_code, 400)
+
+    def test_long_keys_are_rebalanced(self):
+        first, second, moved, unplaced = (self.create_task(title=f"Task {i}") for i in range(4))
+        Task.objects.filter(pk=first.pk).update(position="h" + "z" * 40)
+        Task.objects.filter(pk=second.pk).update(position="h" + "z" * 40 + "1")
+        Task.objects.filter(pk=unplaced.pk).update(position="")
+        with mock.patch("tasks_app.positions.schedule_rebalance") as schedule:
+            self.assertEqual(self.move(moved, after=first.id).status_code, 200)
+        schedule.assert_called_once_with(self.board.id, "to-do")
+        expected = [unplaced.id, first.id, moved.id, second.id]
+        self.assertEqual(self.column(), expected)
+
+        call_command("rebalance_positions", stdout=StringIO())
+        self.assertEqual(self.column(), expected)
+        keys = Task.objects.values_list("position", flat=True)
+        self.assertTrue(all(len(key) == 1 for key in keys), list(keys))
+
+    def test_keys_stay_ordered(self):
+        keys = positions.spread_keys(100)
+        self.assertEqual(keys, sorted(keys))
+        for a, b in [(None, None), (None, "1"), ("z", None), ("a", "a1"), ("0i", "1")]:
+            key = positions.key_between(a, b)
+            self.assertTrue((a is None or a < key) and (b is None or key < b), (a, b, key))
+
+
+class QueryPlanTests(TaskTestCase):
+
+    """
+    The hot task and comment lookups are served by the composite indexes.
+
+    Runs EXPLAIN on SQLite and, when configured, PostgreSQL. PostgreSQL
+    prefers sequential scans on tiny tables, so they are disabled for the
+    duration of the check.
+    """
+
+    def assertUsesIndex(self, queryset, *index_names):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        self.assertTrue(
+            any(name in plan for name in index_names),
+            f"Expected one of {index_names} in plan:\n{plan}",
+        )
+        if connection.vendor == "sqlite":
+            self.assertNotIn("USE TEMP B-TREE", plan)
+
+    def test_board_column_lookups(self):
+        self.assertUsesIndex(Task.objects.filter(board=self.board, status="to-do"), "task_board_status_idx")
+        self.assertUsesIndex(Task.objects.filter(board=self.board, priority="high"), "task_board_priority_idx")
+
+    def test_assignee_and_reviewer_lookups(self):
+        self.assertUsesIndex(Task.objects.filter(assignee=self.user, status="review"), "task_assignee_status_idx")
+        self.assertUsesIndex(Task.objects.filter(reviewer=self.user, status="review"), "task_reviewer_status_idx")
+        # assigned-to-me / reviewing filter on the user only; either the FK
+        # index or the composite prefix is fine, as long as it is not a scan.
+        self.assertUsesIndex(Task.objects.filter(assignee=self.user), "task_assignee_status_idx", "assignee_id")
+        self.assertUsesIndex(Task.objects.filter(reviewer=self.user), "task_reviewer_status_idx", "reviewer_id")
+
+    def test_comment_list_lookup(self):
+        task = self.create_task()
+        queryset = Comment.objects.filter(task=task).order_by("created_at", "id")
+        self.assertUsesIndex(queryset, "comment_task_created_idx")
+
+
+class TaskConditionalGetTests(TaskTestCase):
+
+    """
+    The task detail carries ETag/Last-Modified and answers 304 when unchanged.
+    """
+
+    def test_etag_round_trip(self):
+        task = self.create_task()
+        url = reverse("task-detail", args=[task.id])
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.patch(url, {"status": "done"}, format="json")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "done")
+
+
+class TaskBulkTests(TaskTestCase):
+
+    """
+    The bulk endpoint writes many tasks with a fixed number of queries.
+    """
+
+    def test_move_column_in_constant_queries(self):
+        tasks = [self.create_task(title=f"Task {i}", status="to-do") for i in range(30)]
+        payload = {"update": [{"id": task.id, "status": "done", "assignee_id": self.other.id} for task in tasks]}
+        # tasks, boards, access set, memberships, savepoint, column bottoms,
+        # bulk update, counter deltas, change log, release, reload for the response
+        with self.assertNumQueries(11) as queries:
+            response = self.client.post(reverse("tasks-bulk"), payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries.captured_queries if "COUNT(" in query["sql"]])
+        self.assertEqual({t["status"] for t in response.data["updated"]}, {"done"})
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.tasks_to_do_count, 0)
+        self.assertEqual(self.board.tasks_done_count, 30)
+
+    def test_create_update_delete(self):
+        keep = self.create_task(title="keep")
+        drop = self.create_task(title="drop")
+        drop.comments.create(author=self.user, content="hello")
+        payload = {
+            "create": [{"board": self.board.id, "title": "new", "priority": "high", "due_date": "2026-01-01"}],
+            "update": [{"id": keep.id, "priority": "low"}],
+            "delete": [drop.id],
+        }
+        response = self.client.post(reverse("tasks-bulk"), payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"][0]["title"], "new")
+        self.assertEqual(response.data["updated"][0]["priority"], "low")
+        self.assertEqual(response.data["deleted"], [drop.id])
+        self.assertEqual(set(Task.objects.values_list("title", flat=True)), {"keep", "new"})
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.ticket_count, 2)
+        self.assertEqual(self.board.tasks_high_prio_count, 1)
+        self.assertEqual(self.board.tasks_low_prio_count, 1)
+
+    def test_rejects_non_member_assignee(self):
+        stranger = User.objects.create_user(email="stranger@mail.de", fullname="Stranger", password="pw")
+        task = self.create_task()
+        payload = {"update": [{"id": task.id, "assignee_id": stranger.id}]}
+        response = self.client.post(reverse("tasks-bulk"), payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        task.refresh_from_db()
+        self.assertIsNone(task.assignee_id)
+
+    def test_rejects_repeated_ids(self):
+        task = self.create_task()
+        for payload, section in (
+            ({"update": [{"id": task.id, "status": "done"}], "delete": [task.id]}, "delete"),
+            ({"update": [{"id": task.id, "status": "done"}, {"id": task.id, "priority": "high"}]}, "update"),
+            ({"delete": [task.id, task.id]}, "delete"),
+        ):
+            response = self.client.post(reverse("tasks-bulk"), payload, format="json")
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(str(task.id), str(response.data[section]))
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.priority), ("to-do", "medium"))
+
+    def test_zero_user_id_unassigns(self):
+        task = self.create_task(assignee=self.other, reviewer=self.user)
+        payload = {
+            "create": [{"board": self.board.id, "title": "new", "assignee_id": 0, "reviewer_id": 0}],
+            "update": [{"id": task.id, "assignee_id": 0, "reviewer_id": 0}],
+        }
+        response = self.client.post(reverse("tasks-bulk"), payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        created = Task.objects.get(id=response.data["created"][0]["id"])
+        task.refresh_from_db()
+        for saved in (created, task):
+            self.assertEqual((saved.assignee_id, saved.reviewer_id), (None, None))
+
+    def test_rejects_foreign_board(self):
+        stranger = User.objects.create_user(email="stranger@mail.de", fullname="Stranger", password="pw")
+        foreign = Board.objects.create(title="Foreign", owner=stranger)
+        task = Task.objects.create(board=foreign, title="foreign")
+        response = self.client.post(reverse("tasks-bulk"), {"delete": [task.id]}, format="json")
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(Task.objects.filter(id=task.id).exists())
+
+
+class AsyncTaskViewTests(TaskTestCase):
+
+    """
+    Under ASGI the task and comment lists are served by the async views, with
+    the same payloads as the DRF views.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = Token.objects.create(user=self.user)
+        self.task = self.create_task(assignee=self.user, reviewer=self.user)
+        self.task.comments.create(author=self.other, content="hello")
+
+    async def test_payloads_match_sync_views(self):
+        urls = [reverse("assigned-tasks"), reverse("task-review"), reverse("task-comments", args=[self.task.id])]
+        for url in urls:
+            expected = await sync_to_async(self.client.get)(url)
+            response = await self.async_client.get(url, headers={"Authorization": f"Token {self.token.key}"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), json.loads(expected.content))
+
+    async def test_comments_require_board_access(self):
+        stranger = await sync_to_async(User.objects.create_user)(
+            email="stranger@mail.de", fullname="Stranger", password="pw")
+        token = await Token.objects.acreate(user=stranger)
+        url = reverse("task-comments", args=[self.task.id])
+        response = await self.async_client.get(url, headers={"Authorization": f"Token {token.key}"})
+        self.assertEqual(response.status_code, 403)
+
+    async def test_paginated_lists_use_drf_views(self):
+        url = reverse("assigned-tasks") + "?page_size=1"
+        response = await self.async_client.get(url, headers={"Authorization": f"Token {self.token.key}"})
+        self.assertEqual(len(response.json()["results"]), 1)
+
+
+class TaskImportTests(TaskTestCase):
+
+    """
+    The import endpoint and command load NDJSON/CSV in chunks and report bad
+    rows without aborting.
+    """
+
+    def import_body(self, body, content_type, **params):
+        url = reverse("board-import", args=[self.board.id])
+        if params:
+            url += "?" + "&".join(f"{key}={value}" for key, value in params.items())
+        return self.client.generic("POST", url, body, content_type=content_type)
+
+    def test_ndjson_import_with_comments(self):
+        lines = [
+            {"type": "board", "title": "Elsewhere"},
+            {"id": 10, "title": "First", "status": "done", "assignee": "MEMBER@mail.de"},
+            {"type": "comment", "task": 10, "author": "owner@mail.de", "content": "hi"},
+            {"id": 11, "title": "", "priority": "high"},
+            {"id": 12, "title": "Third", "priority": "urgent"},
+            {"id": 13, "title": "Fourth", "reviewer": "nobody@mail.de"},
+            {"type": "comment", "task": 99, "content": "orphan"},
+        ]
+        body = "\n".join(json.dumps(line) for line in lines) + "\nnot json\n"
+        response = self.import_body(body, "application/x-ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created_tasks"], 1)
+        self.assertEqual(response.data["created_comments"], 1)
+        self.assertEqual([error["line"] for error in response.data["errors"]], [4, 5, 6, 7, 8])
+
+        task = Task.objects.get(title="First")
+        self.assertEqual(task.assignee, self.other)
+        self.assertEqual(task.comments_count, 1)
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.tasks_done_count, 1)
+
+    def test_wrongly_typed_fields_are_row_errors(self):
+        lines = [
+            {"id": [1], "title": "List ID"},
+            {"title": "List status", "status": ["a"]},
+            {"title": {"x": 1}},
+            {"type": "comment", "task": {"id": 1}, "content": "x"},
+            {"id": 2, "title": "Valid"},
+        ]
+        body = "\n".join(json.dumps(line) for line in lines)
+        response = self.import_body(body, "application/x-ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created_tasks"], 1)
+        self.assertEqual(
+            [error["error"] for error in response.data["errors"]],
+            ["Field 'id' must be an integer or a string.", "Field 'status' must be a string.",
+             "Field 'title' must be a string.", "Field 'task' must be an integer or a string."],
+        )
+
+    def test_failed_chunk_is_retried_with_fresh_keys(self):
+        record_many = BoardChange.objects.record_many
+        bulk_create = Task.objects.bulk_create
+        inserted_pks = []
+
+        def fail_once(changes):
+            if len(inserted_pks) == 1:
+                raise DatabaseError("boom")
+            return record_many(changes)
+
+        def spy(tasks, *args, **kwargs):
+            inserted_pks.append([task.pk for task in tasks])
+            return bulk_create(tasks, *args, **kwargs)
+
+        body = "\n".join(json.dumps({"id": i, "title": f"Task {i}"}) for i in (1, 2))
+        with mock.patch.object(BoardChange.objects, "record_many", fail_once), \
+                mock.patch.object(Task.objects, "bulk_create", spy):
+            response = self.import_body(body, "application/x-ndjson")
+        self.assertEqual((response.data["created_tasks"], response.data["errors"]), (2, []))
+        self.assertEqual(inserted_pks, [[None, None], [None], [None]])
+        self.assertEqual(Task.objects.filter(board=self.board).count(), 2)
+
+    def test_csv_import_in_chunks(self):
+        rows = ["title,status,priority,assignee,due_date"]
+        rows += [f"Task {i},to-do,low,member@mail.de,2026-02-01" for i in range(25)]
+        rows.append("Bad date,to-do,low,,tomorrow")
+        response = self.import_body("\n".join(rows) + "\n", "text/csv")
+        self.assertEqual(response.data["created_tasks"], 25)
+        self.assertEqual(response.data["errors"], [{"line": 27, "error": "Invalid due_date 'tomorrow'."}])
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.tasks_low_prio_count, 25)
+
+    def test_multipart_upload_and_permissions(self):
+        upload = SimpleUploadedFile("tasks.csv", b"title\nUploaded\n", content_type="text/csv")
+        url = reverse("board-import", args=[self.board.id])
+        response = self.client.post(url, {"file": upload}, format="multipart")
+        self.assertEqual(response.data["created_tasks"], 1)
+
+        stranger = User.objects.create_user(email="stranger@mail.de", fullname="Stranger", password="pw")
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.import_body('{"title": "x"}', "application/x-ndjson").status_code, 403)
+
+    def test_import_command_round_trips_export(self):
+        task = self.create_task(title="Exported", assignee=self.other)
+        task.comments.create(author=self.other, content="hello")
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as file:
+            call_command("export_board", self.board.id, export_format="ndjson", stdout=file)
+        out = StringIO()
+        call_command("import_tasks", file.name, new_board="Copy", user="member@mail.de",
+                     chunk_size=1, stdout=out, stderr=StringIO())
+        os.unlink(file.name)
+        copy = Board.objects.get(title="Copy")
+        self.assertEqual(set(copy.members.values_list("email", flat=True)), {"owner@mail.de", "member@mail.de"})
+        imported = copy.tasks.get()
+        self.assertEqual((imported.title, imported.assignee, imported.comments_count), ("Exported", self.other, 1))
+        self.assertIn("Imported 1 task(s), 1 comment(s)", out.getvalue())
+
+
+class SearchTests(TaskTestCase):
+
+    """
+    /api/search/ ranks task and comment hits on the user's boards only.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.task = self.create_task(title="Deploy release", description="Ship the Android build")
+        self.create_task(title="Write docs", description="Explain the release process")
+        self.task.comments.create(author=self.other, content="Release notes are ready")
+        stranger = User.objects.create_user(email="stranger@mail.de", fullname="Stranger", password="pw")
+        foreign = Board.objects.create(title="Foreign", owner=stranger)
+        Task.objects.create(board=foreign, title="Secret release")
+
+    def search(self, query, **params):
+        return self.client.get(reverse("search"), {"q": query, **params})
+
+    def test_ranked_and_scoped(self):
+        response = self.search("release")
+        self.assertEqual(response.status_code, 200)
+        hits = [(hit["type"], hit["title"]) for hit in response.data["results"]]
+        self.assertEqual(len(hits), 3)
+        self.assertEqual(hits[0], ("task", "Deploy release"))
+        self.assertIn(("comment", "Deploy release"), hits)
+        self.assertNotIn("Secret release", [title for _, title in hits])
+
+    def test_prefix_and_all_terms(self):
+        self.assertEqual(len(self.search("andr").data["results"]), 1)
+        self.assertEqual(len(self.search("release docs").data["results"]), 1)
+        self.assertEqual(self.search('"; DROP').data["results"], [])
+
+    def test_index_follows_writes(self):
+        self.task.title = "Renamed"
+        self.task.save()
+        self.assertEqual(self.search("deploy").data["results"], [])
+        self.task.delete()
+        self.assertEqual([hit["title"] for hit in self.search("release").data["results"]], ["Write docs"])
+
+    def test_pagination(self):
+        response = self.search("release", page_size=2)
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+
+    def test_requires_query(self):
+        self.assertEqual(self.search("  ").status_code, 400)
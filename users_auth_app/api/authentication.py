@@ -0,0 +1,39 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+
+
+def token_cache_key(key):
+    """
+    Cache key for a token. The raw token is hashed so it never appears in the cache.
+    """
+    return "auth:token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+
+    """
+    Token authentication that keeps token -> user in the Django cache.
+
+    The first request with a token loads it (with its user) from the database,
+    later requests are served from the cache for `AUTH_TOKEN_CACHE_TIMEOUT`
+    seconds. `users_auth_app.signals` evicts the entry when the token is
+    deleted or its user is saved (e.g. deactivated). With several workers use
+    a shared cache backend, otherwise other workers only drop the entry when
+    it expires.
+    """
+
+    def authenticate_credentials(self, key):
+        timeout = getattr(settings, "AUTH_TOKEN_CACHE_TIMEOUT", 0)
+        if not timeout:
+            return super().authenticate_credentials(key)
+
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is not None:
+            return (token.user, token)
+
+        user, token = super().authenticate_credentials(key)
+        cache.set(cache_key, token, timeout)
+        return (user, token)
@@ -0,0 +1,41 @@
+"""
+Signal handlers that evict cached tokens (see
+`users_auth_app.api.authentication.CachedTokenAuthentication`).
+
+Entries are evicted once the transaction commits, so a concurrent request
+cannot cache the pre-commit token or user again. Nothing is done while the
+token cache is switched off (`AUTH_TOKEN_CACHE_TIMEOUT` = 0).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from users_auth_app.api.authentication import token_cache_key
+from users_auth_app.models import User
+
+
+def cache_enabled():
+    return bool(getattr(settings, "AUTH_TOKEN_CACHE_TIMEOUT", 0))
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    if not cache_enabled():
+        return
+    cache_key = token_cache_key(instance.key)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
+
+@receiver(post_save, sender=User)
+def evict_user_tokens(sender, instance, created, **kwargs):
+    if created or not cache_enabled():
+        return
+    user_id = instance.pk
+
+    def evict():
+        keys = Token.objects.filter(user_id=user_id).values_list("key", flat=True)
+        cache.delete_many([token_cache_key(key) for key in keys])
+
+    transaction.on_commit(evict)
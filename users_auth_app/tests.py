@@ -1,3 +1,56 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from users_auth_app.api.authentication import token_cache_key
+from users_auth_app.models import User
 
-# Create your tests here.
+
+@override_settings(AUTH_TOKEN_CACHE_TIMEOUT=60)
+class CachedTokenAuthenticationTests(TestCase):
+
+    """
+    Token lookups are cached and evicted when the token or the user changes.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="user@mail.de", fullname="User", password="pw")
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = reverse("assigned-tasks")
+
+    def test_second_request_skips_token_query(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_deleted_token_is_evicted(self):
+        self.client.get(self.url)
+        cache_key = token_cache_key(self.token.key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+            self.assertIsNotNone(cache.get(cache_key))
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deactivated_user_is_evicted(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+            self.assertIsNotNone(cache.get(token_cache_key(self.token.key)))
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    @override_settings(AUTH_TOKEN_CACHE_TIMEOUT=0)
+    def test_no_eviction_without_cache(self):
+        with self.captureOnCommitCallbacks() as callbacks, self.assertNumQueries(1):
+            self.user.save()
+        self.assertEqual(callbacks, [])
+
+    def test_login_token_is_accepted(self):
+        response = APIClient().post(reverse("login"), {"email": "user@mail.de", "password": "pw"}, format="json")
+        self.assertEqual(response.data["token"], self.token.key)
+        self.assertEqual(self.client.get(self.url).status_code, 200)